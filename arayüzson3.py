@@ -1,19 +1,311 @@
+import os
 import sys
-from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QPushButton, QLabel, QLineEdit, QSizePolicy
-from PyQt5.QtGui import QPainter, QColor, QBrush, QPen, QFont, QFontMetrics, QImage, QPainterPath
-from PyQt5.QtCore import QTimer, Qt, QThread, pyqtSignal, QRect
-from pymavlink import mavutil
-from math import cos, sin, pi
-import cv2
+import argparse
+import csv
+import json
+import time
+import threading
+import importlib
+import multiprocessing
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QPushButton, QLabel, QLineEdit, QSizePolicy, QShortcut, QGridLayout, QStackedWidget, QStyle, QStyleOption
+from PyQt5.QtGui import QPainter, QColor, QBrush, QPen, QFont, QFontInfo, QFontMetrics, QFontMetricsF, QStaticText, QTransform, QImage, QPainterPath, QPixmap, QPolygonF, QKeySequence, qRgba
+from PyQt5.QtCore import QObject, QTimer, Qt, QThread, pyqtSignal, QRect, QLine, QLineF, QPointF, QEvent
+from math import cos, sin, pi, ceil
 import numpy as np
-import requests
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from recording import Recorder, ReplaySession, ReplayConnection, replay_entries
+from mjpeg import MjpegParser, jpeg_size, reduced_decode_flag, iter_raw_chunks, abort_response
+from history import TelemetryHistory, decimate
+from occupancy import OccupancyGrid
+from vehicles import VehicleTable
+
+class RingBuffer:
+    def __init__(self, capacity):
+        self.data = np.zeros(capacity)
+        self.index = 0
+        self.count = 0
+
+    def append(self, value):
+        self.data[self.index] = value
+        self.index = (self.index + 1) % len(self.data)
+        self.count = min(self.count + 1, len(self.data))
+
+    def values(self):
+        # Sıralı değil, yüzdelik ve sayım için yeterli
+        return self.data[:self.count]
+
+
+class RateCounter:
+    # Saniye kovaları: hız son tamamlanan saniyedeki olay sayısı. Örnek halkası tutulmaz, yüksek
+    # hızlar (binlerce mesaj/s) halka boyutuyla sınırlanmaz.
+    def __init__(self):
+        self.second = None
+        self.current = 0
+        self.previous = 0
+
+    def add(self, timestamp):
+        second = int(timestamp)
+        if self.second is None or second > self.second:
+            # Atlanan saniyelerde olay yok
+            self.previous = self.current if self.second is not None and second == self.second + 1 else 0
+            self.second = second
+            self.current = 0
+        # Thread'ler arası küçük sıra kaymaları içinde bulunulan saniyeye yazılır
+        self.current += 1
+
+    def rate(self, now):
+        second = int(now)
+        if self.second == second:
+            return self.previous
+        if self.second == second - 1:
+            return self.current
+        return 0
+
+
+class PipelineStats:
+    # Aşama zaman damgaları time.perf_counter() ile, tüm thread'lerden yazılabilir
+    def __init__(self, capacity=512):
+        self.capacity = capacity
+        self.events = {}
+        self.latencies = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def tick(self, name, timestamp=None):
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        with self._lock:
+            counter = self.events.get(name)
+            if counter is None:
+                counter = self.events[name] = RateCounter()
+            counter.add(timestamp)
+            self.counters[name] = self.counters.get(name, 0) + 1
+
+    def record(self, name, latency):
+        with self._lock:
+            ring = self.latencies.get(name)
+            if ring is None:
+                ring = self.latencies[name] = RingBuffer(self.capacity)
+            ring.append(latency)
+
+    def summary(self):
+        now = time.perf_counter()
+        result = {}
+        with self._lock:
+            for name, counter in self.events.items():
+                result[f'{name}.rate'] = counter.rate(now)
+                result[f'{name}.count'] = self.counters[name]
+            for name, ring in self.latencies.items():
+                values = ring.values()
+                if len(values):
+                    p50, p99 = np.percentile(values, (50, 99)) * 1000
+                    result[f'{name}.p50_ms'] = float(p50)
+                    result[f'{name}.p99_ms'] = float(p99)
+        return result
+
+
+pipeline_stats = PipelineStats()
+
+
+class StatsCsvExporter:
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.writer = None
+
+    def write(self, summary):
+        # Uzun format (zaman, metrik, değer): sonradan çıkan metrikler de sütun sorunu olmadan yazılır
+        if self.writer is None:
+            self.file = open(self.path, 'a', newline='')
+            self.writer = csv.writer(self.file)
+            if self.file.tell() == 0:
+                self.writer.writerow(['time', 'metric', 'value'])
+        now = round(time.time(), 3)
+        self.writer.writerows((now, name, value) for name, value in sorted(summary.items()))
+        self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+
+class RepaintScheduler(QObject):
+    # Setter'lar sadece değeri saklar; ekran hızında tek bir tick değişenleri yeniden çizer
+    def __init__(self, rate=60):
+        super().__init__()
+        self.dirty = {}
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.flush)
+        self.set_rate(rate)
+
+    def set_rate(self, rate):
+        self.timer.start(max(1, int(1000 / rate)))
+
+    def register(self, *widgets):
+        for widget in widgets:
+            widget.scheduler = self
+
+    def request(self, widget):
+        self.dirty[widget] = True
+
+    def flush(self):
+        dirty, self.dirty = self.dirty, {}
+        for widget in dirty:
+            widget.flush_display()
+
+
+class ScheduledRepaint:
+    scheduler = None
+    _displayed_state = None
+
+    def request_repaint(self):
+        if self.scheduler is None:
+            self.flush_display()
+        else:
+            self.scheduler.request(self)
+
+    def display_state(self):
+        # Ekranda görünen hali belirleyen değerler; aynıysa yeniden çizilmez
+        return None
+
+    def changed_rect(self, old_state, new_state):
+        # Sadece bu dikdörtgen değiştiyse onu döndür; None: widget'ın tamamı yeniden çizilir
+        return None
+
+    def flush_display(self):
+        state = self.display_state()
+        if state is not None and state == self._displayed_state:
+            return False
+        rect = None if self._displayed_state is None else self.changed_rect(self._displayed_state, state)
+        self._displayed_state = state
+        if rect is None:
+            self.update()
+        else:
+            self.update(rect)
+        return True
+
+
+# Ortak çizim araçları: "Armstrong" çoğu makinede yok, yedek font araması her QFont("Armstrong")
+# boyamasında tekrar yapılıyordu. Fontlar bir kez çözülüp gerçek aile adıyla saklanır. Sürekli değişen
+# değerler (rakam, işaret, nokta, birim) HUD'daki gibi karakter başına bir kez pixmap'e çizilir ve yan
+# yana kopyalanır: karakter kümesi küçük, önbellek büyümez, yeni değerde metin yerleşimi yapılmaz.
+_fonts = {}
+_glyphs = {}
+
+
+def instrument_font(point_size, family="Armstrong"):
+    # Dönen font paylaşılır, değiştirilmemeli (gerekirse QFont(font) ile kopyalanır)
+    key = (family, point_size)
+    font = _fonts.get(key)
+    if font is None:
+        font = QFont(QFontInfo(QFont(family, point_size)).family(), point_size)
+        _fonts[key] = font
+    return font
+
+
+def glyph(char, font, color, dpr=1.0):
+    # (pixmap, ilerleme genişliği, taban çizgisi); pixmap'te çıkıntılar için bir piksel sol pay var
+    key = (char, font.key(), color.rgba(), dpr)
+    entry = _glyphs.get(key)
+    if entry is None:
+        metrics = QFontMetricsF(font)
+        advance = metrics.horizontalAdvance(char)
+        pixmap = QPixmap(int(np.ceil((advance + 3) * dpr)), int(np.ceil(metrics.height() * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setFont(font)
+        painter.setPen(color)
+        painter.drawText(QPointF(1, metrics.ascent()), char)
+        painter.end()
+        entry = _glyphs[key] = (pixmap, advance, metrics.ascent())
+    return entry
+
+
+def glyph_text_width(text, font):
+    metrics = QFontMetricsF(font)
+    return sum(metrics.horizontalAdvance(char) for char in text)
+
+
+def draw_glyph_text(painter, x, y, text, font, color):
+    # drawText gibi y taban çizgisi; metnin sağ ucunu döndürür
+    dpr = painter.device().devicePixelRatioF()
+    for char in text:
+        pixmap, advance, ascent = glyph(char, font, color, dpr)
+        if char != ' ':
+            painter.drawPixmap(QPointF(round(x) - 1, round(y - ascent)), pixmap)
+        x += advance
+    return x
+
+
+class ValueLabel(QWidget):
+    # Sık değişen durum çubuğu değeri. QLabel.setText satırın yerleşimini yeniden hesaplatır ve
+    # etiketin tamamını boyar; burada genişlik en uzun metne göre sabit ve sadece ilk değişen
+    # karakterden sonrası update(rect) ile yeniden çizilir.
+    def __init__(self, text, template, font, color=QColor(255, 255, 255), background=None, padding=5):
+        super().__init__()
+        self._text = text
+        self.text_font = font
+        self.metrics = QFontMetrics(font)
+        self.color = color
+        self.background = background
+        self.padding = padding
+        if background is None:
+            # Arka plan yanındaki QLabel'lar gibi üst widget'ın stil sayfasından / paletinden gelir
+            self.setAttribute(Qt.WA_StyledBackground)
+        else:
+            self.setAttribute(Qt.WA_OpaquePaintEvent)
+        width = int(np.ceil(glyph_text_width(template, font)))
+        self.setFixedSize(width + 2 * padding, self.metrics.height() + 2 * padding)
+
+    def text(self):
+        return self._text
+
+    def setText(self, text):
+        old, self._text = self._text, text
+        same = 0
+        for a, b in zip(old, text):
+            if a != b:
+                break
+            same += 1
+        if same == len(old) == len(text):
+            return
+        # Glif pixmap'leri bir piksel soldan başlar, çıkıntı payıyla iki piksel geriden
+        x = max(0, round(self.padding + glyph_text_width(text[:same], self.text_font)) - 2)
+        self.update(QRect(x, 0, self.width() - x, self.height()))
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if self.background is None:
+            option = QStyleOption()
+            option.initFrom(self)
+            self.style().drawPrimitive(QStyle.PE_Widget, option, painter, self)
+        else:
+            painter.fillRect(event.rect(), self.background)
+        draw_glyph_text(painter, self.padding, self.padding + self.metrics.ascent(), self._text, self.text_font,
+                        self.color)
+
+
+class BatteryWidget(QWidget, ScheduledRepaint):
+    # İstenen MAVLink mesajları ve hızları (Hz), bağlanınca araçtan bunlar istenir
+    MAVLINK_MESSAGES = {'SYS_STATUS': 2}
+
+    # (en düşük seviye, renk, dolu bölme sayısı)
+    LEVELS = ((75, QColor(0, 100, 0), 4), (50, QColor(100, 238, 100), 3), (25, QColor(255, 165, 0), 2),
+              (0, QColor(255, 0, 0), 1))
+    BATTERY_WIDTH = 100
+    BATTERY_HEIGHT = 40
 
-class BatteryWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.battery_level = 0
+        self.text_font = instrument_font(12)
+        self.frame_pen = QPen(Qt.green, 3)
+        self.text_color = QColor(Qt.black)
+        self.brushes = [QBrush(color, Qt.SolidPattern) for _, color, _ in self.LEVELS]
+        self.text_width = QFontMetrics(self.text_font).horizontalAdvance("% 100")
         self.initUI()
 
     def initUI(self):
@@ -25,48 +317,56 @@ class BatteryWidget(QWidget):
 
     def update_battery_level(self, level):
         self.battery_level = level
-        self.update()
+        self.request_repaint()
+
+    def level_index(self):
+        if self.battery_level == 0:
+            return None
+        for i, (minimum, _, _) in enumerate(self.LEVELS):
+            if self.battery_level >= minimum:
+                return i
+        return len(self.LEVELS) - 1
+
+    def display_state(self):
+        return (self.level_index(), self.battery_level)
+
+    def changed_rect(self, old_state, new_state):
+        # Bölmeler aynıysa sadece yüzde yazısı değişti
+        if old_state[0] == new_state[0] and new_state[0] is not None:
+            return self.text_rect()
+        return None
+
+    def battery_origin(self):
+        return (self.width() // 2 - self.BATTERY_WIDTH // 2, self.height() // 2 - self.BATTERY_HEIGHT // 2)
+
+    def text_rect(self):
+        battery_x, battery_y = self.battery_origin()
+        ascent = QFontMetricsF(self.text_font).ascent()
+        # Glif pixmap'leri bir piksel soldan başlar
+        return QRect(battery_x + 9, int(battery_y + 25 - ascent) - 1, self.text_width + 4,
+                     QFontMetrics(self.text_font).height() + 2)
 
     def paintEvent(self, event):
         painter = QPainter(self)
         self.drawBattery(painter)
 
     def drawBattery(self, painter):
-        rect = self.rect()
         painter.setBrush(Qt.NoBrush)
 
-        battery_width = 100
-        battery_height = 40
+        battery_width = self.BATTERY_WIDTH
+        battery_height = self.BATTERY_HEIGHT
+        battery_x, battery_y = self.battery_origin()
 
-        center_x = rect.width() // 2
-        center_y = rect.height() // 2
-
-        battery_x = center_x - battery_width // 2
-        battery_y = center_y - battery_height // 2
-
-        pen = QPen(Qt.green, 3)
-        painter.setPen(pen)
+        painter.setPen(self.frame_pen)
         painter.drawRect(battery_x, battery_y, battery_width, battery_height)
 
-        level = self.battery_level
-        if level == 0:
+        index = self.level_index()
+        if index is None:
             return
-
-        if level >= 75:
-            color = QColor(0, 100, 0)
-            segments = 4
-        elif level >= 50:
-            color = QColor(100, 238, 100)
-            segments = 3
-        elif level >= 25:
-            color = QColor(255, 165, 0)
-            segments = 2
-        else:
-            color = QColor(255, 0, 0)
-            segments = 1
+        segments = self.LEVELS[index][2]
 
         painter.setPen(Qt.NoPen)
-        painter.setBrush(QBrush(color, Qt.SolidPattern))
+        painter.setBrush(self.brushes[index])
 
         segment_width = (battery_width // 4) - 8
         segment_height = battery_height - 10
@@ -77,17 +377,89 @@ class BatteryWidget(QWidget):
             segment_y = battery_y + 5
             painter.drawRect(segment_x, segment_y, segment_width, segment_height)
 
-        painter.setPen(QPen(Qt.black))
-        painter.setFont(QFont("Armstrong", 12))
         text_x = battery_x + 10
         text_y = battery_y + 25
-        painter.drawText(text_x, text_y, f"% {self.battery_level}")
+        draw_glyph_text(painter, text_x, text_y, f"% {self.battery_level}", self.text_font, self.text_color)
 
 
-class VerticalSpeedGaugeWidget(QWidget):
+def draw_ticks(painter, center_x, center_y, radius, values, angles, major_step):
+    # Tüm çentik koordinatları tek seferde numpy ile hesaplanır
+    radians = np.radians(angles)
+    cos_a = np.cos(radians)
+    sin_a = np.sin(radians)
+    major = values % major_step == 0
+    inner = np.where(major, radius - 20, radius - 10)
+    x1 = np.trunc(center_x + inner * cos_a).astype(int)
+    y1 = np.trunc(center_y - inner * sin_a).astype(int)
+    x2 = np.trunc(center_x + (radius - 5) * cos_a).astype(int)
+    y2 = np.trunc(center_y - (radius - 5) * sin_a).astype(int)
+    painter.drawLines([QLine(*line) for line in zip(x1.tolist(), y1.tolist(), x2.tolist(), y2.tolist())])
+
+    text_x = np.trunc(center_x + (radius - 35) * cos_a[major]).astype(int)
+    text_y = np.trunc(center_y - (radius - 35) * sin_a[major]).astype(int)
+    for value, x, y in zip(values[major].tolist(), text_x.tolist(), text_y.tolist()):
+        painter.drawText(x - 10, y + 5, f"{value}")
+
+
+class InstrumentWidget(QWidget, ScheduledRepaint):
+    # Statik kadran bir kez QPixmap'e çizilir, sadece boyut değişince yenilenir
+    STATS_KEY = 'telemetry.repaint'
+
+    def __init__(self):
+        super().__init__()
+        self._static_layer = None
+        self.data_timestamp = None
+        self._last_data_timestamp = None
+
+    def mark_data(self, timestamp):
+        # Gösterilen verinin kaynağa ulaştığı an; bir sonraki boyamada gecikme ölçülür
+        if timestamp != self._last_data_timestamp:
+            self.data_timestamp = timestamp
+            self._last_data_timestamp = timestamp
+
+    def flush_display(self):
+        repainted = super().flush_display()
+        if not repainted:
+            # Değer ekranda değişmedi, bu veri için boyama ölçülmeyecek
+            self.data_timestamp = None
+        return repainted
+
+    def event(self, event):
+        result = super().event(event)
+        if event.type() == QEvent.Paint and self.data_timestamp is not None:
+            pipeline_stats.record(self.STATS_KEY, time.perf_counter() - self.data_timestamp)
+            self.data_timestamp = None
+        return result
+
+    def resizeEvent(self, event):
+        self._static_layer = None
+        super().resizeEvent(event)
+
+    def static_layer(self):
+        dpr = self.devicePixelRatioF()
+        if self._static_layer is None or self._static_layer.devicePixelRatio() != dpr:
+            pixmap = QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            self.drawStatic(painter)
+            painter.end()
+            self._static_layer = pixmap
+        return self._static_layer
+
+    def drawStatic(self, painter):
+        pass
+
+
+class VerticalSpeedGaugeWidget(InstrumentWidget):
+    MAVLINK_MESSAGES = {'VFR_HUD': 10}
+
     def __init__(self):
         super().__init__()
         self.value = 0
+        self.value_font = instrument_font(65)
+        self.value_color = QColor(240, 240, 240, 255)
         self.initUI()
 
     def initUI(self):
@@ -97,11 +469,14 @@ class VerticalSpeedGaugeWidget(QWidget):
 
     def update_value(self, value):
         self.value = value
-        self.update()
+        self.request_repaint()
+
+    def display_state(self):
+        return (int(self.value * 3), int(abs(self.value)), self.value < 0)
 
     def paintEvent(self, event):
         painter = QPainter(self)
-        self.drawBackground(painter)
+        painter.drawPixmap(0, 0, self.static_layer())
         self.drawGauge(painter)
         self.drawText(painter)
 
@@ -110,75 +485,56 @@ class VerticalSpeedGaugeWidget(QWidget):
         painter.setBrush(QBrush(QColor(0, 7, 14, 255)))
         painter.drawRect(self.rect())
 
-    def drawGauge(self, painter):
+    def drawStatic(self, painter):
+        self.drawBackground(painter)
         center_x = self.width() // 2
         center_y = self.height() // 2
         radius = 100
-        radius2 = 110
-        painter.setRenderHint(QPainter.Antialiasing)
 
         pen = QPen(QColor(127, 127, 127, 255), 2)
         painter.setPen(pen)
         painter.drawArc(center_x - radius, center_y - radius, 2 * radius, 2 * radius, -90 * 16, 240 * 16)
 
-        if self.value >= 0:
-            pen_up = QPen(QColor(25, 25, 255), 8)
-            painter.setPen(pen_up)
-            angle_start = 0
-            angle_span = int(self.value * 3)
-        else:
-            pen_down = QPen(QColor(255, 165, 0), 8)
-            painter.setPen(pen_down)
-            angle_start = 0
-            angle_span = int(self.value * 3)
-
-        painter.drawArc(center_x - radius2, center_y - radius2, 2 * radius2, 2 * radius2, angle_start * 16, angle_span * 16)
-
         painter.setPen(QPen(Qt.gray, 2))
-        font = QFont("Armstrong", 8)
-        painter.setFont(font)
-        for i in range(-30, 31, 2):
-            angle = 0 + i * 3
-            if i % 15 == 0:
-                x1 = int(center_x + (radius - 20) * cos(angle * pi / 180))
-                y1 = int(center_y - (radius - 20) * sin(angle * pi / 180))
-                x2 = int(center_x + (radius - 5) * cos(angle * pi / 180))
-                y2 = int(center_y - (radius - 5) * sin(angle * pi / 180))
-                text_x = int(center_x + (radius - 35) * cos(angle * pi / 180))
-                text_y = int(center_y - (radius - 35) * sin(angle * pi / 180))
-                painter.drawText(text_x - 10, text_y + 5, f"{i}")
-            else:
-                x1 = int(center_x + (radius - 10) * cos(angle * pi / 180))
-                y1 = int(center_y - (radius - 10) * sin(angle * pi / 180))
-                x2 = int(center_x + (radius - 5) * cos(angle * pi / 180))
-                y2 = int(center_y - (radius - 5) * sin(angle * pi / 180))
-            painter.drawLine(x1, y1, x2, y2)
+        painter.setFont(instrument_font(8))
+        values = np.arange(-30, 31, 2)
+        draw_ticks(painter, center_x, center_y, radius, values, values * 3, 15)
 
-        font = QFont("Armstrong", 5)
-        painter.setFont(font)
+        painter.setFont(instrument_font(5))
         painter.setPen(QPen(Qt.gray))
         painter.drawText(center_x + 55, center_y - 40, "UP")
         painter.drawText(center_x + 40, center_y + 45, "DOWN")
 
-    def drawText(self, painter):
-        center_x = self.width() // 2
-        center_y = self.height() // 2
-
         painter.setPen(QPen(QColor(240, 240, 240, 255)))
-        font = QFont("Armstrong", 8)
-        painter.setFont(font)
+        painter.setFont(instrument_font(8))
         painter.drawText(center_x - 100, center_y - 10, "VERTICAL SPEED")
 
-        font.setPointSize(12)
-        painter.setFont(font)
+        painter.setFont(instrument_font(12))
         painter.drawText(center_x - 25, center_y + 10, "m/s")
 
-        font.setPointSize(65)
-        painter.setFont(font)
+    def drawGauge(self, painter):
+        center_x = self.width() // 2
+        center_y = self.height() // 2
+        radius2 = 110
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        if self.value >= 0:
+            painter.setPen(QPen(QColor(25, 25, 255), 8))
+        else:
+            painter.setPen(QPen(QColor(255, 165, 0), 8))
+        angle_start = 0
+        angle_span = int(self.value * 3)
+
+        painter.drawArc(center_x - radius2, center_y - radius2, 2 * radius2, 2 * radius2, angle_start * 16, angle_span * 16)
+
+    def drawText(self, painter):
+        center_x = self.width() // 2
+        center_y = self.height() // 2
+
         value_str = str(int(abs(self.value)))
-        fm = QFontMetrics(font)
-        text_width = fm.width(value_str)
-        painter.drawText(center_x - text_width - 30, center_y + 100, value_str)
+        text_width = glyph_text_width(value_str, self.value_font)
+        draw_glyph_text(painter, center_x - text_width - 30, center_y + 100, value_str, self.value_font,
+                        self.value_color)
 
         rect_x = center_x - 85
         rect_y = center_y + 0
@@ -193,10 +549,14 @@ class VerticalSpeedGaugeWidget(QWidget):
         painter.drawRect(rect_x, rect_y, rect_width, rect_height)
 
 
-class AirSpeedGaugeWidget(QWidget):
+class AirSpeedGaugeWidget(InstrumentWidget):
+    MAVLINK_MESSAGES = {'VFR_HUD': 10}
+
     def __init__(self):
         super().__init__()
         self.value = 0
+        self.value_font = instrument_font(65)
+        self.value_color = QColor(240, 240, 240, 255)
         self.initUI()
 
     def initUI(self):
@@ -206,11 +566,15 @@ class AirSpeedGaugeWidget(QWidget):
 
     def update_value(self, value):
         self.value = value
-        self.update()
+        self.request_repaint()
+
+    def display_state(self):
+        return (int(self.value * 6 * -16), int(abs(self.value)),
+                min(255, int(255 * (self.value / 40.0))), max(0, 165 - int(165 * (self.value / 40.0))))
 
     def paintEvent(self, event):
         painter = QPainter(self)
-        self.drawBackground(painter)
+        painter.drawPixmap(0, 0, self.static_layer())
         self.drawGauge(painter)
         self.drawText(painter)
 
@@ -219,21 +583,39 @@ class AirSpeedGaugeWidget(QWidget):
         painter.setBrush(QBrush(QColor(0, 7, 14, 255)))
         painter.drawRect(self.rect())
 
-    def drawGauge(self, painter):
+    def drawStatic(self, painter):
+        self.drawBackground(painter)
         center_x = self.width() // 2
         center_y = self.height() // 2
         radius = 100
-        radius2 = 110
-        painter.setRenderHint(QPainter.Antialiasing)
-
-        angle_start = 270
-        angle_span = self.value * 6
 
         # Draw the arc for the gauge
         pen = QPen(QColor(127, 127, 127, 255), 2)
         painter.setPen(pen)
         painter.drawArc(center_x - radius, center_y - radius, 2 * radius, 2 * radius, 30 * 16, 240 * 16)
 
+        # Draw the ticks and labels inside the arc
+        painter.setPen(QPen(Qt.gray, 2))
+        painter.setFont(instrument_font(8))
+        values = np.arange(0, 41, 1)
+        draw_ticks(painter, center_x, center_y, radius, values, -90 - values * 6, 10)
+
+        painter.setPen(QPen(QColor(240, 240, 240, 255)))
+        painter.setFont(instrument_font(8))
+        painter.drawText(center_x - 37, center_y - 10, "AIR SPEED")
+
+        painter.setFont(instrument_font(12))
+        painter.drawText(center_x - 36 , center_y + 10, "m/s")
+
+    def drawGauge(self, painter):
+        center_x = self.width() // 2
+        center_y = self.height() // 2
+        radius2 = 110
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        angle_start = 270
+        angle_span = self.value * 6
+
         # Calculate the color based on the value
         red = min(255, int(255 * (self.value / 40.0)))
         green = max(0, 165 - int(165 * (self.value / 40.0)))
@@ -243,53 +625,23 @@ class AirSpeedGaugeWidget(QWidget):
 
         painter.drawArc(center_x - radius2, center_y - radius2, 2 * radius2, 2 * radius2, int(angle_start * 16), int(angle_span * -16))
 
-        # Draw the ticks and labels inside the arc
-        painter.setPen(QPen(Qt.gray, 2))
-        font = QFont("Armstrong", 8)
-        painter.setFont(font)
-        for i in range(-0, 41, 1):
-            angle = - 90 - i * 6
-            if i % 10 == 0:
-                x1 = int(center_x + (radius - 20) * cos(angle * pi / 180))
-                y1 = int(center_y - (radius - 20) * sin(angle * pi / 180))
-                x2 = int(center_x + (radius - 5) * cos(angle * pi / 180))
-                y2 = int(center_y - (radius - 5) * sin(angle * pi / 180))
-                text_x = int(center_x + (radius - 35) * cos(angle * pi / 180))
-                text_y = int(center_y - (radius - 35) * sin(angle * pi / 180))
-                painter.drawText(text_x - 10, text_y + 5, f"{i}")
-            else:
-                x1 = int(center_x + (radius - 10) * cos(angle * pi / 180))
-                y1 = int(center_y - (radius - 10) * sin(angle * pi / 180))
-                x2 = int(center_x + (radius - 5) * cos(angle * pi / 180))
-                y2 = int(center_y - (radius - 5) * sin(angle * pi / 180))
-            painter.drawLine(x1, y1, x2, y2)
-
     def drawText(self, painter):
         center_x = self.width() // 2
         center_y = self.height() // 2
 
-        painter.setPen(QPen(QColor(240, 240, 240, 255)))
-        font = QFont("Armstrong", 8)
-        painter.setFont(font)
-        painter.drawText(center_x - 37, center_y - 10, "AIR SPEED")
-
-        font.setPointSize(12)
-        painter.setFont(font)
-        painter.drawText(center_x - 36 , center_y + 10, "m/s")
-
-        font.setPointSize(65)
-        painter.setFont(font)
         value_str = str(int(abs(self.value)))
-        fm = QFontMetrics(font)
-        text_width = fm.width(value_str)
-        painter.drawText(center_x + 20, center_y + 90, str(value_str))
+        draw_glyph_text(painter, center_x + 20, center_y + 90, value_str, self.value_font, self.value_color)
 
 
-class GraphWidget(QWidget):
+class GraphWidget(InstrumentWidget):
+    MAVLINK_MESSAGES = {'ATTITUDE': 25}
+
     def __init__(self):
         super().__init__()
         self.y_value = 0
         self.x_value = 0
+        self.ladder_values = np.arange(-30, 31, 10)
+        self.ladder_fonts = (instrument_font(6), instrument_font(8))
         self.initUI()
 
     def initUI(self):
@@ -300,14 +652,21 @@ class GraphWidget(QWidget):
     def update_graph(self, y, x):
         self.y_value = y
         self.x_value = -x
-        self.update()
+        self.request_repaint()
+
+    def ladder_offsets(self):
+        # Çizimle aynı tam sayı kaymalar: anahtar aynıysa merdiven aynı piksellerde
+        return ((self.ladder_values - self.y_value) * 3.5).astype(int)
+
+    def display_state(self):
+        # 0.1 dereceden küçük dönüşler ekranda fark edilmez
+        return (round(self.x_value, 1), int(100 + self.y_value * 3.33), tuple(self.ladder_offsets().tolist()))
 
     def paintEvent(self, event):
         painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.static_layer())
         painter.setRenderHint(QPainter.Antialiasing)
 
-        painter.fillRect(self.rect(), QColor(0, 7, 14, 255))
-
         width = self.width()
         height = self.height()
         center_x = width // 2
@@ -323,6 +682,21 @@ class GraphWidget(QWidget):
 
         self.draw_graph(painter)
 
+    def drawStatic(self, painter):
+        painter.fillRect(self.rect(), QColor(0, 7, 14, 255))
+
+        center_x = self.width() // 2
+        center_y = self.height() // 2
+
+        # Daire dönmeye göre değişmez, çerçeve ile birlikte önceden çizilir
+        path = QPainterPath()
+        path.addEllipse(center_x - 100, center_y - 100, 200, 200)
+        painter.setClipPath(path)
+
+        painter.setPen(QPen(QColor(127, 127, 127, 255), 4))
+        painter.setBrush(QBrush(Qt.black))
+        painter.drawEllipse(center_x - 100, center_y - 100, 200, 200)
+
     def draw_graph(self, painter):
         width = self.width()
         height = self.height()
@@ -331,153 +705,1760 @@ class GraphWidget(QWidget):
         center_y = height // 2
 
         painter.setPen(QPen(QColor(127, 127, 127, 255), 4))
-        painter.setBrush(QBrush(Qt.black))
-        painter.drawEllipse(center_x - 100, center_y - 100, 200, 200)
-
         painter.setBrush(QBrush(QColor(0, 0, 255)))
         painter.drawRect(center_x - 100, center_y - 100, 200, int(100 + self.y_value * 3.33))
 
         painter.setPen(QPen(QColor(255, 255, 255, 255), 10))
         painter.drawPoint(center_x, center_y)
 
-        for i, value in enumerate(range(-30, 31, 10)):
-            y_position = center_y - int((value - self.y_value) * 3.5)
-
+        y_positions = center_y - self.ladder_offsets()
+        painter.setPen(QPen(QColor(255, 255, 255), 3))
+        for i, (value, y_position) in enumerate(zip(self.ladder_values.tolist(), y_positions.tolist())):
             if i % 2 == 0:
                 line_length = 60
-                font_size = 6
+                font = self.ladder_fonts[0]
             else:
                 line_length = 20
-                font_size = 8
+                font = self.ladder_fonts[1]
 
-            painter.setPen(QPen(QColor(255, 255, 255), 3))
             painter.drawLine(center_x - line_length // 2, y_position, center_x + line_length // 2, y_position)
 
-            painter.setFont(QFont("Armstrong", font_size))
+            painter.setFont(font)
             painter.drawText(center_x + 40, y_position + 5, str(value))
 
 
+# Qt 5.14 öncesinde Format_BGR888 yok, o zaman kanal sırası worker'da çevrilir
+BGR888_FORMAT = getattr(QImage, 'Format_BGR888', None)
+
+
+class FrameMailbox:
+    # Tek slotlu "son kare kazanır" teslimi: ekran geride kalırsa eski kare ezilir
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frame = None
+        self._timestamps = None
+        self.received = 0
+        self.decoded = 0
+        self.shown = 0
+        self.dropped = 0
+
+    def is_full(self):
+        return self._frame is not None
+
+    def count_received(self):
+        with self._lock:
+            self.received += 1
+
+    def count_dropped(self):
+        with self._lock:
+            self.dropped += 1
+
+    def put(self, frame, timestamps=None):
+        with self._lock:
+            was_empty = self._frame is None
+            if not was_empty:
+                self.dropped += 1
+            self._frame = frame
+            self._timestamps = timestamps
+            self.decoded += 1
+        return was_empty
+
+    def take(self):
+        with self._lock:
+            frame = self._frame
+            timestamps = self._timestamps
+            self._frame = None
+            self._timestamps = None
+            if frame is not None:
+                self.shown += 1
+        return frame, timestamps
+
+    def valid(self):
+        # Kareler worker'ın kendi dizileri, alındıktan sonra değişmez
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                'received': self.received,
+                'decoded': self.decoded,
+                'shown': self.shown,
+                'dropped': self.dropped,
+            }
+
+
+class JpegDecodePool:
+    # cv2.imdecode ve cv2.resize GIL'i bırakır, thread havuzu tüm çekirdekleri kullanabilir
+    def __init__(self, workers=None):
+        self.executor = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 2,
+                                           thread_name_prefix='jpeg-decode')
+
+    def submit(self, fn, *args):
+        return self.executor.submit(fn, *args)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+
 class VideoStreamWorker(QThread):
-    frame_received = pyqtSignal(np.ndarray)
+    frame_ready = pyqtSignal()
+    CHUNK_SIZE = 64 * 1024
+    # (bağlanma, okuma) zaman aşımı; kamera kapalıysa thread sonsuza kadar takılmaz
+    TIMEOUT = (3, 5)
+    RETRY_DELAY = 1.0
 
-    def __init__(self, url):
+    def __init__(self, url, mailbox=None, recorder=None, decode_pool=None, max_fps=None):
         super().__init__()
         self.url = url
+        self.mailbox = mailbox if mailbox is not None else FrameMailbox()
+        self.recorder = recorder
+        self.decode_pool = decode_pool
+        self.set_max_fps(max_fps)
+        self.target_size = None
+        self._pending = None
+        self._decoding = False
+        self._last_accepted = 0.0
+        self._state_lock = threading.Lock()
+        self._response = None
         self._run_flag = True
 
+    def set_max_fps(self, max_fps):
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+
     def run(self):
+        import requests
         while self._run_flag:
             try:
-                response = requests.get(self.url, stream=True)
-                response.raise_for_status()
-                bytes_data = b''
-                for chunk in response.iter_content(chunk_size=1024):
-                    bytes_data += chunk
-                    a = bytes_data.find(b'\xff\xd8')
-                    b = bytes_data.find(b'\xff\xd9')
-                    if a != -1 and b != -1:
-                        jpg = bytes_data[a:b+2]
-                        bytes_data = bytes_data[b+2:]
-                        img = cv2.imdecode(np.frombuffer(jpg, dtype=np.uint8), cv2.IMREAD_COLOR)
-                        if img is not None:
-                            self.frame_received.emit(img)
-                        else:
-                            print("Görüntü çözme hatası")
-            except requests.exceptions.RequestException as e:
-                print(f"Bağlantı hatası: {e}")
-                break
+                with requests.get(self.url, stream=True, timeout=self.TIMEOUT) as response:
+                    self._response = response
+                    if not self._run_flag:
+                        break
+                    response.raise_for_status()
+                    parser = MjpegParser()
+                    for chunk in self.iter_chunks(response):
+                        if not self._run_flag:
+                            break
+                        received_at = time.perf_counter()
+                        pipeline_stats.tick('video.chunk', received_at)
+                        for jpg in parser.feed(chunk):
+                            self.handle_jpeg(jpg, received_at)
+                        self.flush_pending()
+            except Exception as e:
+                # stop() soketi kapattıysa okuma hatası beklenen durum
+                if self._run_flag:
+                    print(f"Bağlantı hatası: {e}")
+            finally:
+                self._response = None
+            self.sleep_while_running(self.RETRY_DELAY)
+
+    def sleep_while_running(self, seconds):
+        deadline = time.monotonic() + seconds
+        while self._run_flag and time.monotonic() < deadline:
+            self.msleep(50)
+
+    def handle_jpeg(self, jpg, received_at=None):
+        if received_at is None:
+            received_at = time.perf_counter()
+        pipeline_stats.tick('video.frame', received_at)
+        self.mailbox.count_received()
+        if self.recorder is not None:
+            self.recorder.write('video', jpg)
+        if received_at - self._last_accepted < self.min_interval:
+            # Akış başına fps sınırı: kare hiç çözülmeden atılır
+            self.mailbox.count_dropped()
+            return
+        self._last_accepted = received_at
+        with self._state_lock:
+            if self._pending is not None:
+                # Hiç çözülmeden yenisi geldi
+                self.mailbox.count_dropped()
+                self._pending = None
+            if self.mailbox.is_full() or self._decoding:
+                # Ekran önceki kareyi henüz almadı, çözmeyi ertele
+                self._pending = (bytes(jpg), received_at)
+                return
+            self._decoding = self.decode_pool is not None
+        self.start_decode(jpg, received_at)
+
+    def flush_pending(self):
+        with self._state_lock:
+            if self._pending is None or self.mailbox.is_full() or self._decoding:
+                return
+            jpg, received_at = self._pending
+            self._pending = None
+            self._decoding = self.decode_pool is not None
+        self.start_decode(jpg, received_at)
+
+    def start_decode(self, jpg, received_at):
+        if self.decode_pool is None:
+            self.decode(jpg, received_at)
+        else:
+            # memoryview parser tamponuna bağlı, havuza kopyası gider
+            self.decode_pool.submit(self.decode_job, bytes(jpg), received_at)
 
-    def stop(self):
+    def decode_job(self, jpg, received_at):
+        try:
+            self.decode(jpg, received_at)
+        except Exception as e:
+            print(f"Görüntü çözme hatası: {e}")
+        finally:
+            with self._state_lock:
+                self._decoding = False
+
+    def decode(self, jpg, received_at=None):
+        import cv2
+        if received_at is None:
+            received_at = time.perf_counter()
+        target_size = self.target_size
+        flag = reduced_decode_flag(jpeg_size(jpg), target_size)
+        img = cv2.imdecode(np.frombuffer(jpg, dtype=np.uint8), flag)
+        if img is None:
+            print("Görüntü çözme hatası")
+            return
+        if target_size is not None and (img.shape[1], img.shape[0]) != target_size:
+            interpolation = cv2.INTER_AREA if img.shape[1] > target_size[0] else cv2.INTER_LINEAR
+            img = cv2.resize(img, target_size, interpolation=interpolation)
+        if BGR888_FORMAT is None:
+            img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        decoded_at = time.perf_counter()
+        pipeline_stats.record('video.decode', decoded_at - received_at)
+        if self.mailbox.put(img, (received_at, decoded_at)):
+            self.frame_ready.emit()
+
+    def iter_chunks(self, response):
+        return iter_raw_chunks(response, self.CHUNK_SIZE)
+
+    def stop(self, wait=True):
+        # wait=False: arayüz thread'i beklemez, thread soket kapanınca kendisi biter
         self._run_flag = False
-        self.wait()
+        response = self._response
+        if response is not None:
+            abort_response(response)
+        if wait:
+            self.wait()
+
+class ReplayVideoWorker(VideoStreamWorker):
+    def __init__(self, session, url=None, mailbox=None, recorder=None):
+        super().__init__(url, mailbox, recorder)
+        self.session = session
+
+    def run(self):
+        for timestamp, jpg in replay_entries(self.session, 'video', lambda: self._run_flag):
+            self.handle_jpeg(jpg)
+            self.flush_pending()
+
+
+class JpegPassThrough:
+    # Başsız sunucu: kareler çözülmeden olduğu gibi publish(jpg) ile yayınlanır; fps sınırı sunucuda
+    # istemci başına uygulanır
+    publish = None
+
+    def handle_jpeg(self, jpg, received_at=None):
+        if received_at is None:
+            received_at = time.perf_counter()
+        pipeline_stats.tick('video.frame', received_at)
+        if self.recorder is not None:
+            self.recorder.write('video', jpg)
+        self.publish(jpg)
+
+    def flush_pending(self):
+        pass
+
+
+class PassThroughVideoWorker(JpegPassThrough, VideoStreamWorker):
+    def __init__(self, url, publish, recorder=None):
+        super().__init__(url, recorder=recorder)
+        self.publish = publish
+
+
+class IoTask:
+    # QThread worker'larının start/isRunning/stop arayüzü; iş ayrı thread yerine IoCore döngüsünde
+    # bir görev (session) olarak çalışır, bağlantı koparsa çekirdek geri çekilerek yeniden bağlar
+    io_core = None
+    tasks = ()
+
+    def sources(self):
+        return [(self.source_name, self.session)]
+
+    def start(self):
+        self.tasks = [self.io_core.start_source(name, session) for name, session in self.sources()]
+
+    def isRunning(self):
+        return any(not task.done() for task in self.tasks)
+
+    def stop(self, wait=True):
+        # Görev iptali döngüde hemen işlenir, beklenecek thread yok
+        self._run_flag = False
+        for task in self.tasks:
+            task.cancel()
+
+
+class AsyncVideoSource(IoTask, VideoStreamWorker):
+    # Okuma döngüde, çözme havuzda: döngü thread'i imdecode ile bloklanmamalı
+    def __init__(self, url, mailbox=None, recorder=None, decode_pool=None, max_fps=None, io_core=None):
+        super().__init__(url, mailbox, recorder, decode_pool, max_fps)
+        self.io_core = io_core
+        self.source_name = f"video {url.split('/')[2]}"
+
+    async def session(self, health):
+        from io_core import http_get
+        response = await http_get(self.url, timeout=self.TIMEOUT)
+        try:
+            response.raise_for_status()
+            parser = MjpegParser()
+            async for chunk in response.chunks(self.CHUNK_SIZE):
+                received_at = time.perf_counter()
+                health.data()
+                pipeline_stats.tick('video.chunk', received_at)
+                for jpg in parser.feed(chunk):
+                    self.handle_jpeg(jpg, received_at)
+                self.flush_pending()
+        finally:
+            response.close()
+
+
+class AsyncPassThroughVideoSource(JpegPassThrough, AsyncVideoSource):
+    def __init__(self, url, publish, recorder=None, io_core=None):
+        super().__init__(url, recorder=recorder, io_core=io_core)
+        self.publish = publish
+
+
+class ProcessVideoSource(QObject):
+    # VideoStreamWorker yerine geçer: okuma ve çözme ayrı süreçte, kareler paylaşılan bellekte.
+    # Arayüz süreci sadece halkanın son seq'ini yoklar, GIL'i video ile paylaşmaz.
+    frame_ready = pyqtSignal()
+    SLOTS = 4
+    MAX_SIZE = (1920, 1080)
+    POLL_INTERVAL = 5
+    REAP_INTERVAL = 100
+    STOP_TIMEOUT = 2.0
+    # Süreci bitmeyi bekleyen kaynaklar; referans bırakılırsa toplama zamanlayıcısı da silinir
+    stopping = set()
+
+    def __init__(self, url, mailbox=None, recorder=None):
+        super().__init__()
+        from frame_ring import SharedFrameRing, SharedFrameMailbox
+        self.url = url
+        self.ring = SharedFrameRing.create(self.SLOTS, self.MAX_SIZE)
+        self.mailbox = SharedFrameMailbox(self.ring)
+        # fork Qt thread'leri olan süreçte güvenli değil
+        self.context = multiprocessing.get_context('spawn')
+        self.stop_event = self.context.Event()
+        self.process = None
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setTimerType(Qt.PreciseTimer)
+        self.poll_timer.timeout.connect(self.poll)
+        self.reap_timer = QTimer(self)
+        self.reap_timer.timeout.connect(self.reap)
+        self.stop_deadline = None
+        self.terminated = False
+
+    @property
+    def target_size(self):
+        return self.ring.target_size()
+
+    @target_size.setter
+    def target_size(self, size):
+        if size is not None:
+            self.ring.set_target_size(size)
+
+    def start(self):
+        from frame_ring import ingest_process
+        self.process = self.context.Process(
+            target=ingest_process,
+            args=(self.url, self.ring.name, self.SLOTS, self.MAX_SIZE, BGR888_FORMAT is None, self.stop_event),
+            daemon=True)
+        self.process.start()
+        self.poll_timer.start(self.POLL_INTERVAL)
+
+    def poll(self):
+        if self.mailbox.has_new():
+            self.frame_ready.emit()
+
+    def isRunning(self):
+        return self.process is not None and self.process.is_alive()
+
+    def stop(self, wait=True):
+        # wait worker arayüzü için; süreç arayüz thread'inde beklenmez, sadece durması istenir ve
+        # bitince zamanlayıcıyla toplanır. Paylaşılan bellek adı hemen silinir, eşlemeler süreç
+        # bitene kadar geçerli kalır (program kapanırken de /dev/shm'de artık kalmaz).
+        self.poll_timer.stop()
+        self.stop_event.set()
+        self.ring.unlink()
+        if self.process is None:
+            self.ring.close()
+            return
+        self.stop_deadline = time.monotonic() + self.STOP_TIMEOUT
+        ProcessVideoSource.stopping.add(self)
+        self.reap_timer.start(self.REAP_INTERVAL)
+
+    def reap(self):
+        if self.process.is_alive():
+            if not self.terminated and time.monotonic() >= self.stop_deadline:
+                self.process.terminate()
+                self.terminated = True
+            return
+        # Süreç bitti: join hemen döner (zombi toplanır)
+        self.process.join()
+        self.reap_timer.stop()
+        self.ring.close()
+        ProcessVideoSource.stopping.discard(self)
+
+
+class HudOverlay:
+    # Videonun üzerine aynı boyama geçişinde çizilen HUD: yunuslama merdiveni, yatış göstergesi,
+    # hız/tırmanma bantları ve batarya. Yazılar, bant ölçekleri ve sabit semboller boyut değişince
+    # bir kez küçük sprite'lara çizilir; her karede sadece bunlar kopyalanır ve görünen merdiven
+    # çizgileri çizilir. Tam ekran saydam katman ve döndürülmüş bitmap yok (ikisi de 1080p'de ms'ler
+    # sürüyor), değer kutuları önceden çizilmiş karakterlerden birleştirilir.
+    COLOR = QColor(0, 255, 120)
+    BACKGROUND = QColor(0, 0, 0, 110)
+    BOX = QColor(0, 0, 0, 200)
+    # Ekran yüksekliğinde görünen yunuslama aralığı (derece)
+    PITCH_SPAN = 60
+    ROLL_TICKS = (-60, -45, -30, -20, -10, 0, 10, 20, 30, 45, 60)
+    # (alan, en küçük, en büyük, görünen aralık, etiket adımı)
+    TAPES = {
+        'airspeed': ('airspeed', 0, 80, 20, 5),
+        'climb': ('climb', -20, 20, 10, 2),
+    }
+
+    def __init__(self):
+        self.values = {'roll': 0.0, 'pitch': 0.0, 'airspeed': 0.0, 'climb': 0.0, 'battery_remaining': None}
+        self.size = None
+        self.sprites = {}
+        self.glyphs = {}
+        # Değer kutuları ve merdiven geometrisi gösterdikleri değerle anahtarlanır: telemetri
+        # değişmeden gelen video karelerinde yeniden oluşturulmaz, sadece kopyalanır
+        self.readouts = {}
+        self.ladder = None
+
+    def set_values(self, telemetry):
+        # Değişen bir şey varsa True: video durmuşsa bile widget yeniden boyansın
+        changed = False
+        for name in self.values:
+            value = telemetry.get(name)
+            if value is not None and value != self.values[name]:
+                self.values[name] = value
+                changed = True
+        return changed
+
+    def font(self, pixels):
+        font = QFont(instrument_font(12))
+        font.setPixelSize(max(8, int(pixels)))
+        font.setBold(True)
+        return font
+
+    def sprite(self, width, height):
+        pixmap = QPixmap(max(1, int(width)), max(1, int(height)))
+        pixmap.fill(Qt.transparent)
+        return pixmap
+
+    def text_sprite(self, text, font, color):
+        metrics = QFontMetrics(font)
+        pixmap = self.sprite(metrics.horizontalAdvance(text), metrics.height())
+        painter = QPainter(pixmap)
+        painter.setFont(font)
+        painter.setPen(color)
+        painter.drawText(0, metrics.ascent(), text)
+        painter.end()
+        return pixmap
+
+    def layout(self, size):
+        self.size = size
+        w, h = size.width(), size.height()
+        u = self.unit = h / 1080
+        self.center = QPointF(w / 2, h / 2)
+        self.pixels_per_degree = h / self.PITCH_SPAN
+        self.ladder_rect = QRect(int(w * 0.3), int(h * 0.18), int(w * 0.4), int(h * 0.64))
+        self.ladder_width = self.ladder_rect.width() * 0.9
+        # Dönmüş merdivende de pencereyi kaplayan rung'lar (derece)
+        self.ladder_reach = np.hypot(self.ladder_rect.width(), self.ladder_rect.height()) / 2 / self.pixels_per_degree
+        self.roll_radius = h * 0.36
+        tape_w, tape_h = int(w * 0.07), int(h * 0.5)
+        top = (h - tape_h) // 2
+        self.tape_rects = {
+            'airspeed': QRect(int(w * 0.12), top, tape_w, tape_h),
+            'climb': QRect(int(w * 0.88) - tape_w, top, tape_w, tape_h),
+        }
+        self.solid_pen = QPen(self.COLOR, max(1.0, 2 * u))
+        self.dash_pen = QPen(self.COLOR, max(1.0, 2 * u), Qt.DashLine)
+        self.box_pen = QPen(self.COLOR, max(1.0, 2 * u))
+        self.glyph_font = self.font(26 * u)
+        self.glyphs.clear()
+        self.readouts.clear()
+        self.ladder = None
+        label_font = self.font(18 * u)
+        self.sprites = {
+            'labels': {degree: self.text_sprite(str(degree), label_font, self.COLOR) for degree in range(10, 91, 10)},
+            'roll_scale': self.render_roll_scale(),
+            'aircraft': self.render_aircraft(),
+            'pointer': self.render_pointer(),
+        }
+        for key, (_, low, high, span, step) in self.TAPES.items():
+            self.sprites[key] = self.render_tape(self.tape_rects[key], low, high, span, step, right=(key == 'climb'))
+
+    def render_tape(self, rect, low, high, span, step, right):
+        # Ölçeğin tamamı zeminiyle tek sprite; her karede değere denk gelen pencere kopyalanır
+        width, height = rect.width(), rect.height()
+        ppu = height / span
+        zero = height / 2 + high * ppu
+        pixmap = self.sprite(width, height + (high - low) * ppu)
+        painter = QPainter(pixmap)
+        painter.fillRect(pixmap.rect(), self.BACKGROUND)
+        painter.setFont(self.font(18 * self.unit))
+        painter.setPen(self.solid_pen)
+        for value in range(low, high + 1):
+            y = zero - value * ppu
+            major = value % step == 0
+            length = width * (0.3 if major else 0.15)
+            x0 = 0 if right else width - length
+            painter.drawLine(QPointF(x0, y), QPointF(x0 + length, y))
+            if major:
+                text_rect = QRect(int(width * 0.35) if right else 0, int(y - 12 * self.unit),
+                                  int(width * 0.6), int(24 * self.unit))
+                painter.drawText(text_rect, Qt.AlignVCenter | (Qt.AlignLeft if right else Qt.AlignRight), str(value))
+        painter.end()
+        return pixmap, zero, ppu
+
+    def render_roll_scale(self):
+        # Sadece yayın sınır kutusu kadar sprite; sol üst köşesinin ekran konumuyla birlikte
+        u, radius = self.unit, self.roll_radius
+        outer = radius + 24 * u
+        width = 2 * outer * sin(np.radians(60)) + 4
+        height = outer - radius * cos(np.radians(60)) + 4
+        origin = QPointF(self.center.x() - width / 2, self.center.y() - outer - 2)
+        cx, cy = self.center.x() - origin.x(), self.center.y() - origin.y()
+        pixmap = self.sprite(width, height)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(self.solid_pen)
+        painter.drawArc(QRect(int(cx - radius), int(cy - radius), int(2 * radius), int(2 * radius)), 30 * 16, 120 * 16)
+        for angle in self.ROLL_TICKS:
+            a = np.radians(angle)
+            length = (22 if angle % 30 == 0 else 12) * u
+            painter.drawLine(QPointF(cx + radius * sin(a), cy - radius * cos(a)),
+                             QPointF(cx + (radius + length) * sin(a), cy - (radius + length) * cos(a)))
+        painter.end()
+        return pixmap, origin
+
+    def render_aircraft(self):
+        u = self.unit
+        wing = 80 * u
+        pixmap = self.sprite(4 * wing + 8, wing / 3 + 8)
+        x, y = pixmap.width() / 2, 4
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(self.COLOR, max(1.0, 4 * u)))
+        painter.drawPolyline(QPolygonF([QPointF(x - 2 * wing, y), QPointF(x - wing, y),
+                                        QPointF(x - wing / 2, y + wing / 3), QPointF(x, y),
+                                        QPointF(x + wing / 2, y + wing / 3), QPointF(x + wing, y),
+                                        QPointF(x + 2 * wing, y)]))
+        painter.end()
+        return pixmap, QPointF(self.center.x() - x, self.center.y() - y)
+
+    def render_pointer(self):
+        u = self.unit
+        pixmap = self.sprite(30 * u, 20 * u)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.COLOR)
+        painter.drawPolygon(QPolygonF([QPointF(15 * u, 0), QPointF(0, 20 * u), QPointF(30 * u, 20 * u)]))
+        painter.end()
+        return pixmap
+
+    def glyph(self, char, color):
+        key = (char, color.rgba())
+        pixmap = self.glyphs.get(key)
+        if pixmap is None:
+            pixmap = self.glyphs[key] = self.text_sprite(char, self.glyph_font, color)
+        return pixmap
+
+    def render_readout(self, text, color):
+        # Değer kutusu: metin yerleşimi yok, karakter sprite'ları yan yana kopyalanır
+        # Çerçeve kalemi kutu kenarından taşar: sprite'ta her yanda kalem kadar pay var
+        glyphs = [self.glyph(char, color) for char in text]
+        pad = int(8 * self.unit)
+        margin = int(ceil(self.box_pen.widthF()))
+        width, height = sum(glyph.width() for glyph in glyphs) + 2 * pad, glyphs[0].height() + pad
+        pixmap = self.sprite(width + 2 * margin, height + 2 * margin)
+        painter = QPainter(pixmap)
+        painter.translate(margin, margin)
+        painter.fillRect(0, 0, width, height, self.BOX)
+        self.box_pen.setColor(color)
+        painter.setPen(self.box_pen)
+        painter.drawRect(0, 0, width - 1, height - 1)
+        x = pad
+        for glyph in glyphs:
+            painter.drawPixmap(x, pad // 2, glyph)
+            x += glyph.width()
+        painter.end()
+        return pixmap, margin, width, height
+
+    def draw_readout(self, painter, slot, text, x, y, color=None, align=Qt.AlignHCenter):
+        color = color or self.COLOR
+        key = (text, color.rgba())
+        cached = self.readouts.get(slot)
+        if cached is None or cached[0] != key:
+            cached = self.readouts[slot] = (key, self.render_readout(text, color))
+        pixmap, margin, width, height = cached[1]
+        if align == Qt.AlignHCenter:
+            x -= width // 2
+        elif align == Qt.AlignRight:
+            x -= width
+        painter.drawPixmap(x - margin, y - height // 2 - margin, pixmap)
+
+    def paint(self, painter, size):
+        if size != self.size:
+            self.layout(size)
+        values = self.values
+        cx, cy = self.center.x(), self.center.y()
+        roll = max(-180.0, min(180.0, values['roll']))
+        pitch = max(-90.0, min(90.0, values['pitch']))
+        self.paint_ladder(painter, cx, cy, roll, pitch)
+
+        sprite, origin = self.sprites['roll_scale']
+        painter.drawPixmap(origin, sprite)
+        sprite, origin = self.sprites['aircraft']
+        painter.drawPixmap(origin, sprite)
+        painter.save()
+        painter.translate(cx, cy)
+        painter.rotate(-roll)
+        pointer = self.sprites['pointer']
+        painter.drawPixmap(QPointF(-pointer.width() / 2, -self.roll_radius + 2), pointer)
+        painter.restore()
+
+        for key, (field, low, high, _, _) in self.TAPES.items():
+            rect = self.tape_rects[key]
+            sprite, zero, ppu = self.sprites[key]
+            value = max(low, min(high, values[field]))
+            # Bant kaydırma: sprite'ın değere denk gelen penceresi kopyalanır
+            source_y = int(zero - value * ppu - rect.height() / 2)
+            painter.drawPixmap(rect.topLeft(), sprite, QRect(0, source_y, rect.width(), rect.height()))
+            painter.setPen(self.solid_pen)
+            painter.drawRect(rect)
+            center = rect.center()
+            self.draw_readout(painter, key, f'{values[field]:.1f}', center.x(), center.y())
+
+        battery = values['battery_remaining']
+        if battery is not None:
+            color = self.COLOR if battery >= 50 else QColor(255, 165, 0) if battery >= 25 else QColor(255, 0, 0)
+            self.draw_readout(painter, 'battery', f'BAT {battery:.0f}%', self.tape_rects['climb'].right(),
+                              int(self.size.height() * 0.1), color, Qt.AlignRight)
+
+    def paint_ladder(self, painter, cx, cy, roll, pitch):
+        if self.ladder is None or self.ladder[0] != (roll, pitch):
+            self.ladder = ((roll, pitch),) + self.ladder_geometry(cx, cy, roll, pitch)
+        _, solid, dashed, labels = self.ladder
+        painter.save()
+        painter.setClipRect(self.ladder_rect)
+        painter.setPen(self.solid_pen)
+        painter.drawLines(solid)
+        painter.setPen(self.dash_pen)
+        painter.drawLines(dashed)
+        for label, x, y in labels:
+            painter.drawPixmap(x, y, label)
+        painter.restore()
+
+    def ladder_geometry(self, cx, cy, roll, pitch):
+        # Sadece pencereye düşebilecek rung'lar; uçlar elle döndürülür, yazılar dik kalır
+        ppd = self.pixels_per_degree
+        first = int(ceil((pitch - self.ladder_reach) / 5)) * 5
+        a = np.radians(-roll)
+        cos_a, sin_a = cos(a), sin(a)
+        solid, dashed, labels = [], [], []
+        for degree in range(max(-90, first), min(90, int(pitch + self.ladder_reach)) + 1, 5):
+            y = (pitch - degree) * ppd
+            half = self.ladder_width * (0.5 if degree == 0 else 0.22 if degree % 10 == 0 else 0.11)
+            # Qt rotate() ile aynı yön (y aşağı)
+            x0, y0 = cx - half * cos_a - y * sin_a, cy - half * sin_a + y * cos_a
+            x1, y1 = cx + half * cos_a - y * sin_a, cy + half * sin_a + y * cos_a
+            (dashed if degree < 0 else solid).append(QLineF(x0, y0, x1, y1))
+            if degree and degree % 10 == 0:
+                label = self.sprites['labels'][abs(degree)]
+                gap = 8 * self.unit + label.width() / 2
+                for x, y in ((x0 - gap * cos_a, y0 - gap * sin_a), (x1 + gap * cos_a, y1 + gap * sin_a)):
+                    labels.append((label, int(x - label.width() / 2), int(y - label.height() / 2)))
+        return solid, dashed, labels
+
 
 class VideoStreamWidget(QWidget):
-    def __init__(self, url):
+    def __init__(self, url, worker_factory=VideoStreamWorker, recorder=None, autostart=True):
         super().__init__()
-        self.image = QImage()
+        self.autostart = autostart
+        self.video_thread = None
+        # Sadece doğrulanmış, sahip olunan kare tutulur; paylaşılan bellek slotu tekrar okunmaz
+        self.pixmap = None
         self.url = url
+        self.worker_factory = worker_factory
+        self.recorder = recorder
+        self.mailbox = FrameMailbox()
+        # HudOverlay verilirse kare ile aynı boyamada çizilir
+        self.hud = None
         self.initUI()
 
     def initUI(self):
         self.setWindowTitle('Video Stream')
-        self.start_video_stream(self.url)
+        if self.autostart:
+            self.start_video_stream(self.url)
 
-    def start_video_stream(self, url):
-        self.video_thread = VideoStreamWorker(url)
-        self.video_thread.frame_received.connect(self.update_image)
-        self.video_thread.start()
+    def start_video_stream(self, url, worker=None):
+        # worker verilirse (hazırda bekleyen bağlantı) yenisi açılmaz, son karesi hemen gösterilir
+        self.url = url
+        if worker is None:
+            # Her worker'ın kendi mailbox'ı olur: durdurulan eski worker yeni akışa kare karıştıramaz
+            worker = self.worker_factory(url, FrameMailbox(), self.recorder)
+        self.video_thread = worker
+        self.mailbox = worker.mailbox
+        worker.target_size = (self.width(), self.height())
+        worker.frame_ready.connect(self.update)
+        if not worker.isRunning():
+            worker.start()
+        self.update()
+
+    def detach_video_stream(self):
+        worker = self.video_thread
+        if worker is not None:
+            worker.frame_ready.disconnect(self.update)
+            self.video_thread = None
+        return worker
 
-    def update_image(self, frame):
+    def stop_video_stream(self, wait=True):
+        worker = self.detach_video_stream()
+        if worker is not None:
+            worker.stop(wait)
+        return worker
+
+    def frame_pixmap(self, frame):
         height, width, channel = frame.shape
-        bytes_per_line = 3 * width
-        q_img = QImage(frame.data, width, height, bytes_per_line, QImage.Format_RGB888).rgbSwapped()
-        self.image = q_img
-        self.update()
+        image_format = BGR888_FORMAT if BGR888_FORMAT is not None else QImage.Format_RGB888
+        # QImage numpy belleğini (paylaşılan bellek dahil) kopyalamadan sarar; fromImage kopyalar
+        image = QImage(frame.data, width, height, frame.strides[0], image_format)
+        if image.size() == self.size():
+            return QPixmap.fromImage(image)
+        return QPixmap.fromImage(image.scaled(self.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+
+    def resizeEvent(self, event):
+        if self.video_thread is not None:
+            self.video_thread.target_size = (self.width(), self.height())
+        super().resizeEvent(event)
 
     def paintEvent(self, event):
+        # Kareyi boyama anında al ki her zaman en yenisi gösterilsin
+        frame, timestamps = self.mailbox.take()
+        if frame is not None:
+            pixmap = self.frame_pixmap(frame)
+            if self.mailbox.valid():
+                self.pixmap = pixmap
+            else:
+                # Yazan süreç kopyalama sırasında slotu ezdi: yırtık kare atılır, önceki kalır
+                timestamps = None
+        if self.pixmap is None:
+            if self.hud is not None:
+                # Görüntü yokken de HUD siyah zemin üzerinde çalışır
+                painter = QPainter(self)
+                painter.fillRect(self.rect(), Qt.black)
+                self.hud.paint(painter, self.size())
+                painter.end()
+            return
+        if self.pixmap.size() != self.size():
+            # Yeniden boyutlanma: yeni boyutta kare gelene kadar eldeki kare ölçeklenir
+            self.pixmap = self.pixmap.scaled(self.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
         painter = QPainter(self)
-        if not self.image.isNull():
-            painter.drawImage(self.rect(), self.image)
+        painter.drawPixmap(0, 0, self.pixmap)
+        if self.hud is not None:
+            self.hud.paint(painter, self.size())
+        painter.end()
+        if timestamps is not None:
+            painted_at = time.perf_counter()
+            pipeline_stats.tick('video.paint', painted_at)
+            pipeline_stats.record('video.display', painted_at - timestamps[0])
+            pipeline_stats.record('video.queue', painted_at - timestamps[1])
+
+class CameraGridWidget(QWidget):
+    def __init__(self, urls, decode_pool, max_fps=15, worker_factory=VideoStreamWorker):
+        super().__init__()
+        self.urls = urls
+        self.decode_pool = decode_pool
+        self.max_fps = max_fps
+        self.worker_factory = worker_factory
+        self.tiles = []
+        self.initUI()
+
+    def initUI(self):
+        layout = QGridLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(2)
+        columns = int(np.ceil(np.sqrt(len(self.urls))))
+        # Her kamera kendi okuma thread'ine ve mailbox'ına sahip, çözme ortak havuzda
+        worker_factory = partial(self.worker_factory, decode_pool=self.decode_pool, max_fps=self.max_fps)
+        for i, url in enumerate(self.urls):
+            tile = VideoStreamWidget(url, worker_factory=worker_factory)
+            layout.addWidget(tile, i // columns, i % columns)
+            self.tiles.append(tile)
+        self.setLayout(layout)
+
+    def stop(self):
+        for tile in self.tiles:
+            tile.stop_video_stream()
+
+    def detach_workers(self):
+        # Durdurmayı çağırana bırakır: bağlanmaya çalışan kamera arayüzü bekletmesin
+        workers = [tile.detach_video_stream() for tile in self.tiles]
+        return [worker for worker in workers if worker is not None]
+
 
 class LidarDataWorker(QThread):
-    lidar_data_received = pyqtSignal(list)
+    lidar_data_received = pyqtSignal(object, float)
+
+    CHUNK_SIZE = 64 * 1024
+    TIMEOUT = (3, 5)
+    MIN_INTERVAL = 0.05
+    MAX_INTERVAL = 1.0
+    STREAM_RETRY = 30.0
+    MAX_POINTS = 1 << 20
 
-    def __init__(self, ip):
+    def __init__(self, ip, mode='auto', recorder=None):
         super().__init__()
         self.ip = ip
+        self.recorder = recorder
+        # 'auto': önce /lidar/stream dene, yoksa /lidar üzerinden sorgula
+        self.mode = mode
+        self.poll_interval = 0.5
+        self.session = None
+        self._etag = None
+        self._last_body = None
+        self._stream_retry_at = 0.0
+        self._response = None
         self._run_flag = True
 
     def run(self):
-        while self._run_flag:
+        import requests
+        self.session = requests.Session()
+        try:
+            while self._run_flag:
+                if self.mode != 'poll' and time.monotonic() >= self._stream_retry_at:
+                    self.read_stream()
+                    if self.mode == 'stream':
+                        if self._run_flag:
+                            self.msleep(1000)
+                        continue
+                    self._stream_retry_at = time.monotonic() + self.STREAM_RETRY
+                if not self._run_flag:
+                    break
+                self.poll()
+                self.msleep(int(self.poll_interval * 1000))
+        finally:
+            self.session.close()
+
+    def poll(self):
+        import requests
+        headers = {'If-None-Match': self._etag} if self._etag else {}
+        try:
+            response = self.session.get(f'http://{self.ip}/lidar', headers=headers, timeout=self.TIMEOUT)
+            if response.status_code == 304 or (response.status_code == 200 and response.content == self._last_body):
+                self.adapt_interval(changed=False)
+            elif response.status_code == 200:
+                self._etag = response.headers.get('ETag')
+                self._last_body = response.content
+                self.publish(response.json())
+                self.adapt_interval(changed=True)
+            else:
+                print(f"Failed to get Lidar data: {response.status_code}")
+        except requests.exceptions.Timeout:
+            print(f"Connection to {self.ip} timed out.")
+        except Exception as e:
+            print(f'Error fetching Lidar data: {e}')
+
+    def adapt_interval(self, changed):
+        # Sensörden hızlı sorgularsak aynı tarama gelir, aralığı sensör hızına yaklaştır
+        interval = self.poll_interval * (0.8 if changed else 1.25)
+        self.poll_interval = min(self.MAX_INTERVAL, max(self.MIN_INTERVAL, interval))
+
+    def read_stream(self):
+        import requests
+        try:
+            response = self.session.get(f'http://{self.ip}/lidar/stream', stream=True, timeout=self.TIMEOUT)
+        except requests.exceptions.RequestException:
+            return
+        with response:
+            self._response = response
+            if response.status_code != 200:
+                return
+            if 'octet-stream' in response.headers.get('Content-Type', ''):
+                parse = self.parse_binary
+            else:
+                parse = self.parse_ndjson
+            buffer = bytearray()
             try:
-                response = requests.get(f'http://{self.ip}/lidar', timeout=5)  # Zaman aşımı 5 saniye olarak ayarlanmış
-                if response.status_code == 200:
-                    data = response.json()
-                    print(f"Lidar Data: {data}")  # Debug print
-                    self.lidar_data_received.emit(data)
-                else:
-                    print(f"Failed to get Lidar data: {response.status_code}")
-            except requests.exceptions.Timeout:
-                print(f"Connection to {self.ip} timed out.")
+                for chunk in iter_raw_chunks(response, self.CHUNK_SIZE):
+                    if not self._run_flag:
+                        break
+                    buffer += chunk
+                    scan = parse(buffer)
+                    if scan is not None:
+                        self.publish(scan)
             except Exception as e:
-                print(f'Error fetching Lidar data: {e}')
-            self.msleep(500)
+                if self._run_flag:
+                    print(f'Lidar stream error: {e}')
+            finally:
+                self._response = None
+
+    def publish(self, scan):
+        fetched_at = time.perf_counter()
+        pipeline_stats.tick('lidar.fetch', fetched_at)
+        if self.recorder is not None:
+            self.recorder.write('lidar', np.asarray(scan, dtype='<f4').tobytes())
+        self.lidar_data_received.emit(scan, fetched_at)
+
+    def parse_ndjson(self, buffer):
+        # Sadece en son tamamlanan satır çözülür, araya kaçanlar atlanır
+        end = buffer.rfind(b'\n')
+        if end < 0:
+            return None
+        start = buffer.rfind(b'\n', 0, end) + 1
+        line = bytes(buffer[start:end])
+        del buffer[:end + 1]
+        if not line.strip():
+            return None
+        return json.loads(line)
+
+    def parse_binary(self, buffer):
+        # Çerçeve: uint32 (little endian) nokta sayısı + float32 mesafeler
+        offset = 0
+        latest = None
+        while len(buffer) - offset >= 4:
+            count = int.from_bytes(buffer[offset:offset + 4], 'little')
+            if count > self.MAX_POINTS:
+                buffer.clear()
+                return None
+            end = offset + 4 + count * 4
+            if len(buffer) < end:
+                break
+            latest = (offset + 4, count)
+            offset = end
+        scan = None
+        if latest is not None:
+            scan = np.frombuffer(buffer, dtype='<f4', count=latest[1], offset=latest[0]).astype(np.float64)
+        del buffer[:offset]
+        return scan
 
     def stop(self):
         self._run_flag = False
+        response = self._response
+        if response is not None:
+            abort_response(response)
         self.wait()
 
 
-class LidarWidget(QWidget):
-    def __init__(self):
+class ReplayLidarWorker(LidarDataWorker):
+    def __init__(self, session):
+        super().__init__(ip=None, mode='replay')
+        self.session = session
+
+    def run(self):
+        for timestamp, payload in replay_entries(self.session, 'lidar', lambda: self._run_flag):
+            self.publish(np.frombuffer(payload, dtype='<f4').astype(np.float64))
+
+
+class AsyncLidarSource(IoTask, LidarDataWorker):
+    def __init__(self, ip, mode='auto', recorder=None, io_core=None):
+        super().__init__(ip, mode, recorder)
+        self.io_core = io_core
+        self.source_name = 'lidar'
+
+    async def session(self, health):
+        import asyncio
+        if self.mode != 'poll' and time.monotonic() >= self._stream_retry_at:
+            if await self.read_stream_async(health):
+                # Akış bitti: çekirdek yeniden bağlar
+                return
+            self._stream_retry_at = time.monotonic() + self.STREAM_RETRY
+        # Hatalar sorgu döngüsünü bitirir, yeniden deneme aralığını çekirdek belirler
+        while True:
+            await self.poll_async(health)
+            await asyncio.sleep(self.poll_interval)
+
+    async def poll_async(self, health):
+        from io_core import http_get, HttpError
+        headers = {'If-None-Match': self._etag} if self._etag else {}
+        response = await http_get(f'http://{self.ip}/lidar', headers, self.TIMEOUT)
+        try:
+            if response.status == 304:
+                health.data()
+                self.adapt_interval(changed=False)
+                return
+            response.raise_for_status()
+            if response.status != 200:
+                raise HttpError(f'HTTP {response.status}')
+            body = await response.read()
+        finally:
+            response.close()
+        health.data()
+        if body == self._last_body:
+            self.adapt_interval(changed=False)
+            return
+        self._etag = response.headers.get('etag')
+        self._last_body = body
+        self.publish(json.loads(body))
+        self.adapt_interval(changed=True)
+
+    async def read_stream_async(self, health):
+        # Akış uç noktası yoksa False döner (auto modda sorguya geçilir)
+        from io_core import http_get, HttpError
+        response = await http_get(f'http://{self.ip}/lidar/stream', timeout=self.TIMEOUT)
+        try:
+            if response.status != 200:
+                if self.mode == 'stream':
+                    raise HttpError(f'HTTP {response.status}')
+                return False
+            if 'octet-stream' in response.headers.get('content-type', ''):
+                parse = self.parse_binary
+            else:
+                parse = self.parse_ndjson
+            buffer = bytearray()
+            async for chunk in response.chunks(self.CHUNK_SIZE):
+                health.data()
+                buffer += chunk
+                scan = parse(buffer)
+                if scan is not None:
+                    self.publish(scan)
+            return True
+        finally:
+            response.close()
+
+
+def points_polygon(x, y):
+    # QPolygonF belleğine numpy üzerinden doğrudan yaz, nokta nokta QPointF oluşturma
+    if len(x) == 0:
+        return QPolygonF()
+    polygon = QPolygonF(len(x))
+    ptr = polygon.data()
+    ptr.setsize(len(x) * 2 * 8)
+    buffer = np.frombuffer(memoryview(ptr), dtype=np.float64).reshape(-1, 2)
+    buffer[:, 0] = x
+    buffer[:, 1] = y
+    return polygon
+
+
+class LidarWidget(InstrumentWidget):
+    MAX_RANGE = 10
+    STATS_KEY = 'lidar.render'
+    # Tarama açıları: ilk ölçüm ANGLE_MIN, son ölçüm ANGLE_MAX (radyan, 0 sağ, pi/2 ileri)
+    ANGLE_MIN = -pi
+    ANGLE_MAX = pi
+    GRID_SIZE = 256
+
+    def __init__(self, world_frame=False):
         super().__init__()
+        self.ranges = np.empty(0)
+        self.points = QPolygonF()
+        self._cos = np.empty(0)
+        self._sin = np.empty(0)
+        # world_frame: taramalar aracın yaw açısıyla döndürülür, ızgara kuzey yukarı birikir
+        self.world_frame = world_frame
+        self.yaw = 0.0
+        self.occupancy = OccupancyGrid(self.GRID_SIZE, self.MAX_RANGE)
+        self.grid_colors = [qRgba(124, 252, 0, alpha) for alpha in range(256)]
+        self.grid_font = instrument_font(7)
+        self.point_pen = QPen(QColor(30, 144, 255), 3)
         self.initUI()
 
     def initUI(self):
-        self.figure = Figure()
-        self.canvas = FigureCanvas(self.figure)
-        self.ax = self.figure.add_subplot(111, polar=True)
-        self.ax.set_ylim(0, 10)
-        self.ax.set_xlim(-np.pi, np.pi)
+        self.setWindowTitle('Lidar')
+
+    def plot_radius(self):
+        return max(1, min(self.width(), self.height()) // 2 - 20)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_points()
+
+    def update_lidar_data(self, data, fetched_at=None):
+        if fetched_at is not None:
+            self.mark_data(fetched_at)
+        self.ranges = np.asarray(data, dtype=np.float64)
+        self.update_angles()
+        self.occupancy.add_scan(self.ranges, self._cos, self._sin, self.yaw if self.world_frame else 0.0)
+        self.update_points()
+        self.request_repaint()
+
+    def set_yaw(self, yaw):
+        # Derece, saat yönünde (ATTITUDE.yaw)
+        self.yaw = np.radians(yaw)
+
+    def update_angles(self):
+        if len(self._cos) != len(self.ranges):
+            angles = np.linspace(self.ANGLE_MIN, self.ANGLE_MAX, len(self.ranges))
+            self._cos = np.cos(angles)
+            self._sin = np.sin(angles)
+
+    def update_points(self):
+        ranges = self.ranges
+        self.update_angles()
+        cos_a, sin_a = self._cos, self._sin
+        if self.world_frame and self.yaw:
+            cos_y, sin_y = np.cos(self.yaw), np.sin(self.yaw)
+            cos_a, sin_a = cos_a * cos_y + sin_a * sin_y, sin_a * cos_y - cos_a * sin_y
+        visible = (ranges >= 0) & (ranges <= self.MAX_RANGE)
+        r = ranges[visible] * (self.plot_radius() / self.MAX_RANGE)
+        self.points = points_polygon(self.width() / 2 + r * cos_a[visible],
+                                     self.height() / 2 - r * sin_a[visible])
+
+    def grid_image(self):
+        # Izgara dizisinin üzerine kopyasız QImage; renk tablosu yoğunluğu saydamlığa çevirir
+        pixels = self.occupancy.render()
+        image = QImage(pixels.data, pixels.shape[1], pixels.shape[0], pixels.strides[0], QImage.Format_Indexed8)
+        image.setColorTable(self.grid_colors)
+        return image
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.static_layer())
+        radius = self.plot_radius()
+        target = QRect(self.width() // 2 - radius, self.height() // 2 - radius, 2 * radius, 2 * radius)
+        painter.drawImage(target, self.grid_image())
+        painter.setPen(self.point_pen)
+        painter.drawPoints(self.points)
+
+    def drawStatic(self, painter):
+        painter.fillRect(self.rect(), QColor(0, 7, 14, 255))
+        center_x = self.width() / 2
+        center_y = self.height() / 2
+        radius = self.plot_radius()
+
+        painter.setPen(QPen(QColor(127, 127, 127, 255), 1))
+        painter.setBrush(Qt.NoBrush)
+        painter.setFont(self.grid_font)
+        for ring in range(2, self.MAX_RANGE + 1, 2):
+            r = radius * ring / self.MAX_RANGE
+            painter.drawEllipse(QPointF(center_x, center_y), r, r)
+            painter.drawText(int(center_x + 2), int(center_y - r - 2), str(ring))
+
+        for angle in range(0, 360, 45):
+            a = np.radians(angle)
+            x = center_x + radius * np.cos(a)
+            y = center_y - radius * np.sin(a)
+            painter.drawLine(QPointF(center_x, center_y), QPointF(x, y))
+            label_x = center_x + (radius + 10) * np.cos(a)
+            label_y = center_y - (radius + 10) * np.sin(a)
+            painter.drawText(int(label_x) - 10, int(label_y) + 4, f"{angle}°")
+
+
+class StripChartWidget(QWidget, ScheduledRepaint):
+    # Tekerlek: zaman aralığını büyüt/küçült, sürükle: geçmişte gez, çift tık: canlıya dön
+    MIN_SPAN = 5.0
+    TITLE_HEIGHT = 16
+
+    def __init__(self, ring, field, title, unit='', span=60.0, decimation='minmax', color='#7CFC00'):
+        super().__init__()
+        self.ring = ring
+        self.field = field
+        self.title = title
+        self.unit = unit
+        self.span = span
+        self.decimation = decimation
+        self.end = None
+        self._drag_x = None
+        self._drag_end = None
+        self.line_pen = QPen(QColor(color), 1.5)
+        self.text_pen = QPen(QColor(160, 176, 192))
+        self.frame_pen = QPen(QColor(90, 106, 122))
+        self.font = instrument_font(9)
+        self.setMinimumHeight(80)
+
+    def window_end(self):
+        # end None ise grafik canlı, sağ kenar şimdiki zaman
+        return self.end if self.end is not None else time.monotonic()
+
+    def paintEvent(self, event):
+        t1 = self.window_end()
+        t0 = t1 - self.span
+        width, height = self.width(), self.height()
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(0, 7, 20))
+        painter.setPen(self.frame_pen)
+        painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
+        painter.setFont(self.font)
+
+        t, v = self.ring.window(self.field, t0, t1)
+        if len(t) > 1:
+            t, v = decimate(t, v, t0, t1, width, self.decimation)
+            low, high = float(v.min()), float(v.max())
+            if high - low < 1e-6:
+                low, high = low - 1, high + 1
+            margin = (high - low) * 0.1
+            low, high = low - margin, high + margin
+            plot_height = height - self.TITLE_HEIGHT - 4
+            x = (t - t0) * (width / self.span)
+            y = self.TITLE_HEIGHT + (high - v) * (plot_height / (high - low))
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(self.line_pen)
+            painter.drawPolyline(points_polygon(x, y))
+            painter.setRenderHint(QPainter.Antialiasing, False)
+            painter.setPen(self.text_pen)
+            painter.drawText(4, self.TITLE_HEIGHT + 12, f'{high:.1f}')
+            painter.drawText(4, height - 6, f'{low:.1f}')
+
+        painter.setPen(self.text_pen)
+        latest = self.ring.latest(self.field)
+        value = f'{latest:.1f} {self.unit}' if latest is not None else '-'
+        painter.drawText(4, 12, f'{self.title}  {value}')
+        state = 'LIVE' if self.end is None else 'PAUSED'
+        painter.drawText(QRect(0, 0, width - 4, self.TITLE_HEIGHT), Qt.AlignRight | Qt.AlignVCenter,
+                         f'{self.span:.0f} s  {state}')
+        painter.end()
+
+    def max_span(self):
+        return max(self.MIN_SPAN, self.ring.span())
+
+    def wheelEvent(self, event):
+        factor = 0.8 if event.angleDelta().y() > 0 else 1.25
+        self.span = min(self.max_span(), max(self.MIN_SPAN, self.span * factor))
+        self.update()
+
+    def mousePressEvent(self, event):
+        self._drag_x = event.x()
+        self._drag_end = self.window_end()
+
+    def mouseMoveEvent(self, event):
+        if self._drag_x is None:
+            return
+        end = self._drag_end - (event.x() - self._drag_x) * self.span / max(1, self.width())
+        self.end = min(time.monotonic(), end)
+        self.update()
+
+    def mouseReleaseEvent(self, event):
+        self._drag_x = None
 
+    def mouseDoubleClickEvent(self, event):
+        self.end = None
+        self.update()
+
+
+class TelemetryChartsWidget(QWidget):
+    CHANNELS = (
+        ('VFR_HUD', 'altitude', 'ALTITUDE', 'm'),
+        ('VFR_HUD', 'airspeed', 'AIR SPEED', 'm/s'),
+        ('VFR_HUD', 'climb', 'VERTICAL SPEED', 'm/s'),
+        ('ATTITUDE', 'roll', 'ROLL', '°'),
+        ('ATTITUDE', 'pitch', 'PITCH', '°'),
+        ('SYS_STATUS', 'battery_remaining', 'BATTERY', '%'),
+    )
+
+    def __init__(self, history, decimation='minmax'):
+        super().__init__()
+        self.history = history
+        self.decimation = decimation
+        self.charts = []
+        self.initUI()
+
+    def initUI(self):
+        self.setWindowTitle('Telemetri Geçmişi')
+        self.setStyleSheet("background-color: #000714;")
+        self.resize(900, 720)
         layout = QVBoxLayout()
-        layout.addWidget(self.canvas)
+        layout.setContentsMargins(4, 4, 4, 4)
+        layout.setSpacing(4)
+        for message, field, title, unit in self.CHANNELS:
+            chart = StripChartWidget(self.history.ring(message), field, title, unit, decimation=self.decimation)
+            layout.addWidget(chart)
+            self.charts.append(chart)
         self.setLayout(layout)
 
-    def update_lidar_data(self, data):
-        angles = np.linspace(-np.pi, np.pi, len(data))
-        self.ax.clear()
-        self.ax.plot(angles, data, 'b.')
-        self.ax.set_ylim(0, 10)
-        self.ax.set_xlim(-np.pi, np.pi)
-        self.canvas.draw()            
+    def request_repaint(self):
+        for chart in self.charts:
+            chart.request_repaint()
+
+
+def collect_subscriptions(*sources):
+    # Aynı mesajı isteyenler arasında en yüksek hız geçerli
+    rates = {}
+    for source in sources:
+        for name, rate in getattr(source, 'MAVLINK_MESSAGES', {}).items():
+            rates[name] = max(rate, rates.get(name, 0))
+    return rates
+
+
+class LinkBudget:
+    # Seri telemetri hattı 8N1: bayt başına 10 bit. UDP/TCP'de kapasite bilinmez (None).
+    def __init__(self, baud=None, window=2.0):
+        self.capacity = baud / 10.0 if baud else None
+        self.window = window
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._bytes = 0
+        self._window_start = time.monotonic()
+        self.rates = {}
+        self.bytes_per_s = 0.0
+
+    def add(self, msg_type, size):
+        with self._lock:
+            self._counts[msg_type] = self._counts.get(msg_type, 0) + 1
+            self._bytes += size
+            self._roll(time.monotonic())
+
+    def _roll(self, now):
+        elapsed = now - self._window_start
+        if elapsed < self.window:
+            return
+        self.rates = {name: count / elapsed for name, count in self._counts.items()}
+        self.bytes_per_s = self._bytes / elapsed
+        self._counts = {}
+        self._bytes = 0
+        self._window_start = now
+
+    def summary(self):
+        with self._lock:
+            self._roll(time.monotonic())
+            result = {'link.bytes_per_s': round(self.bytes_per_s, 1)}
+            if self.capacity:
+                result['link.capacity'] = self.capacity
+                result['link.utilization'] = round(self.bytes_per_s / self.capacity, 3)
+            for name, rate in self.rates.items():
+                result[f'link.{name}.rate'] = round(rate, 2)
+            return result
+
+
+class TelemetryReader(QThread):
+    telemetry_updated = pyqtSignal(dict)
+    error_occurred = pyqtSignal(str)
+    vehicles_changed = pyqtSignal(list)
+
+    # Mesaj gelmezse değerleri sıfırla (eski update_data davranışı)
+    STALE_TIMEOUT = 1.0
+    STALE_DEFAULTS = {
+        'VFR_HUD': {'airspeed': 0, 'climb': 0},
+        'ATTITUDE': {'roll': 0, 'pitch': 0, 'yaw': 0},
+    }
+
+    # SET_MESSAGE_INTERVAL cevabı bu sürede gelmezse mesaj eski veri akışlarıyla istenir
+    ACK_TIMEOUT = 1.0
+    LEGACY_STREAMS = {
+        'SYS_STATUS': 'MAV_DATA_STREAM_EXTENDED_STATUS',
+        'GPS_RAW_INT': 'MAV_DATA_STREAM_EXTENDED_STATUS',
+        'RAW_IMU': 'MAV_DATA_STREAM_RAW_SENSORS',
+        'RC_CHANNELS': 'MAV_DATA_STREAM_RC_CHANNELS',
+        'GLOBAL_POSITION_INT': 'MAV_DATA_STREAM_POSITION',
+        'ATTITUDE': 'MAV_DATA_STREAM_EXTRA1',
+        'VFR_HUD': 'MAV_DATA_STREAM_EXTRA2',
+    }
+
+    # Araç başına tutulan değerler; NaN olanlar (None) henüz gelmemiş demek
+    SNAPSHOT_FIELDS = ('airspeed', 'climb', 'altitude', 'flight_time', 'roll', 'pitch', 'yaw', 'battery_remaining')
+    SNAPSHOT_DEFAULTS = {'airspeed': 0, 'climb': 0, 'roll': 0, 'pitch': 0, 'yaw': 0}
+
+    def __init__(self, connection, publish_rate=20, recorder=None, subscriptions=None, link_budget=None,
+                 history=None, router=None):
+        super().__init__()
+        # Tek bağlantı ya da bağlantı listesi; her bağlantıda birden fazla araç olabilir
+        if isinstance(connection, (list, tuple)):
+            self.connections = list(connection)
+        else:
+            self.connections = [connection] if connection is not None else []
+        self.recorder = recorder
+        self.history = history
+        self.link_budget = link_budget
+        # MavlinkRouter: ham çerçeveler yerel istemcilere, istemcilerden gelenler araca
+        self.router = router
+        # mesaj adı -> Hz; boşsa araçtan bir şey istenmez (kayıttan oynatma)
+        self.subscriptions = dict(subscriptions or {})
+        from pymavlink import mavutil
+        self.mavlink = mavutil.mavlink
+        self.messages_received = 0
+        self.publish_interval = 1.0 / publish_rate
+        self._last_publish = 0.0
+        self._run_flag = True
+        self.handlers = {
+            'VFR_HUD': self.handle_vfr_hud,
+            'ATTITUDE': self.handle_attitude,
+            'SYS_STATUS': self.handle_sys_status,
+        }
+        self.vehicles = VehicleTable(self.SNAPSHOT_FIELDS, self.handlers, self.SNAPSHOT_DEFAULTS)
+        # GCS yayınlayan sistemler (başka yer istasyonları) araç listesine girmez
+        self.ignored_systems = set()
+        # Göstergelere bağlı araç; None iken ilk görülen araç seçilir
+        self.selected = None
+        self._dirty = False
+
+    @property
+    def snapshot(self):
+        vehicle = self.selected_vehicle()
+        if vehicle is None:
+            return self.vehicles.snapshot(None)
+        return self.vehicles.snapshot(vehicle.row)
+
+    @property
+    def subscription_mode(self):
+        vehicle = self.selected_vehicle()
+        return vehicle.subscription_mode if vehicle is not None else {}
+
+    def selected_vehicle(self):
+        return self.vehicles.get(self.selected) if self.selected is not None else None
+
+    def select_vehicle(self, system_id):
+        # Arayüz thread'inden çağrılır; atama atomik, sonraki service() yeni aracı yayınlar
+        self.selected = system_id
+        self._dirty = True
+
+    def run(self):
+        while self._run_flag:
+            try:
+                if len(self.connections) == 1:
+                    # Bir mesaj bekle, sonra kuyrukta kalanların hepsini boşalt
+                    connection = self.connections[0]
+                    msg = connection.recv_match(blocking=True, timeout=0.05)
+                    while msg is not None:
+                        self.dispatch(msg, connection)
+                        msg = connection.recv_msg()
+                elif not self.drain_connections():
+                    # Birden fazla bağlantı tek thread'de sırayla, bloklamadan okunur
+                    self.msleep(5)
+            except Exception as e:
+                self.error_occurred.emit(str(e))
+                self.msleep(200)
+            self.service(time.monotonic())
+
+    def drain_connections(self):
+        received = False
+        for connection in self.connections:
+            msg = connection.recv_msg()
+            while msg is not None:
+                received = True
+                self.dispatch(msg, connection)
+                msg = connection.recv_msg()
+        return received
+
+    def service(self, now):
+        # Mesaj gelse de gelmese de sık çağrılır: ACK zaman aşımı, eskiyen değerler, yayın
+        if self.router is not None:
+            self.router.kick()
+            for data in self.router.take_uplink():
+                for link in self.links():
+                    link.write(data)
+        if self.subscriptions:
+            for vehicle in list(self.vehicles.vehicles.values()):
+                if vehicle.awaiting is not None and now > vehicle.awaiting[1]:
+                    self.interval_result(vehicle, False)
+        self.expire_stale(now)
+        if self._dirty and now - self._last_publish >= self.publish_interval:
+            self._dirty = False
+            self._last_publish = now
+            vehicle = self.selected_vehicle()
+            if vehicle is None:
+                return
+            telemetry = self.vehicles.snapshot(vehicle.row)
+            telemetry['received_at'] = self.vehicles.received(vehicle.row)
+            telemetry['system_id'] = vehicle.system_id
+            self.telemetry_updated.emit(telemetry)
+
+    def dispatch(self, msg, link=None):
+        self.messages_received += 1
+        received_at = time.perf_counter()
+        pipeline_stats.tick('telemetry.message', received_at)
+        msg_type = msg.get_type()
+        if self.link_budget is not None:
+            self.link_budget.add(msg_type, len(msg.data) if msg_type == 'BAD_DATA' else len(msg.get_msgbuf()))
+        if msg_type == 'BAD_DATA':
+            return
+        if self.router is not None:
+            # Alınan çerçevenin kendi baytları: çözülüp yeniden kodlanmaz
+            self.router.forward(msg.get_msgbuf())
+        if self.recorder is not None:
+            self.recorder.write('mavlink', msg.get_msgbuf())
+        vehicle = self.route(msg, msg_type, link)
+        if vehicle is None:
+            return
+        if self.subscriptions:
+            self.negotiate(vehicle, msg, msg_type)
+        handler = self.handlers.get(msg_type)
+        if handler is None:
+            return
+        values = self.vehicles.values[vehicle.row]
+        handler(msg, vehicle, values)
+        now = time.monotonic()
+        self.vehicles.seen(vehicle.row, msg_type, now, received_at)
+        if vehicle.system_id == self.selected:
+            if self.history is not None:
+                # Yayın hızından bağımsız, bağlı aracın gelen her örneği geçmişe yazılır
+                self.history.append(msg_type, now, self.vehicles.snapshot(vehicle.row))
+            self._dirty = True
+
+    def route(self, msg, msg_type, link):
+        system_id = msg.get_srcSystem()
+        if system_id in self.ignored_systems:
+            return None
+        vehicle = self.vehicles.get(system_id)
+        if msg_type == 'HEARTBEAT' and msg.type == self.mavlink.MAV_TYPE_GCS:
+            self.ignored_systems.add(system_id)
+            if vehicle is not None:
+                # Heartbeat'ten önce mesajı gelmişti, listeden çıkar
+                ids = self.vehicle_ids()
+                if self.selected == system_id:
+                    self.select_vehicle(ids[0] if ids else None)
+                self.vehicles_changed.emit(ids)
+            return None
+        if vehicle is None:
+            vehicle = self.vehicles.add(system_id, link)
+            if self.selected is None:
+                self.selected = system_id
+            self.vehicles_changed.emit(self.vehicle_ids())
+        # Aynı araç birden fazla bağlantıdan duyulabilir (yedek telsiz): istekler son duyulandan gider
+        vehicle.link = link
+        vehicle.messages += 1
+        if msg_type == 'HEARTBEAT' and vehicle.first_heartbeat is None:
+            vehicle.first_heartbeat = time.monotonic()
+        return vehicle
+
+    def links(self):
+        return self.connections
+
+    def vehicle_ids(self):
+        return sorted(system_id for system_id in self.vehicles.vehicles if system_id not in self.ignored_systems)
+
+    def negotiate(self, vehicle, msg, msg_type):
+        if msg_type == 'HEARTBEAT':
+            if vehicle.component_id is None:
+                self.subscribe(vehicle, msg.get_srcComponent())
+        elif msg_type == 'COMMAND_ACK':
+            if vehicle.awaiting is not None and msg.command == self.mavlink.MAV_CMD_SET_MESSAGE_INTERVAL:
+                self.interval_result(vehicle, msg.result == self.mavlink.MAV_RESULT_ACCEPTED)
+
+    def subscribe(self, vehicle, component_id):
+        vehicle.component_id = component_id
+        vehicle.subscription_mode = dict.fromkeys(self.subscriptions, 'pending')
+        # Kullanılmayan mesajlar hattı doldurmasın: önce tüm eski akışları durdur
+        vehicle.link.mav.request_data_stream_send(vehicle.system_id, component_id,
+                                                  self.mavlink.MAV_DATA_STREAM_ALL, 0, 0)
+        vehicle.interval_queue = list(self.subscriptions)
+        self.request_next_interval(vehicle)
+
+    def request_next_interval(self, vehicle):
+        # ACK'ta hangi mesaj olduğu yazmaz, istekler araç başına sırayla tek tek gönderilir
+        if not vehicle.interval_queue:
+            vehicle.awaiting = None
+            self.request_legacy_streams(vehicle)
+            return
+        name = vehicle.interval_queue.pop(0)
+        msg_id = getattr(self.mavlink, f'MAVLINK_MSG_ID_{name}')
+        vehicle.link.mav.command_long_send(vehicle.system_id, vehicle.component_id,
+                                           self.mavlink.MAV_CMD_SET_MESSAGE_INTERVAL, 0,
+                                           msg_id, 1e6 / self.subscriptions[name], 0, 0, 0, 0, 0)
+        vehicle.awaiting = (name, time.monotonic() + self.ACK_TIMEOUT)
+
+    def interval_result(self, vehicle, accepted):
+        vehicle.subscription_mode[vehicle.awaiting[0]] = 'interval' if accepted else 'legacy'
+        self.request_next_interval(vehicle)
+
+    def request_legacy_streams(self, vehicle):
+        streams = {}
+        for name, mode in vehicle.subscription_mode.items():
+            if mode == 'legacy':
+                stream = self.LEGACY_STREAMS.get(name, 'MAV_DATA_STREAM_ALL')
+                streams[stream] = max(streams.get(stream, 0), self.subscriptions[name])
+        for stream, rate in streams.items():
+            vehicle.link.mav.request_data_stream_send(vehicle.system_id, vehicle.component_id,
+                                                      getattr(self.mavlink, stream), ceil(rate), 1)
+
+    def expire_stale(self, now):
+        expired = self.vehicles.expire(now, self.STALE_TIMEOUT, self.STALE_DEFAULTS)
+        vehicle = self.selected_vehicle()
+        if vehicle is not None and vehicle.row in expired:
+            self._dirty = True
+
+    def handle_vfr_hud(self, msg, vehicle, values):
+        columns = self.vehicles.columns
+        values[columns['airspeed']] = msg.airspeed
+        values[columns['climb']] = msg.climb
+        values[columns['altitude']] = msg.alt
+        if vehicle.first_heartbeat is not None:
+            flight_time = (time.monotonic() - vehicle.first_heartbeat) / 3600
+            values[columns['flight_time']] = round(flight_time, 2)
+
+    def handle_attitude(self, msg, vehicle, values):
+        columns = self.vehicles.columns
+        values[columns['roll']] = msg.roll * (180 / pi)
+        values[columns['yaw']] = msg.yaw * (180 / pi)
+        values[columns['pitch']] = msg.pitch * (180 / pi)
+
+    def handle_sys_status(self, msg, vehicle, values):
+        values[self.vehicles.columns['battery_remaining']] = max(0, msg.battery_remaining)
+
+    def stop(self):
+        self._run_flag = False
+        self.wait()
+
+
+class AsyncMavlinkLink:
+    # mavutil bağlantısının TelemetryReader'ın kullandığı kısmı: .mav ile gönderilenler akışa yazılır
+    def __init__(self, stream, address):
+        from pymavlink import mavutil
+        self.stream = stream
+        self.address = address
+        self.mav = mavutil.mavlink.MAVLink(self, srcSystem=255)
+        self.mav.robust_parsing = True
+
+    def write(self, buf):
+        self.stream.write(buf)
+
+    def parse(self, data):
+        return self.mav.parse_buffer(data) or ()
+
+
+class AsyncTelemetrySource(IoTask, TelemetryReader):
+    # Sadece ağ bağlantıları (udpin/udpout/tcp); seri port TelemetryReader thread'inde kalır.
+    # Her adres çekirdekte ayrı görev, araç tablosu ortak (hepsi aynı döngü thread'inde çalışır).
+    LINK_TIMEOUT = 5.0
+
+    def __init__(self, addresses, publish_rate=20, recorder=None, subscriptions=None, link_budget=None,
+                 history=None, router=None, io_core=None):
+        super().__init__(None, publish_rate, recorder, subscriptions, link_budget, history, router)
+        self.addresses = [addresses] if isinstance(addresses, str) else list(addresses)
+        self.io_core = io_core
+        self.open_links = {}
+
+    def links(self):
+        return list(self.open_links.values())
+
+    def sources(self):
+        return [(f'mavlink {address}', partial(self.session, address)) for address in self.addresses]
+
+    async def session(self, address, health):
+        from io_core import open_packet_stream
+        stream = await open_packet_stream(address)
+        link = AsyncMavlinkLink(stream, address)
+        self.open_links[address] = link
+        # Araç yeniden başlamış olabilir: bu bağlantıdan duyulan araçlarda abonelik baştan
+        for vehicle in self.vehicles.vehicles.values():
+            if isinstance(vehicle.link, AsyncMavlinkLink) and vehicle.link.address == address:
+                vehicle.component_id = None
+                vehicle.awaiting = None
+                vehicle.link = link
+        last_data = time.monotonic()
+        try:
+            while True:
+                data = await stream.read(0.05)
+                now = time.monotonic()
+                if data:
+                    last_data = now
+                    health.data()
+                    for msg in link.parse(data):
+                        self.dispatch(msg, link)
+                elif now - last_data > self.LINK_TIMEOUT:
+                    raise TimeoutError(f'{self.LINK_TIMEOUT:g} s without MAVLink data')
+                self.service(now)
+        finally:
+            self.open_links.pop(address, None)
+            stream.close()
+
+
+class StatsOverlay(QLabel):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setFont(QFont("Consolas", 9))
+        self.setStyleSheet('color: #7CFC00; background-color: rgba(0, 0, 0, 170); padding:6px;')
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.move(10, 10)
+        self.hide()
+
+    def show_stats(self, summary, video, ages, link=None, subscriptions=None, io=None, router=None):
+        def latency(name):
+            if f'{name}.p50_ms' not in summary:
+                return '  -  /  -  ms'
+            return f"{summary[f'{name}.p50_ms']:5.1f}/{summary[f'{name}.p99_ms']:5.1f} ms"
+
+        age_text = '  '.join(f'{name} {age:.2f}s' for name, age in sorted(ages.items())) or '-'
+        lines = [
+            f"VIDEO   {summary.get('video.paint.rate', 0):3d} fps   decode p50/p99 {latency('video.decode')}   "
+            f"display {latency('video.display')}",
+            f"        received {video['received']}  decoded {video['decoded']}  shown {video['shown']}  "
+            f"dropped {video['dropped']}",
+            f"MAVLINK {summary.get('telemetry.message.rate', 0):3d} msg/s repaint p50/p99 {latency('telemetry.repaint')}",
+            f"        age {age_text}",
+        ]
+        if link is not None:
+            capacity = link.get('link.capacity')
+            used = f"{link['link.bytes_per_s'] / 1000:.1f} kB/s"
+            if capacity:
+                used += f" of {capacity / 1000:.1f} kB/s ({link['link.utilization']:.0%})"
+            lines.append(f"LINK    {used}")
+            if subscriptions:
+                lines.append('        ' + '  '.join(
+                    f"{name} {link.get(f'link.{name}.rate', 0):.1f}/{rate:g} Hz {mode}"
+                    for name, (rate, mode) in sorted(subscriptions.items())))
+        lines.append(f"LIDAR   {summary.get('lidar.fetch.rate', 0):3d} scan/s render p50/p99 {latency('lidar.render')}")
+        for i, (name, health) in enumerate(sorted((io or {}).items())):
+            text = f"{name} {health['state']} {health['for']:.0f}s  reconnects {health['reconnects']}"
+            if health['state'] != 'up' and health['error']:
+                text += f"  ({health['error']})"
+            lines.append(('I/O     ' if i == 0 else '        ') + text)
+        for i, (name, counts) in enumerate(sorted((router or {}).items())):
+            lines.append(('ROUTER  ' if i == 0 else '        ') +
+                         f"{name} sent {counts['sent']}  dropped {counts['dropped']}  queued {counts['queued']}")
+        self.setText('\n'.join(lines))
+        self.adjustSize()
+
+
+DEFAULT_VIDEO_URL = "http://192.168.85.114:5000/video_feed"
+DEFAULT_LIDAR_IP = "192.168.85.114:5001"
+
 
 class PixhawkInterface(QWidget):
-    def __init__(self):
+    # İrtifa etiketi
+    MAVLINK_MESSAGES = {'VFR_HUD': 4}
+    # Geçmişte tutulan alanlar (TelemetryReader.snapshot anahtarları) ve süre
+    HISTORY_FIELDS = {
+        'VFR_HUD': ('airspeed', 'climb', 'altitude'),
+        'ATTITUDE': ('roll', 'pitch'),
+        'SYS_STATUS': ('battery_remaining',),
+    }
+    HISTORY_SECONDS = 4 * 3600
+    CAMERA_IP_DEBOUNCE = 600
+    # Hazırda bekleyen kameralarda kareler çözülmeden atılır, saniyede bir tanesi çözülür
+    STANDBY_FPS = 1
+
+    def __init__(self, recorder=None, replay=None, video_url=DEFAULT_VIDEO_URL, lidar_ip=DEFAULT_LIDAR_IP,
+                 stats_csv=None, display_rate=60, grid_max_fps=15, video_process=False, chart_decimation='minmax',
+                 lidar_world_frame=False, camera_standby=False, async_io=False, forward=(), hud=False):
         super().__init__()
 
+        self.video_url = video_url
+        self.lidar_ip = lidar_ip
+        self.recorder = recorder
+        self.replay = replay
+        self.connections = []
+        self.telemetry_reader = None
+        # Araç bağlantısını paylaşacak yerel uç noktalar (udpout:, udpin:, tcpin:)
+        self.forward = list(forward)
+        self.router = None
+        self.link_budget = None
+        # Kapasite istenen mesaj hızlarından: bellek kullanımı sabit
+        rates = collect_subscriptions(PixhawkInterface, AirSpeedGaugeWidget, VerticalSpeedGaugeWidget,
+                                      GraphWidget, BatteryWidget)
+        self.history = TelemetryHistory(self.HISTORY_FIELDS, rates, self.HISTORY_SECONDS)
+        self.chart_decimation = chart_decimation
+        self.lidar_world_frame = lidar_world_frame
+        # Listedeki diğer kameralara açık, düşük hızlı bağlantılar: geçiş anında
+        self.camera_standby = camera_standby and replay is None and not video_process
+        self.standby_workers = {}
+        self.retired_workers = []
+        self.charts = None
+        self.received_at = {}
+        self.pending_text = {}
+        self.grid_max_fps = grid_max_fps
+        self.video_process = video_process
+        # Canlı kaynaklar tek asyncio döngüsünde (IoCore), ilk kullanımda açılır
+        self.async_io = async_io and replay is None
+        self.io_core = None
+        self.decode_pool = None
+        self.camera_grid = None
+        self.lidar_worker = None
+        self.workers_scheduled = False
+        self.workers_started = False
+        self.repaint_scheduler = RepaintScheduler(display_rate)
+        self.stats_exporter = StatsCsvExporter(stats_csv) if stats_csv else None
         self.initUI()
-        self.connection = None
 
     def initUI(self):
         self.setWindowTitle('Pixhawk Arayüzü')
@@ -491,14 +2472,34 @@ class PixhawkInterface(QWidget):
         main_layout.setSpacing(5)
 
         # Video Stream
-        self.video_widget = VideoStreamWidget(url="http://192.168.85.114:5000/video_feed")
+        if self.replay is not None:
+            video_worker_factory = partial(ReplayVideoWorker, self.replay)
+        elif self.video_process and self.recorder is None:
+            video_worker_factory = ProcessVideoSource
+        elif self.async_io:
+            video_worker_factory = self.async_video_source
+        else:
+            if self.video_process:
+                # JPEG'ler kayıt için arayüz sürecinde olmalı
+                print("Kayıt açıkken video ayrı süreçte çalıştırılamaz, thread kullanılıyor")
+            video_worker_factory = VideoStreamWorker
+        self.video_widget = VideoStreamWidget(url=self.video_url,
+                                              worker_factory=video_worker_factory, recorder=self.recorder,
+                                              autostart=False)
         self.video_widget.setFixedSize(1320, 640)
+        if hud:
+            self.video_widget.hud = HudOverlay()
+
+        # Tek kamera ve kamera ızgarası aynı alanda yer değiştirir
+        self.video_stack = QStackedWidget()
+        self.video_stack.setFixedSize(1320, 640)
+        self.video_stack.addWidget(self.video_widget)
 
         # Video widget'ı içeren layout'u oluştur
         video_layout = QVBoxLayout()
         video_layout.setContentsMargins(0, 0, 0, 0)
         video_layout.setSpacing(0)
-        video_layout.addWidget(self.video_widget)
+        video_layout.addWidget(self.video_stack)
 
         main_layout.addLayout(video_layout)
 
@@ -536,7 +2537,7 @@ class PixhawkInterface(QWidget):
 
 
         # Lidar Widget ekle
-        self.lidar_widget = LidarWidget()
+        self.lidar_widget = LidarWidget(world_frame=self.lidar_world_frame)
         self.lidar_widget.setFixedSize(440, 320)  # Boyutu uygun şekilde ayarlayın
         gauges_and_lidar_layout.addWidget(self.lidar_widget, alignment=Qt.AlignRight)
 
@@ -548,49 +2549,59 @@ class PixhawkInterface(QWidget):
         connection_layout.setSpacing(10)
 
         self.port_label = QLabel('PORT')
-        self.port_label.setFont(QFont("Armstrong", 10))
+        self.port_label.setFont(instrument_font(10))
         self.port_label.setStyleSheet('color: #bbc5c9 ; background-color : #011c38 ; padding:5px;')
         connection_layout.addWidget(self.port_label)
 
         self.port_combo = QComboBox()
         self.port_combo.addItems(['COM5', 'COM6', 'COM7', 'COM8', 'COM9'])
-        self.port_combo.setFont(QFont("Armstrong", 10))
+        # Ağ adresi ya da virgülle ayrılmış birden fazla bağlantı yazılabilir
+        self.port_combo.setEditable(True)
+        self.port_combo.setFont(instrument_font(10))
         self.port_combo.setStyleSheet('background-color : #002142 ; color : #bbc5c9 ; padding:5px;')
         self.port_combo.setFixedWidth(100)
         connection_layout.addWidget(self.port_combo)
 
         self.baud_label = QLabel('BAUD RATE')
-        self.baud_label.setFont(QFont("Armstrong", 10))
+        self.baud_label.setFont(instrument_font(10))
         self.baud_label.setStyleSheet('color : #bbc5c9 ; background-color: #011c38 ; padding:5px;')
         connection_layout.addWidget(self.baud_label)
 
         self.baud_combo = QComboBox()
         self.baud_combo.addItems(['9600', '19200', '38400', '57600', '115200'])
-        self.baud_combo.setFont(QFont("Armstrong", 10))
+        self.baud_combo.setFont(instrument_font(10))
         self.baud_combo.setStyleSheet('background-color: #002142 ; color: #bbc5c9 ; padding:5px;')
         self.baud_combo.setFixedWidth(100)
         connection_layout.addWidget(self.baud_combo)
 
         self.connect_button = QPushButton('CONNECT')
-        self.connect_button.setFont(QFont("Armstrong", 10))
+        self.connect_button.setFont(instrument_font(10))
         self.connect_button.setStyleSheet('background-color: #3CB371; color: white; padding:5px;')
         self.connect_button.setFixedSize(120, 30)
         self.connect_button.clicked.connect(self.connect_pixhawk)
         connection_layout.addWidget(self.connect_button)
 
         self.status_label = QLabel('NO CONNECTION')
-        self.status_label.setFont(QFont("Armstrong", 10))
+        self.status_label.setFont(instrument_font(10))
         self.status_label.setStyleSheet('color: white; background-color: #798499; padding:5px;')
         self.status_label.setFixedSize(170, 30)
         connection_layout.addWidget(self.status_label)
 
+        # Göstergelerin bağlı olduğu araç (MAVLink sistem id)
+        self.vehicle_combo = QComboBox()
+        self.vehicle_combo.setFont(instrument_font(10))
+        self.vehicle_combo.setStyleSheet('background-color: #002142 ; color: #bbc5c9 ; padding:5px;')
+        self.vehicle_combo.setFixedWidth(100)
+        self.vehicle_combo.currentIndexChanged.connect(self.select_vehicle)
+        connection_layout.addWidget(self.vehicle_combo)
+
         self.camera_ip_label = QLabel('IP adresi:')
-        self.camera_ip_label.setFont(QFont("Armstrong", 10))
+        self.camera_ip_label.setFont(instrument_font(10))
         self.camera_ip_label.setStyleSheet('color: #ffffff; padding:5px;')
         connection_layout.addWidget(self.camera_ip_label)
 
         self.camera_ip_combo = QComboBox()
-        self.camera_ip_combo.setFont(QFont("Armstrong", 10))
+        self.camera_ip_combo.setFont(instrument_font(10))
         self.camera_ip_combo.setStyleSheet('background-color: #ffffff; color: #000000; padding:5px;')
         self.camera_ip_combo.setEditable(True)
         self.camera_ip_combo.addItems([
@@ -599,31 +2610,41 @@ class PixhawkInterface(QWidget):
             "192.168.85.116:5000"
         ])
         self.camera_ip_combo.setFixedWidth(300)
-        self.camera_ip_combo.currentTextChanged.connect(self.update_camera_ip)
+        # Yazarken her tuşta bağlanılmasın: düzenleme durduktan sonra geçilir, listeden seçim hemen
+        self.camera_ip_timer = QTimer(self)
+        self.camera_ip_timer.setSingleShot(True)
+        self.camera_ip_timer.setInterval(self.CAMERA_IP_DEBOUNCE)
+        self.camera_ip_timer.timeout.connect(self.update_camera_ip)
+        self.camera_ip_combo.currentTextChanged.connect(lambda text: self.camera_ip_timer.start())
+        self.camera_ip_combo.activated.connect(self.update_camera_ip)
         connection_layout.addWidget(self.camera_ip_combo)
 
+        self.grid_button = QPushButton('GRID')
+        self.grid_button.setFont(instrument_font(10))
+        self.grid_button.setStyleSheet('background-color: #002142; color: #bbc5c9; padding:5px;')
+        self.grid_button.setFixedSize(80, 30)
+        self.grid_button.setEnabled(self.replay is None)
+        self.grid_button.clicked.connect(self.toggle_camera_grid)
+        connection_layout.addWidget(self.grid_button)
+
         self.altitude_label = QLabel('Altitude: ')
-        self.altitude_label.setFont(QFont("Armstrong", 10))
+        self.altitude_label.setFont(instrument_font(10))
         self.altitude_label.setStyleSheet('color: #ffffff; padding:5px;')
         connection_layout.addWidget(self.altitude_label)
 
-        self.altitude_value_label = QLabel('--- m')
-        self.altitude_value_label.setFont(QFont("Armstrong", 10))
-        self.altitude_value_label.setStyleSheet('color: #ffffff; padding:5px;')
+        self.altitude_value_label = ValueLabel('--- m', '-00000.0 m', instrument_font(10))
         connection_layout.addWidget(self.altitude_value_label)
 
         self.flight_time_label = QLabel('Flight Time: ')
-        self.flight_time_label.setFont(QFont("Armstrong", 10))
+        self.flight_time_label.setFont(instrument_font(10))
         self.flight_time_label.setStyleSheet('color: #ffffff; padding:5px;')
         connection_layout.addWidget(self.flight_time_label)
 
-        self.flight_time_value_label = QLabel('--- h')
-        self.flight_time_value_label.setFont(QFont("Armstrong", 10))
-        self.flight_time_value_label.setStyleSheet('color: #ffffff; padding:5px;')
+        self.flight_time_value_label = ValueLabel('--- h', '00000.00 h', instrument_font(10))
         connection_layout.addWidget(self.flight_time_value_label)
 
         self.battery_label = QLabel('Battery')
-        self.battery_label.setFont(QFont("Armstrong", 10))
+        self.battery_label.setFont(instrument_font(10))
         self.battery_label.setStyleSheet('color: #ffffff; padding:5px;')
         self.battery_label.setFixedSize(90, 30)
         connection_layout.addWidget(self.battery_label)
@@ -641,88 +2662,473 @@ class PixhawkInterface(QWidget):
 
         self.setLayout(main_layout)
 
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_data)
+        self.repaint_scheduler.register(self.vertical_speed_gauge, self.graph_widget, self.air_speed_gauge,
+                                        self.lidar_widget, self.battery_widget)
+
+        # F3 ile istatistik katmanını aç/kapat
+        self.stats_overlay = StatsOverlay(self.video_widget)
+        QShortcut(QKeySequence('F3'), self, self.toggle_stats)
+        # F4: telemetri geçmişi grafikleri ayrı pencerede
+        QShortcut(QKeySequence('F4'), self, self.toggle_charts)
+        # F5: video üzerinde HUD
+        QShortcut(QKeySequence('F5'), self, self.toggle_hud)
+        self.stats_timer = QTimer(self)
+        self.stats_timer.timeout.connect(self.update_stats)
+        if self.stats_exporter is not None:
+            self.stats_timer.start(1000)
 
-        self.lidar_worker = LidarDataWorker(ip="192.168.85.114:5001")
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.workers_scheduled:
+            # Ağ bağlantıları pencere ilk kez çizildikten sonra açılır
+            self.workers_scheduled = True
+            QTimer.singleShot(0, self.start_workers)
+
+    def start_workers(self):
+        self.workers_started = True
+        self.video_widget.start_video_stream(self.video_widget.url)
+        self.start_standby()
+
+        if self.replay is not None:
+            self.lidar_worker = ReplayLidarWorker(self.replay)
+        elif self.async_io:
+            self.lidar_worker = AsyncLidarSource(ip=self.lidar_ip, recorder=self.recorder, io_core=self.io())
+        else:
+            self.lidar_worker = LidarDataWorker(ip=self.lidar_ip, recorder=self.recorder)
         self.lidar_worker.lidar_data_received.connect(self.lidar_widget.update_lidar_data)
         self.lidar_worker.start()
 
+        if self.replay is not None:
+            self.connect_pixhawk()
+        else:
+            # pymavlink yüklemesi uzun sürer, bağlan tuşundan önce arka planda hazırla
+            threading.Thread(target=importlib.import_module, args=('pymavlink.mavutil',), daemon=True).start()
+
+    def io(self):
+        if self.io_core is None:
+            from io_core import IoCore
+            self.io_core = IoCore()
+        return self.io_core
+
+    def shared_decode_pool(self):
+        if self.decode_pool is None:
+            self.decode_pool = JpegDecodePool()
+        return self.decode_pool
+
+    def async_video_source(self, url, mailbox=None, recorder=None, decode_pool=None, max_fps=None):
+        return AsyncVideoSource(url, mailbox, recorder, decode_pool or self.shared_decode_pool(), max_fps,
+                                io_core=self.io())
+
     def update_altitude(self, altitude):
-        self.altitude_value_label.setText(f'{altitude} m')
+        self.set_label_text(self.altitude_value_label, f'{altitude:.1f} m')
 
     def update_flight_time(self, flight_time):
-        self.flight_time_value_label.setText(f'{flight_time} h')
+        self.set_label_text(self.flight_time_value_label, f'{flight_time} h')
+
+    def set_label_text(self, label, text):
+        self.pending_text[label] = text
+        self.repaint_scheduler.request(self)
+
+    def flush_display(self):
+        pending, self.pending_text = self.pending_text, {}
+        for label, text in pending.items():
+            if label.text() != text:
+                label.setText(text)
+
+    def camera_urls(self):
+        return [f"http://{self.camera_ip_combo.itemText(i)}/video_feed" for i in range(self.camera_ip_combo.count())]
 
     def update_camera_ip(self):
+        self.camera_ip_timer.stop()
         ip = self.camera_ip_combo.currentText()
         if ip:
             url = f"http://{ip}/video_feed"
-            self.video_widget.video_thread.stop()
-            self.video_widget.start_video_stream(url)
+            if self.camera_grid is not None or not self.workers_started:
+                self.video_widget.url = url
+                return
+            if url == self.video_widget.url and self.video_widget.video_thread is not None:
+                return
+            old = self.video_widget.detach_video_stream()
+            standby = self.standby_workers.pop(url, None)
+            if standby is not None:
+                standby.set_max_fps(None)
+                standby.recorder = self.recorder
+            self.video_widget.start_video_stream(url, standby)
+            if old is not None:
+                if self.camera_standby and old.url in self.camera_urls():
+                    self.put_on_standby(old)
+                else:
+                    self.retire_worker(old)
+
+    def put_on_standby(self, worker):
+        worker.set_max_fps(self.STANDBY_FPS)
+        worker.recorder = None
+        self.standby_workers[worker.url] = worker
+
+    def start_standby(self):
+        if not self.camera_standby:
+            return
+        for url in self.camera_urls():
+            if url != self.video_widget.url and url not in self.standby_workers:
+                # Bant genişliği yine harcanır, ama ayrıştırma dışında CPU maliyeti saniyede bir çözme
+                worker = self.video_widget.worker_factory(url, max_fps=self.STANDBY_FPS)
+                worker.target_size = (self.video_widget.width(), self.video_widget.height())
+                worker.start()
+                self.standby_workers[url] = worker
+
+    def stop_standby(self, wait=False):
+        workers, self.standby_workers = list(self.standby_workers.values()), {}
+        for worker in workers:
+            if wait:
+                worker.stop()
+            else:
+                self.retire_worker(worker)
+
+    def retire_worker(self, worker):
+        # Arayüz durmadan kapat; thread bitene kadar referans tutulur (çalışan QThread silinmemeli).
+        # finished durdurmadan önce bağlanır: arada biten thread listede kalmasın
+        if isinstance(worker, QThread):
+            self.retired_workers.append(worker)
+            worker.finished.connect(partial(self.release_worker, worker))
+        worker.stop(wait=False)
+        if isinstance(worker, QThread) and not worker.isRunning():
+            self.release_worker(worker)
+
+    def release_worker(self, worker):
+        if worker in self.retired_workers:
+            self.retired_workers.remove(worker)
+
+    def toggle_camera_grid(self):
+        if self.camera_grid is None:
+            self.stop_standby()
+            old = self.video_widget.detach_video_stream()
+            if old is not None:
+                self.retire_worker(old)
+            urls = self.camera_urls()
+            worker_factory = self.async_video_source if self.async_io else VideoStreamWorker
+            self.camera_grid = CameraGridWidget(urls, self.shared_decode_pool(), max_fps=self.grid_max_fps,
+                                                worker_factory=worker_factory)
+            self.video_stack.addWidget(self.camera_grid)
+            self.video_stack.setCurrentWidget(self.camera_grid)
+            self.grid_button.setText('SINGLE')
+        else:
+            for worker in self.camera_grid.detach_workers():
+                self.retire_worker(worker)
+            self.video_stack.removeWidget(self.camera_grid)
+            self.camera_grid.deleteLater()
+            self.camera_grid = None
+            self.video_stack.setCurrentWidget(self.video_widget)
+            self.video_widget.start_video_stream(self.video_widget.url)
+            self.start_standby()
+            self.grid_button.setText('GRID')
 
     def connect_pixhawk(self):
-        port = self.port_combo.currentText()
+        from pymavlink import mavutil
+        # Virgülle ayrılmış birden fazla bağlantı: "COM5, udpin:0.0.0.0:14550, tcp:10.0.0.2:5760"
+        ports = [port.strip() for port in self.port_combo.currentText().split(',') if port.strip()]
         baud = int(self.baud_combo.currentText())
         try:
-            self.connection = mavutil.mavlink_connection(port, baud=baud)
-            self.status_label.setText(f'CONNECTED ({port} @ {baud})')
+            self.stop_telemetry()
+            subscriptions = None
+            if self.replay is not None:
+                self.connections = [ReplayConnection(self.replay)]
+                ports, baud = ['REPLAY'], self.replay.clock.speed
+                self.link_budget = LinkBudget()
+            else:
+                # Ağ bağlantılarında baud anlamsız, kapasite sadece hepsi seri ise hesaplanır
+                serial = [not port.startswith(('udp', 'tcp')) for port in ports]
+                if any(serial) or not self.async_io:
+                    # Tüm bağlantılar tek okuma thread'inde
+                    self.connections = self.open_connections(mavutil, ports, baud)
+                self.link_budget = LinkBudget(baud * len(ports) if all(serial) else None)
+                # Sadece göstergelerin kullandığı mesajlar, ihtiyaç duyulan hızda istenir
+                subscriptions = collect_subscriptions(self, self.air_speed_gauge, self.vertical_speed_gauge,
+                                                      self.graph_widget, self.battery_widget)
+            if self.forward and self.replay is None:
+                from mavrouter import MavlinkRouter
+                self.router = MavlinkRouter(self.forward)
+            if len(ports) == 1:
+                self.status_label.setText(f'CONNECTED ({ports[0]} @ {baud})')
+            else:
+                self.status_label.setText(f'CONNECTED ({len(ports)} links)')
             self.status_label.setStyleSheet('color: white; background-color: #228B22; padding:5px;')
 
-            self.connection.mav.request_data_stream_send(
-                self.connection.target_system,
-                self.connection.target_component,
-                mavutil.mavlink.MAV_DATA_STREAM_ALL,
-                10,
-                1
-            )
-
-            self.timer.start(200)
+            if not self.connections:
+                self.telemetry_reader = AsyncTelemetrySource(ports, recorder=self.recorder,
+                                                             subscriptions=subscriptions,
+                                                             link_budget=self.link_budget, history=self.history,
+                                                             router=self.router, io_core=self.io())
+            else:
+                self.telemetry_reader = TelemetryReader(self.connections, recorder=self.recorder,
+                                                        subscriptions=subscriptions, link_budget=self.link_budget,
+                                                        history=self.history, router=self.router)
+            self.telemetry_reader.vehicles_changed.connect(self.update_vehicles)
+            self.telemetry_reader.telemetry_updated.connect(self.update_data)
+            self.telemetry_reader.error_occurred.connect(self.show_data_error)
+            self.telemetry_reader.start()
         except Exception as e:
+            # Bu denemede açılanlar (bağlantılar, yönlendirici) bırakılır: COM portu sonraki denemede meşgul kalmasın
+            self.stop_telemetry()
             self.status_label.setText(f'Hata: {str(e)}')
             self.status_label.setStyleSheet('color: white; background-color: #B22222; padding:5px;')
 
-    def update_data(self):
-        if self.connection:
-            try:
-                msg = self.connection.recv_match(type='VFR_HUD', blocking=True, timeout=0.5)
-                if msg:
-                    airspeed = msg.airspeed
-                    altitude = msg.alt
-                    vertical_speed = msg.climb
-                    self.air_speed_gauge.update_value(airspeed)
-                    self.vertical_speed_gauge.update_value(vertical_speed)
-                    self.update_altitude(altitude)
-                    flight_time = self.connection.time_since(self.connection.last_heartbeat()) / 3600
-                    self.update_flight_time(round(flight_time, 2))
-                else:
-                    self.air_speed_gauge.update_value(0)
-                    self.vertical_speed_gauge.update_value(0)
-
-                msg_attitude = self.connection.recv_match(type='ATTITUDE', blocking=True, timeout=0.5)
-                if msg_attitude:
-                    roll = msg_attitude.roll * (180 / pi)
-                    pitch = msg_attitude.pitch * (180 / pi)
-                    self.graph_widget.update_graph(pitch, roll)
-                else:
-                    self.graph_widget.update_graph(0, 0)
-
-                msg_sys_status = self.connection.recv_match(type='SYS_STATUS', blocking=True, timeout=0.5)
-                if msg_sys_status:
-                    battery_remaining = msg_sys_status.battery_remaining
-                    if battery_remaining < 0:
-                        battery_remaining = 0
-                    self.battery_widget.update_battery_level(battery_remaining)
-                else:
-                    pass
-
-            except Exception as e:
-                self.status_label.setText(f'Veri Hatasi: {str(e)}')
-                self.status_label.setStyleSheet('color: white; background-color: #B22222; padding:5px;')
+    def open_connections(self, mavutil, ports, baud):
+        # Sonraki port açılamazsa öncekiler kapatılır
+        connections = []
+        try:
+            for port in ports:
+                connections.append(mavutil.mavlink_connection(port, baud=baud))
+        except Exception:
+            for connection in connections:
+                connection.close()
+            raise
+        return connections
+
+    def stop_telemetry(self):
+        if self.telemetry_reader is not None:
+            self.telemetry_reader.stop()
+            self.telemetry_reader = None
+        connections, self.connections = self.connections, []
+        for connection in connections:
+            connection.close()
+        if self.router is not None:
+            self.router.close()
+            self.router = None
+        self.vehicle_combo.clear()
+
+    def update_vehicles(self, system_ids):
+        selected = self.telemetry_reader.selected if self.telemetry_reader is not None else None
+        self.vehicle_combo.blockSignals(True)
+        self.vehicle_combo.clear()
+        for system_id in system_ids:
+            self.vehicle_combo.addItem(f'SYS {system_id}', system_id)
+        if selected in system_ids:
+            self.vehicle_combo.setCurrentIndex(system_ids.index(selected))
+        self.vehicle_combo.blockSignals(False)
+
+    def select_vehicle(self, index):
+        system_id = self.vehicle_combo.itemData(index)
+        if system_id is None or self.telemetry_reader is None or system_id == self.telemetry_reader.selected:
+            return
+        # Geçmiş grafikleri tek aracı gösterir, yeni araçla baştan dolar
+        self.history.clear()
+        self.telemetry_reader.select_vehicle(system_id)
+
+    def toggle_stats(self):
+        self.stats_overlay.setVisible(not self.stats_overlay.isVisible())
+        if self.stats_overlay.isVisible():
+            self.update_stats()
+            self.stats_timer.start(500)
+        elif self.stats_exporter is None:
+            self.stats_timer.stop()
+        else:
+            self.stats_timer.start(1000)
+
+    def toggle_charts(self):
+        if self.charts is None:
+            self.charts = TelemetryChartsWidget(self.history, self.chart_decimation)
+            self.repaint_scheduler.register(*self.charts.charts)
+        self.charts.setVisible(not self.charts.isVisible())
+
+    def toggle_hud(self):
+        self.video_widget.hud = None if self.video_widget.hud is not None else HudOverlay()
+        self.video_widget.update()
+
+    def update_stats(self):
+        summary = pipeline_stats.summary()
+        video = self.video_widget.mailbox.stats()
+        now = time.perf_counter()
+        ages = {name: now - received_at for name, received_at in self.received_at.items()}
+        link = self.link_budget.summary() if self.link_budget is not None else None
+        subscriptions = None
+        if self.telemetry_reader is not None:
+            reader = self.telemetry_reader
+            subscriptions = {name: (rate, reader.subscription_mode.get(name, ''))
+                             for name, rate in reader.subscriptions.items()}
+        io = self.io_core.health_snapshot() if self.io_core is not None else None
+        router = self.router.stats() if self.router is not None else None
+        if self.stats_overlay.isVisible():
+            self.stats_overlay.show_stats(summary, video, ages, link, subscriptions, io, router)
+        if self.stats_exporter is not None:
+            row = dict(summary)
+            if link is not None:
+                row.update(link)
+            for name, health in (io or {}).items():
+                row[f'io.{name}.up'] = int(health['state'] == 'up')
+                row[f'io.{name}.reconnects'] = health['reconnects']
+            for name, counts in (router or {}).items():
+                row.update((f'router.{name}.{key}', value) for key, value in counts.items())
+            row.update((f'video.{name}', value) for name, value in video.items())
+            row.update((f'age.{name}', value) for name, value in ages.items())
+            self.stats_exporter.write(row)
+
+    def update_data(self, telemetry):
+        self.received_at = telemetry.get('received_at', {})
+        if 'VFR_HUD' in self.received_at:
+            self.air_speed_gauge.mark_data(self.received_at['VFR_HUD'])
+            self.vertical_speed_gauge.mark_data(self.received_at['VFR_HUD'])
+        if 'ATTITUDE' in self.received_at:
+            self.graph_widget.mark_data(self.received_at['ATTITUDE'])
+        self.air_speed_gauge.update_value(telemetry['airspeed'])
+        self.vertical_speed_gauge.update_value(telemetry['climb'])
+        self.graph_widget.update_graph(telemetry['pitch'], telemetry['roll'])
+        self.lidar_widget.set_yaw(telemetry['yaw'])
+        if telemetry['altitude'] is not None:
+            self.update_altitude(telemetry['altitude'])
+        if telemetry['flight_time'] is not None:
+            self.update_flight_time(telemetry['flight_time'])
+        if telemetry['battery_remaining'] is not None:
+            self.battery_widget.update_battery_level(telemetry['battery_remaining'])
+        if self.charts is not None and self.charts.isVisible():
+            self.charts.request_repaint()
+        hud = self.video_widget.hud
+        if hud is not None and hud.set_values(telemetry):
+            # Video donmuşsa da HUD güncel kalsın; karelerle aynı boyamada birleşir
+            self.video_widget.update()
+
+    def show_data_error(self, message):
+        self.status_label.setText(f'Veri Hatasi: {message}')
+        self.status_label.setStyleSheet('color: white; background-color: #B22222; padding:5px;')
+
+    def closeEvent(self, event):
+        self.stop_telemetry()
+        self.video_widget.stop_video_stream()
+        self.stop_standby(wait=True)
+        for worker in list(self.retired_workers):
+            worker.wait()
+        if self.camera_grid is not None:
+            self.camera_grid.stop()
+        if self.decode_pool is not None:
+            self.decode_pool.shutdown()
+        if self.lidar_worker is not None:
+            self.lidar_worker.stop()
+        if self.charts is not None:
+            self.charts.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.stats_exporter is not None:
+            self.stats_exporter.close()
+        if self.io_core is not None:
+            self.io_core.close()
+        super().closeEvent(event)
+
+
+def run_headless(args):
+    # Arayüzsüz: aynı okuma hattı QCoreApplication altında çalışır (ekran gerekmez), son değerler
+    # ingest_server ile uzak izleyicilere dağıtılır
+    import signal
+    from PyQt5.QtCore import QCoreApplication
+    from ingest_server import IngestServer
+    from io_core import IoCore
+
+    app = QCoreApplication(sys.argv[:1])
+    recorder = Recorder(args.record) if args.record else None
+    io_core = IoCore()
+    host, port = args.serve.rsplit(':', 1)
+    server = IngestServer(host, int(port), TelemetryReader.SNAPSHOT_FIELDS, io_core=io_core)
+    hub = server.hub
+
+    if args.async_io:
+        video = AsyncPassThroughVideoSource(args.video_url, hub.publish_video, recorder, io_core=io_core)
+        lidar = AsyncLidarSource(ip=args.lidar_ip, recorder=recorder, io_core=io_core)
+    else:
+        video = PassThroughVideoWorker(args.video_url, hub.publish_video, recorder)
+        lidar = LidarDataWorker(ip=args.lidar_ip, recorder=recorder)
+    # Qt sinyali olmadan doğrudan okuyucu thread'inden: hub thread güvenli, ana döngü beklenmez
+    lidar.lidar_data_received.connect(lambda scan, fetched_at: hub.publish_lidar(scan), Qt.DirectConnection)
+    workers = [video, lidar]
+
+    router = None
+    connections = []
+    ports = [port.strip() for port in args.mavlink.split(',') if port.strip()] if args.mavlink else []
+    if ports:
+        from pymavlink import mavutil
+        subscriptions = collect_subscriptions(PixhawkInterface, AirSpeedGaugeWidget, VerticalSpeedGaugeWidget,
+                                              GraphWidget, BatteryWidget)
+        serial = [not port.startswith(('udp', 'tcp')) for port in ports]
+        link_budget = LinkBudget(args.baud * len(ports) if all(serial) else None)
+        if args.forward:
+            from mavrouter import MavlinkRouter
+            router = MavlinkRouter(args.forward)
+        if args.async_io and not any(serial):
+            reader = AsyncTelemetrySource(ports, recorder=recorder, subscriptions=subscriptions,
+                                          link_budget=link_budget, router=router, io_core=io_core)
+        else:
+            connections = [mavutil.mavlink_connection(port, baud=args.baud) for port in ports]
+            reader = TelemetryReader(connections, recorder=recorder, subscriptions=subscriptions,
+                                     link_budget=link_budget, router=router)
+        reader.telemetry_updated.connect(hub.publish_telemetry, Qt.DirectConnection)
+        reader.error_occurred.connect(print)
+        workers.append(reader)
+
+    for worker in workers:
+        worker.start()
+    print(f'Sunucu {args.serve} adresinde (http://{args.serve}/ws, /video.mjpg, /telemetry, /lidar)')
+
+    # Ctrl+C: Qt döngüsü Python sinyal işleyicisine ara ara dönsün
+    signal.signal(signal.SIGINT, lambda *_: app.quit())
+    timer = QTimer()
+    timer.timeout.connect(lambda: None)
+    timer.start(200)
+    code = app.exec_()
+
+    for worker in workers:
+        worker.stop()
+    for connection in connections:
+        connection.close()
+    if router is not None:
+        router.close()
+    server.close()
+    if recorder is not None:
+        recorder.close()
+    return code
 
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
-    ex = PixhawkInterface()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--record', metavar='DIR', help='MAVLink, video ve lidar verisini bu klasöre kaydet')
+    parser.add_argument('--replay', metavar='DIR', help='canlı kaynaklar yerine kayıttan oynat')
+    parser.add_argument('--speed', default='1', help="oynatma hızı: 1, 4, ... veya 'max'")
+    parser.add_argument('--start', type=float, default=0.0, help='oynatmaya kaydın bu saniyesinden başla')
+    parser.add_argument('--display-rate', type=float, default=60, help='gösterge yenileme hızı (Hz)')
+    parser.add_argument('--grid-fps', type=float, default=15, help='kamera ızgarasında akış başına en yüksek fps')
+    parser.add_argument('--video-process', action='store_true',
+                        help='video okuma/çözmeyi ayrı süreçte çalıştır, kareleri paylaşılan bellekten al')
+    parser.add_argument('--chart-decimation', choices=('minmax', 'lttb'), default='minmax',
+                        help='geçmiş grafiklerinde ekran çözünürlüğüne indirgeme yöntemi')
+    parser.add_argument('--lidar-world-frame', action='store_true',
+                        help='lidar ızgarasını araç yaw açısıyla döndürüp kuzey yukarı biriktir')
+    parser.add_argument('--camera-standby', action='store_true',
+                        help='listedeki diğer kameralara düşük hızlı bağlantıları açık tut, geçiş anında olsun')
+    parser.add_argument('--hud', action='store_true',
+                        help='yunuslama/yatış, hız bantları ve bataryayı video üzerinde göster (F5 ile aç/kapat)')
+    parser.add_argument('--async-io', action='store_true',
+                        help='video, lidar ve ağ MAVLink bağlantılarını tek asyncio döngüsünde, yeniden bağlanarak çalıştır')
+    parser.add_argument('--forward', action='append', default=[], metavar='ENDPOINT',
+                        help='araç MAVLink akışını ham olarak bu uç noktaya da dağıt (udpout:, udpin:, tcpin:); tekrarlanabilir')
+    parser.add_argument('--stats-csv', metavar='FILE', help='gecikme/fps istatistiklerini her saniye bu CSV dosyasına ekle')
+    parser.add_argument('--serve', metavar='HOST:PORT',
+                        help='arayüzsüz çalış: telemetri, lidar ve videoyu bu adresten HTTP/WebSocket ile yayınla')
+    parser.add_argument('--mavlink', metavar='PORTS', help='--serve ile: virgülle ayrılmış MAVLink bağlantıları')
+    parser.add_argument('--baud', type=int, default=57600, help='--serve ile seri port hızı')
+    parser.add_argument('--video-url', default=DEFAULT_VIDEO_URL, help='MJPEG kamera adresi')
+    parser.add_argument('--lidar-ip', default=DEFAULT_LIDAR_IP, help='lidar sunucusu (host:port)')
+    args, qt_args = parser.parse_known_args()
+
+    if args.serve:
+        sys.exit(run_headless(args))
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    recorder = Recorder(args.record) if args.record else None
+    replay = None
+    if args.replay:
+        speed = 0 if args.speed == 'max' else float(args.speed)
+        replay = ReplaySession(args.replay, speed=speed, start=args.start)
+    ex = PixhawkInterface(recorder=recorder, replay=replay, stats_csv=args.stats_csv,
+                          display_rate=args.display_rate, grid_max_fps=args.grid_fps,
+                          video_process=args.video_process, chart_decimation=args.chart_decimation,
+                          lidar_world_frame=args.lidar_world_frame, camera_standby=args.camera_standby,
+                          async_io=args.async_io, forward=args.forward, video_url=args.video_url,
+                          lidar_ip=args.lidar_ip, hud=args.hud)
     ex.show()
     sys.exit(app.exec_())
@@ -0,0 +1,434 @@
+# Donanım olmadan performans ölçümü.
+# Qt "offscreen" platformunda çalışır; kamera, lidar ve Pixhawk yerine yerel sahte kaynaklar
+# (MJPEG HTTP sunucusu, lidar JSON sunucusu, UDP üzerinden MAVLink) açar ve sonuçları JSON yazar.
+#
+#   python benchmarks.py --output bench.json
+#   python benchmarks.py --only paint,mjpeg_parse
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import argparse
+import json
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+import numpy as np
+from PyQt5.QtCore import QEventLoop, QTimer, QT_VERSION_STR
+from PyQt5.QtGui import QImage
+from PyQt5.QtWidgets import QApplication
+from pymavlink import mavutil
+
+import arayüzson3 as gcs
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    n = len(samples)
+    return {
+        'count': n,
+        'mean_ms': sum(samples) / n * 1000,
+        'p50_ms': samples[n // 2] * 1000,
+        'p99_ms': samples[min(n - 1, int(n * 0.99))] * 1000,
+    }
+
+
+def spin(seconds):
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec_()
+
+
+def start_server(handler):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'127.0.0.1:{server.server_address[1]}'
+
+
+def free_udp_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def synthetic_jpegs(width, height, count=30, quality=80):
+    rng = np.random.default_rng(0)
+    x = np.arange(width, dtype=np.uint16)
+    frames = []
+    for i in range(count):
+        img = rng.integers(0, 32, (height, width, 3), dtype=np.uint8)
+        img[..., 0] += ((x + i * 8) % 224).astype(np.uint8)
+        img[..., 2] += ((x[::-1] + i * 4) % 224).astype(np.uint8)
+        ok, jpg = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        frames.append(jpg.tobytes())
+    return frames
+
+
+def mjpeg_part(jpg):
+    return b'--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n' % len(jpg) + jpg + b'\r\n'
+
+
+def mjpeg_handler(frames, fps):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'multipart/x-mixed-replace; boundary=frame')
+            self.end_headers()
+            i = 0
+            try:
+                while True:
+                    self.wfile.write(mjpeg_part(frames[i % len(frames)]))
+                    i += 1
+                    if fps:
+                        time.sleep(1.0 / fps)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+    return Handler
+
+
+def lidar_handler(points, stream_rate):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def scan(self):
+            return (5 + 4 * np.sin(np.linspace(0, 8 * np.pi, points) + time.monotonic())).round(3).tolist()
+
+        def do_GET(self):
+            if self.path == '/lidar':
+                body = json.dumps(self.scan()).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            elif self.path == '/lidar/stream' and stream_rate:
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-ndjson')
+                self.end_headers()
+                try:
+                    while True:
+                        self.wfile.write(json.dumps(self.scan()).encode() + b'\n')
+                        time.sleep(1.0 / stream_rate)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+            else:
+                self.send_error(404)
+    return Handler
+
+
+class UdpWriter:
+    def __init__(self, sock, address):
+        self.sock = sock
+        self.address = address
+
+    def write(self, data):
+        self.sock.sendto(data, self.address)
+
+
+def mavlink_sender(port, rate, stop, vehicles=1):
+    # Pixhawk yerine geçer: VFR_HUD, ATTITUDE, SYS_STATUS ve HEARTBEAT yollar.
+    # vehicles > 1: mesaj grupları sırayla 1..vehicles sistem id'lerinden gelir (aynı hatta filo)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    mav = mavutil.mavlink.MAVLink(UdpWriter(sock, ('127.0.0.1', port)), srcSystem=1, srcComponent=1)
+    sent = 0
+    group = 0
+    start = time.perf_counter()
+    next_heartbeat = start
+    while not stop.is_set():
+        now = time.perf_counter()
+        t = now - start
+        if now >= next_heartbeat:
+            # Gerçek otopilot gibi saniyede bir, filodaki her araçtan
+            for system_id in range(1, vehicles + 1):
+                mav.srcSystem = system_id
+                mav.heartbeat_send(mavutil.mavlink.MAV_TYPE_FIXED_WING, mavutil.mavlink.MAV_AUTOPILOT_ARDUPILOTMEGA,
+                                   0, 0, 0)
+            sent += vehicles
+            next_heartbeat += 1.0
+        mav.srcSystem = 1 + group % vehicles
+        group += 1
+        mav.vfr_hud_send(12 + 5 * np.sin(t), 12, 90, 50, 100 + t, 2 * np.sin(t))
+        mav.attitude_send(int(t * 1000), 0.3 * np.sin(t), 0.2 * np.cos(t), 0, 0, 0, 0)
+        mav.sys_status_send(0, 0, 0, 0, 12000, 100, 80, 0, 0, 0, 0, 0, 0)
+        sent += 3
+        delay = sent / rate - (time.perf_counter() - start)
+        if delay > 0:
+            time.sleep(delay)
+    sock.close()
+    return sent
+
+
+def bench_paint(app, iterations):
+    results = {}
+    widgets = {
+        'battery': (gcs.BatteryWidget, lambda w, i: w.update_battery_level(i % 101)),
+        'vertical_speed': (gcs.VerticalSpeedGaugeWidget, lambda w, i: w.update_value((i % 60) - 30)),
+        'air_speed': (gcs.AirSpeedGaugeWidget, lambda w, i: w.update_value(i % 40)),
+        'graph': (gcs.GraphWidget, lambda w, i: w.update_graph((i % 60) - 30, (i % 90) - 45)),
+        'lidar': (gcs.LidarWidget, lambda w, i: w.update_lidar_data(5 + 4 * np.sin(np.linspace(0, 8, 3600) + i))),
+    }
+    for name, (cls, step) in widgets.items():
+        widget = cls()
+        widget.setFixedSize(440, 320)
+        image = QImage(widget.size(), QImage.Format_ARGB32_Premultiplied)
+        widget.render(image)
+        samples = []
+        for i in range(iterations):
+            step(widget, i)
+            start = time.perf_counter()
+            widget.render(image)
+            samples.append(time.perf_counter() - start)
+        results[name] = summarize(samples)
+        widget.close()
+    return results
+
+
+def bench_mjpeg_parse(frames, repeat=20):
+    stream = b''.join(mjpeg_part(jpg) for jpg in frames) * repeat
+    chunk_size = gcs.VideoStreamWorker.CHUNK_SIZE
+    parser = gcs.MjpegParser()
+    count = 0
+    start = time.perf_counter()
+    for i in range(0, len(stream), chunk_size):
+        for jpg in parser.feed(stream[i:i + chunk_size]):
+            count += 1
+    elapsed = time.perf_counter() - start
+    return {'frames': count, 'frames_per_s': count / elapsed, 'mb_per_s': len(stream) / elapsed / 1e6}
+
+
+def bench_jpeg_decode(frames, target_size, iterations=100):
+    worker = gcs.VideoStreamWorker(url=None)
+    worker.target_size = target_size
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        worker.decode(frames[i % len(frames)])
+        samples.append(time.perf_counter() - start)
+        worker.mailbox.take()
+    result = summarize(samples)
+    result['frames_per_s'] = 1000 / result['mean_ms']
+    return result
+
+
+def bench_video_stream(frames, fps, duration):
+    server, address = start_server(mjpeg_handler(frames, fps))
+    widget = gcs.VideoStreamWidget(url=f'http://{address}/video_feed')
+    widget.setFixedSize(1320, 640)
+    widget.show()
+    spin(duration)
+    stats = widget.mailbox.stats()
+    widget.stop_video_stream()
+    widget.close()
+    server.shutdown()
+    result = {f'{key}_per_s': value / duration for key, value in stats.items()}
+    result['source_fps'] = fps
+    return result
+
+
+def bench_lidar(points, stream_rate, duration):
+    server, address = start_server(lidar_handler(points, stream_rate))
+    worker = gcs.LidarDataWorker(ip=address, mode='stream' if stream_rate else 'poll')
+    widget = gcs.LidarWidget()
+    widget.setFixedSize(440, 320)
+    widget.show()
+    received = []
+    worker.lidar_data_received.connect(widget.update_lidar_data)
+    worker.lidar_data_received.connect(lambda scan, fetched_at: received.append(time.perf_counter()))
+    worker.start()
+    spin(duration)
+    worker.stop()
+    server.shutdown()
+    widget.close()
+    return {'scans_per_s': len(received) / duration, 'points': points}
+
+
+def bench_telemetry(rate, duration, vehicles=1):
+    port = free_udp_port()
+    window = gcs.PixhawkInterface(video_url='http://127.0.0.1:9/video_feed', lidar_ip='127.0.0.1:9')
+    window.show()
+    connection = mavutil.mavlink_connection(f'udpin:127.0.0.1:{port}')
+    reader = gcs.TelemetryReader(connection)
+    applied = []
+    reader.telemetry_updated.connect(window.update_data)
+    reader.telemetry_updated.connect(lambda telemetry: applied.append(time.perf_counter()))
+    reader.start()
+
+    stop = threading.Event()
+    sent = []
+    sender = threading.Thread(target=lambda: sent.append(mavlink_sender(port, rate, stop, vehicles)), daemon=True)
+    sender.start()
+    spin(duration)
+    stop.set()
+    sender.join()
+    spin(0.2)
+    reader.stop()
+    connection.close()
+
+    samples = []
+    telemetry = dict(reader.snapshot)
+    for i in range(500):
+        telemetry['airspeed'] = i % 40
+        telemetry['climb'] = (i % 20) - 10
+        telemetry['roll'] = (i % 90) - 45
+        start = time.perf_counter()
+        window.update_data(telemetry)
+        QApplication.processEvents()
+        samples.append(time.perf_counter() - start)
+
+    window.close()
+    return {
+        'messages_sent_per_s': sent[0] / duration,
+        'messages_received_per_s': reader.messages_received / duration,
+        'snapshots_applied_per_s': len(applied) / duration,
+        'vehicles': len(reader.vehicles),
+        'update_data': summarize(samples),
+    }
+
+
+# Ayrı bir yorumlayıcıda: modül yükleme, pencere kurulumu ve ilk çizime kadar geçen süre
+STARTUP_SCRIPT = r'''
+import time
+launched = time.time()
+started = time.perf_counter()
+import json, os, sys
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, sys.argv[1])
+from PyQt5.QtCore import QObject, QEvent, QTimer
+from PyQt5.QtWidgets import QApplication
+import arayüzson3 as gcs
+imported = time.perf_counter()
+app = QApplication(sys.argv[:1])
+window = gcs.PixhawkInterface(video_url='http://127.0.0.1:9/video_feed', lidar_ip='127.0.0.1:9')
+constructed = time.perf_counter()
+result = {}
+
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and not result:
+            result['painted_at'] = time.time()
+            result['first_paint_ms'] = (time.perf_counter() - constructed) * 1000
+            result['loaded'] = [name for name in json.loads(sys.argv[2]) if name in sys.modules]
+            QTimer.singleShot(0, app.quit)
+        return False
+
+
+paint_filter = FirstPaint()
+window.installEventFilter(paint_filter)
+window.show()
+app.exec_()
+result.update(launched=launched, import_ms=(imported - started) * 1000,
+              construct_ms=(constructed - imported) * 1000)
+print(json.dumps(result))
+sys.stdout.flush()
+# Arka planda başlayan bağlantıları bekleme
+os._exit(0)
+'''
+
+# İlk çizimden önce yüklenmemesi gereken modüller
+DEFERRED_MODULES = ['cv2', 'requests', 'pymavlink.mavutil', 'matplotlib']
+
+
+def bench_startup(runs, budget):
+    directory = os.path.dirname(os.path.abspath(__file__))
+    runs_data = []
+    for _ in range(runs):
+        start = time.time()
+        output = subprocess.check_output([sys.executable, '-c', STARTUP_SCRIPT, directory,
+                                          json.dumps(DEFERRED_MODULES)], timeout=60)
+        run = json.loads(output.decode().strip().splitlines()[-1])
+        run['total_ms'] = (run['painted_at'] - start) * 1000
+        runs_data.append(run)
+    totals = sorted(run['total_ms'] for run in runs_data)
+    loaded = sorted({name for run in runs_data for name in run['loaded']})
+    median = totals[len(totals) // 2]
+    return {
+        # İlk çalıştırma disk önbelleği soğukken en yakın ölçüm
+        'first_ms': runs_data[0]['total_ms'],
+        'median_ms': median,
+        'import_ms': sorted(run['import_ms'] for run in runs_data)[len(runs_data) // 2],
+        'construct_ms': sorted(run['construct_ms'] for run in runs_data)[len(runs_data) // 2],
+        'first_paint_ms': sorted(run['first_paint_ms'] for run in runs_data)[len(runs_data) // 2],
+        'loaded_before_paint': loaded,
+        'budget_ms': budget * 1000,
+        'within_budget': median <= budget * 1000 and not loaded,
+    }
+
+
+def git_version():
+    try:
+        return subprocess.check_output(['git', 'describe', '--always', '--dirty'],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--output', help='sonuçların yazılacağı JSON dosyası (varsayılan: stdout)')
+    parser.add_argument('--only', help='virgülle ayrılmış benchmark isimleri')
+    parser.add_argument('--duration', type=float, default=3.0, help='akış benchmarkları için süre (s)')
+    parser.add_argument('--iterations', type=int, default=300)
+    parser.add_argument('--startup-runs', type=int, default=5)
+    parser.add_argument('--startup-budget', type=float, default=1.5,
+                        help='ilk çizime kadar izin verilen süre (s); aşılırsa çıkış kodu 1')
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    frames_1080 = synthetic_jpegs(1920, 1080)
+    frames_720 = synthetic_jpegs(1280, 720)
+
+    benchmarks = {
+        'paint': lambda: bench_paint(app, args.iterations),
+        'mjpeg_parse': lambda: bench_mjpeg_parse(frames_1080),
+        'jpeg_decode': lambda: bench_jpeg_decode(frames_1080, (1320, 640)),
+        'video_stream': lambda: bench_video_stream(frames_720, 30, args.duration),
+        'video_stream_unthrottled': lambda: bench_video_stream(frames_720, 0, args.duration),
+        'lidar_poll': lambda: bench_lidar(3600, 0, args.duration),
+        'lidar_stream': lambda: bench_lidar(3600, 20, args.duration),
+        'telemetry': lambda: bench_telemetry(600, args.duration),
+        'telemetry_fleet': lambda: bench_telemetry(32 * 600, args.duration, vehicles=32),
+        'startup': lambda: bench_startup(args.startup_runs, args.startup_budget),
+    }
+    selected = args.only.split(',') if args.only else list(benchmarks)
+
+    results = {}
+    for name in selected:
+        print(f'running {name}...', file=sys.stderr)
+        results[name] = benchmarks[name]()
+
+    report = {
+        'version': git_version(),
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'qt': QT_VERSION_STR,
+        'opencv': cv2.__version__,
+        'cpu_count': os.cpu_count(),
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    if not results.get('startup', {}).get('within_budget', True):
+        print('startup budget exceeded', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
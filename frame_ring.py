@@ -0,0 +1,200 @@
+# Ayrı süreçte MJPEG okuma/çözme ve kareleri paylaşılan bellekteki halka tampona yazma.
+# Düzen: başlık (uint64 x 8) | slot bilgisi (uint64 x 4: seq, genişlik, yükseklik, -) |
+#        slot zamanları (float64 x 2: alındı, çözüldü) | slot pikselleri (uint8, en büyük kare kadar)
+# Yazan slotun seq'ini önce 0 yapar, pikselleri yazar, sonra seq'i ve başlıktaki son seq'i günceller.
+# Okuyan taraf slot seq'i beklenen değer değilse kareyi yırtık sayar ve atlar.
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+import requests
+
+from mjpeg import MjpegParser, jpeg_size, reduced_decode_flag, iter_raw_chunks
+
+LATEST, TARGET_WIDTH, TARGET_HEIGHT, RECEIVED, DECODED, DROPPED = range(6)
+HEADER_FIELDS = 8
+
+
+class SharedFrameRing:
+    def __init__(self, shm, slots, max_size):
+        self.shm = shm
+        self.slots = slots
+        self.max_width, self.max_height = max_size
+        frame_bytes = self.max_width * self.max_height * 3
+        offset = 0
+        self.header = np.ndarray((HEADER_FIELDS,), np.uint64, shm.buf, offset)
+        offset += HEADER_FIELDS * 8
+        self.meta = np.ndarray((slots, 4), np.uint64, shm.buf, offset)
+        offset += slots * 4 * 8
+        self.times = np.ndarray((slots, 2), np.float64, shm.buf, offset)
+        offset += slots * 2 * 8
+        self.pixels = np.ndarray((slots, frame_bytes), np.uint8, shm.buf, offset)
+
+    @staticmethod
+    def size(slots, max_size):
+        width, height = max_size
+        return HEADER_FIELDS * 8 + slots * (4 * 8 + 2 * 8 + width * height * 3)
+
+    @classmethod
+    def create(cls, slots, max_size):
+        shm = shared_memory.SharedMemory(create=True, size=cls.size(slots, max_size))
+        ring = cls(shm, slots, max_size)
+        ring.header[:] = 0
+        ring.meta[:] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, name, slots, max_size):
+        return cls(shared_memory.SharedMemory(name=name), slots, max_size)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def latest(self):
+        return int(self.header[LATEST])
+
+    def count(self, field):
+        self.header[field] += 1
+
+    def set_target_size(self, size):
+        width, height = size
+        self.header[TARGET_WIDTH] = min(width, self.max_width)
+        self.header[TARGET_HEIGHT] = min(height, self.max_height)
+
+    def target_size(self):
+        width, height = int(self.header[TARGET_WIDTH]), int(self.header[TARGET_HEIGHT])
+        if not width or not height:
+            return self.max_width, self.max_height
+        return width, height
+
+    def write(self, img, received_at, decoded_at):
+        seq = self.latest() + 1
+        slot = seq % self.slots
+        height, width = img.shape[:2]
+        meta = self.meta[slot]
+        meta[0] = 0
+        np.copyto(self.pixels[slot, :width * height * 3].reshape(height, width, 3), img)
+        self.times[slot] = (received_at, decoded_at)
+        meta[1] = width
+        meta[2] = height
+        meta[0] = seq
+        self.header[LATEST] = seq
+        self.header[DECODED] += 1
+
+    def read(self, seq):
+        # Dönen dizi paylaşılan belleğe bakar; yazan halkayı dolaşınca üzerine yazılır, kullandıktan
+        # sonra valid(seq) ile kontrol edilmeli
+        slot = seq % self.slots
+        meta = self.meta[slot]
+        if int(meta[0]) != seq:
+            return None, None
+        width, height = int(meta[1]), int(meta[2])
+        frame = self.pixels[slot, :width * height * 3].reshape(height, width, 3)
+        received_at, decoded_at = self.times[slot]
+        return frame, (float(received_at), float(decoded_at))
+
+    def valid(self, seq):
+        return int(self.meta[seq % self.slots][0]) == seq
+
+    def close(self):
+        self.header = self.meta = self.times = self.pixels = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # Arayüz hâlâ son kareyi tutuyor, eşleme referanslar bırakılınca kapanır
+            pass
+
+    def unlink(self):
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedFrameMailbox:
+    # FrameMailbox ile aynı arayüz; kareler süreç tarafından halkaya yazılır
+    def __init__(self, ring):
+        self.ring = ring
+        self.last_seq = 0
+        self.shown = 0
+
+    def has_new(self):
+        return self.ring.latest() != self.last_seq
+
+    def take(self):
+        seq = self.ring.latest()
+        if seq == self.last_seq:
+            return None, None
+        self.last_seq = seq
+        return self.ring.read(seq)
+
+    def valid(self):
+        # take()'ten dönen kare kopyalandıktan sonra çağrılır: yazan halkayı dolaşıp slotu ezdiyse
+        # (ya da boyut değiştirip yeniden yazdıysa) kopya yırtıktır ve gösterilmez
+        if self.ring.header is None or not self.ring.valid(self.last_seq):
+            return False
+        self.shown += 1
+        return True
+
+    def stats(self):
+        header = self.ring.header
+        if header is None:
+            return {'received': 0, 'decoded': 0, 'shown': self.shown, 'dropped': 0}
+        decoded = int(header[DECODED])
+        return {
+            'received': int(header[RECEIVED]),
+            'decoded': decoded,
+            'shown': self.shown,
+            # Çözülmeden atılanlar + ekran görmeden üzerine yazılanlar
+            'dropped': int(header[DROPPED]) + max(0, decoded - self.shown),
+        }
+
+
+def decode_frame(jpg, target_size, rgb):
+    flag = reduced_decode_flag(jpeg_size(jpg), target_size)
+    img = cv2.imdecode(np.frombuffer(jpg, dtype=np.uint8), flag)
+    if img is None:
+        return None
+    if (img.shape[1], img.shape[0]) != target_size:
+        interpolation = cv2.INTER_AREA if img.shape[1] > target_size[0] else cv2.INTER_LINEAR
+        img = cv2.resize(img, target_size, interpolation=interpolation)
+    if rgb:
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    return img
+
+
+def ingest_process(url, shm_name, slots, max_size, rgb, stop_event, chunk_size=64 * 1024):
+    # multiprocessing.Process hedefi: kendi GIL'inde okur, çözer ve halkaya yazar
+    ring = SharedFrameRing.attach(shm_name, slots, max_size)
+    try:
+        while not stop_event.is_set():
+            try:
+                with requests.get(url, stream=True, timeout=(3, 5)) as response:
+                    response.raise_for_status()
+                    parser = MjpegParser()
+                    for chunk in iter_raw_chunks(response, chunk_size):
+                        if stop_event.is_set():
+                            break
+                        received_at = time.perf_counter()
+                        latest = None
+                        for jpg in parser.feed(chunk):
+                            ring.count(RECEIVED)
+                            if latest is not None:
+                                ring.count(DROPPED)
+                            latest = bytes(jpg)
+                        if latest is None:
+                            continue
+                        img = decode_frame(latest, ring.target_size(), rgb)
+                        if img is None:
+                            ring.count(DROPPED)
+                            continue
+                        ring.write(img, received_at, time.perf_counter())
+            except requests.exceptions.RequestException as e:
+                print(f"Bağlantı hatası: {e}")
+                stop_event.wait(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ring.close()
@@ -0,0 +1,134 @@
+# Telemetri geçmişi: mesaj başına sabit kapasiteli, önceden ayrılmış NumPy halka tamponları
+# ve ekran çözünürlüğüne indirgeme (min/max, LTTB).
+import threading
+
+import numpy as np
+
+
+class HistoryRing:
+    # Her örnek iki kez yazılır (i ve i + capacity): son 'capacity' örnek her zaman bitişik bir
+    # dilimdir, pencere tek kopyayla alınır
+    def __init__(self, capacity, fields):
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self.columns = {name: i for i, name in enumerate(self.fields)}
+        self.times = np.zeros(2 * capacity)
+        self.values = np.zeros((2 * capacity, len(self.fields)), dtype=np.float32)
+        self.head = 0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def append(self, timestamp, values):
+        with self._lock:
+            i = self.head
+            self.times[i] = self.times[i + self.capacity] = timestamp
+            self.values[i] = self.values[i + self.capacity] = values
+            self.head = (i + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+
+    def _bounds(self):
+        end = self.head + self.capacity if self.count == self.capacity else self.head
+        return end - self.count, end
+
+    def view(self):
+        # Eskiden yeniye sıralı (zaman, değerler); append üzerine yazmasın diye kilit içinde kopyalanır
+        with self._lock:
+            start, end = self._bounds()
+            return self.times[start:end].copy(), self.values[start:end].copy()
+
+    def window(self, field, t0, t1):
+        # Arama ve kopya aynı kilit altında: sadece pencere kopyalanır
+        with self._lock:
+            start, end = self._bounds()
+            times = self.times[start:end]
+            i0, i1 = np.searchsorted(times, (t0, t1))
+            # Çizgi pencere kenarından başlasın diye bir önceki örnek de dahil
+            i0 = start + max(0, i0 - 1)
+            i1 = start + i1
+            return self.times[i0:i1].copy(), self.values[i0:i1, self.columns[field]].copy()
+
+    def span(self):
+        with self._lock:
+            if self.count < 2:
+                return 0.0
+            start, end = self._bounds()
+            return float(self.times[end - 1] - self.times[start])
+
+    def clear(self):
+        with self._lock:
+            self.head = 0
+            self.count = 0
+
+    def latest(self, field):
+        with self._lock:
+            if not self.count:
+                return None
+            return float(self.values[(self.head - 1) % self.capacity, self.columns[field]])
+
+
+class TelemetryHistory:
+    def __init__(self, fields, rates, seconds):
+        # fields: mesaj -> alan isimleri, rates: mesaj -> beklenen Hz
+        self.rings = {message: HistoryRing(max(1, int(rates.get(message, 1) * seconds)), names)
+                      for message, names in fields.items()}
+
+    def append(self, message, timestamp, sample):
+        ring = self.rings.get(message)
+        if ring is not None:
+            ring.append(timestamp, [sample[name] for name in ring.fields])
+
+    def clear(self):
+        for ring in self.rings.values():
+            ring.clear()
+
+    def ring(self, message):
+        return self.rings[message]
+
+    def nbytes(self):
+        return sum(ring.times.nbytes + ring.values.nbytes for ring in self.rings.values())
+
+
+def minmax_decimate(t, v, t0, t1, width):
+    # Piksel sütunu başına min ve max: kısa tepeler indirgemede kaybolmaz
+    if len(t) <= 4 * width or t1 <= t0:
+        return t, v
+    columns = ((t - t0) * (width / (t1 - t0))).astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, columns[1:] != columns[:-1]])
+    out_t = np.repeat(t[starts], 2)
+    out_v = np.empty(2 * len(starts), dtype=v.dtype)
+    out_v[0::2] = np.minimum.reduceat(v, starts)
+    out_v[1::2] = np.maximum.reduceat(v, starts)
+    return out_t, out_v
+
+
+def lttb(t, v, threshold):
+    # Largest-Triangle-Three-Buckets, vektörel biçim: her kovada, önceki ve sonraki kovanın
+    # ortalamalarıyla en büyük üçgeni kuran nokta seçilir. Klasik LTTB'deki "önceki seçilen nokta"
+    # yerine önceki kovanın ortalaması kullanıldığından Python döngüsü yoktur.
+    n = len(t)
+    if threshold >= n or threshold < 3:
+        return t, v
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    starts = edges[:-1]
+    counts = np.diff(edges)
+    bucket = np.repeat(np.arange(len(starts)), counts)
+    mean_t = np.add.reduceat(t[1:n - 1], starts - 1) / counts
+    mean_v = np.add.reduceat(v[1:n - 1].astype(np.float64), starts - 1) / counts
+    prev_t = np.r_[t[0], mean_t[:-1]][bucket]
+    prev_v = np.r_[v[0], mean_v[:-1]][bucket]
+    next_t = np.r_[mean_t[1:], t[-1]][bucket]
+    next_v = np.r_[mean_v[1:], v[-1]][bucket]
+    inner_t = t[1:n - 1]
+    inner_v = v[1:n - 1]
+    area = np.abs((prev_t - next_t) * (inner_v - prev_v) - (prev_t - inner_t) * (next_v - prev_v))
+    # Kova başına ilk en büyük alan
+    hits = np.flatnonzero(area == np.maximum.reduceat(area, starts - 1)[bucket])
+    first = hits[np.r_[True, bucket[hits][1:] != bucket[hits][:-1]]]
+    selected = np.r_[0, first + 1, n - 1]
+    return t[selected], v[selected]
+
+
+def decimate(t, v, t0, t1, width, mode='minmax'):
+    if mode == 'lttb':
+        return lttb(t, v, 2 * width)
+    return minmax_decimate(t, v, t0, t1, width)
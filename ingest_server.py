@@ -0,0 +1,279 @@
+# GUI'siz çalışmada son telemetri, lidar taraması ve JPEG karelerini uzak izleyicilere dağıtan
+# HTTP/WebSocket sunucusu. Kuyruk yok: her kanalda sadece en son değer tutulur. Her istemci kendi
+# hız sınırıyla en yeniyi alır; yavaş istemci ara değerleri atlar, bellekte birikme olmaz.
+# Döngü IoCore thread'inde çalışır, değerler ingest thread'lerinden publish_* ile gelir.
+#
+# İkili mesaj: başlık <BId (kanal, sıra no, zaman unix s) + içerik
+#   1 telemetri: <B sistem id + float32 x alan sayısı (alan sırası GET / ile, NaN = değer yok)
+#   2 lidar:     float32 mesafeler
+#   3 video:     kamera JPEG'i (olduğu gibi)
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+import threading
+import time
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+
+from io_core import IoCore
+
+TELEMETRY, LIDAR, VIDEO = 1, 2, 3
+CHANNELS = {'telemetry': TELEMETRY, 'lidar': LIDAR, 'video': VIDEO}
+HEADER = struct.Struct('<BId')
+DEFAULT_RATES = {TELEMETRY: 20.0, LIDAR: 10.0, VIDEO: 10.0}
+WEBSOCKET_GUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+# İstemciden sadece kontrol çerçeveleri beklenir, bunlar en fazla 125 bayt
+MAX_CLIENT_FRAME = 125
+CLOSE_PROTOCOL_ERROR = 1002
+CLOSE_TOO_BIG = 1009
+
+
+class LatestValueHub:
+    def __init__(self, loop, telemetry_fields):
+        self.loop = loop
+        self.telemetry_fields = tuple(telemetry_fields)
+        self._telemetry_struct = struct.Struct(f'<B{len(self.telemetry_fields)}f')
+        self._lock = threading.Lock()
+        self._seq = 0
+        # kanal -> (sıra no, zaman, içerik)
+        self.latest = {}
+        self.snapshot = None
+        self._waiters = set()
+        self._notify_scheduled = False
+
+    def publish(self, channel, payload, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+        with self._lock:
+            self._seq += 1
+            self.latest[channel] = (self._seq, timestamp, payload)
+            if self._notify_scheduled:
+                return
+            self._notify_scheduled = True
+        # Döngü uyanana kadar gelen yayınlar tek bildirimde birleşir
+        self.loop.call_soon_threadsafe(self._notify)
+
+    def _notify(self):
+        with self._lock:
+            self._notify_scheduled = False
+        for event in self._waiters:
+            event.set()
+
+    def publish_telemetry(self, telemetry):
+        self.snapshot = telemetry
+        values = [np.nan if telemetry.get(name) is None else telemetry[name] for name in self.telemetry_fields]
+        system_id = telemetry.get('system_id') or 0
+        self.publish(TELEMETRY, self._telemetry_struct.pack(system_id, *values))
+
+    def publish_lidar(self, scan):
+        self.publish(LIDAR, np.asarray(scan, dtype='<f4').tobytes())
+
+    def publish_video(self, jpg):
+        self.publish(VIDEO, bytes(jpg))
+
+    def subscribe(self):
+        event = asyncio.Event()
+        self._waiters.add(event)
+        return event
+
+    def unsubscribe(self, event):
+        self._waiters.discard(event)
+
+
+async def stream_latest(hub, channels, rates, send):
+    # Kanal başına: yeni değer varsa ve hız sınırı izin veriyorsa en yenisini gönder
+    loop = asyncio.get_running_loop()
+    intervals = {channel: 1.0 / rates[channel] if rates.get(channel) else 0.0 for channel in channels}
+    sent = {}
+    due = dict.fromkeys(channels, 0.0)
+    event = hub.subscribe()
+    try:
+        while True:
+            # Kontrolden önce temizlenir: kontrol sırasında gelen yayın kaçmaz
+            event.clear()
+            wait = None
+            for channel in channels:
+                item = hub.latest.get(channel)
+                if item is None or item[0] == sent.get(channel):
+                    continue
+                now = loop.time()
+                if now < due[channel]:
+                    wait = min(wait, due[channel] - now) if wait is not None else due[channel] - now
+                    continue
+                await send(channel, item)
+                sent[channel] = item[0]
+                due[channel] = now + intervals[channel]
+            try:
+                await asyncio.wait_for(event.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        hub.unsubscribe(event)
+
+
+def websocket_frame(payload, opcode=0x2):
+    length = len(payload)
+    if length < 126:
+        header = struct.pack('!BB', 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+    return header, payload
+
+
+class IngestServer:
+    # GET /                 kanal ve alan açıklaması (JSON)
+    # GET /telemetry        son telemetri (JSON)
+    # GET /lidar            son tarama (uint32 nokta sayısı + float32, lidar akışıyla aynı çerçeve)
+    # GET /video.jpg        son JPEG
+    # GET /video.mjpg       MJPEG akışı (?fps=)
+    # GET /ws               WebSocket ikili akış (?channels=telemetry,lidar,video&telemetry_fps=&lidar_fps=&video_fps=)
+    WRITE_TIMEOUT = 10.0
+
+    def __init__(self, host, port, telemetry_fields, io_core=None):
+        self.io_core = io_core or IoCore()
+        self.hub = LatestValueHub(self.io_core.loop, telemetry_fields)
+        self.clients = 0
+        self.server = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self.handle, host, port), self.io_core.loop).result()
+
+    async def handle(self, reader, writer):
+        self.clients += 1
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), 10)
+            request_line, *header_lines = request.decode('latin-1').split('\r\n')
+            method, target, _ = request_line.split(' ', 2)
+            headers = {}
+            for line in header_lines:
+                name, _, value = line.partition(':')
+                if name:
+                    headers[name.strip().lower()] = value.strip()
+            url = urlsplit(target)
+            query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            if method != 'GET':
+                await self.respond(writer, 405, b'')
+            elif url.path == '/ws' and headers.get('upgrade', '').lower() == 'websocket':
+                await self.websocket(reader, writer, headers, query)
+            elif url.path == '/video.mjpg':
+                await self.mjpeg(writer, query)
+            else:
+                await self.single(writer, url.path)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError, ValueError):
+            pass
+        finally:
+            self.clients -= 1
+            writer.close()
+
+    async def respond(self, writer, status, body, content_type='application/octet-stream'):
+        reason = {200: 'OK', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found',
+                  405: 'Method Not Allowed'}.get(status, '')
+        writer.write(f'HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n'
+                     f'Content-Length: {len(body)}\r\nCache-Control: no-store\r\nConnection: close\r\n\r\n'
+                     .encode('latin-1'))
+        writer.write(body)
+        await asyncio.wait_for(writer.drain(), self.WRITE_TIMEOUT)
+
+    async def single(self, writer, path):
+        hub = self.hub
+        if path == '/':
+            info = {
+                'channels': CHANNELS,
+                'header': HEADER.format,
+                'telemetry_fields': hub.telemetry_fields,
+                'clients': self.clients,
+            }
+            await self.respond(writer, 200, json.dumps(info).encode(), 'application/json')
+        elif path == '/telemetry':
+            if hub.snapshot is None:
+                await self.respond(writer, 204, b'')
+            else:
+                await self.respond(writer, 200, json.dumps(hub.snapshot).encode(), 'application/json')
+        elif path in ('/lidar', '/video.jpg'):
+            item = hub.latest.get(LIDAR if path == '/lidar' else VIDEO)
+            if item is None:
+                await self.respond(writer, 204, b'')
+            elif path == '/lidar':
+                await self.respond(writer, 200, struct.pack('<I', len(item[2]) // 4) + item[2])
+            else:
+                await self.respond(writer, 200, item[2], 'image/jpeg')
+        else:
+            await self.respond(writer, 404, b'')
+
+    async def mjpeg(self, writer, query):
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: multipart/x-mixed-replace; boundary=frame\r\n'
+                     b'Cache-Control: no-store\r\nConnection: close\r\n\r\n')
+
+        async def send(channel, item):
+            jpg = item[2]
+            writer.write(b'--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n' % len(jpg))
+            writer.write(jpg)
+            writer.write(b'\r\n')
+            await asyncio.wait_for(writer.drain(), self.WRITE_TIMEOUT)
+
+        rates = {VIDEO: float(query.get('fps', DEFAULT_RATES[VIDEO]))}
+        await stream_latest(self.hub, (VIDEO,), rates, send)
+
+    async def websocket(self, reader, writer, headers, query):
+        key = headers.get('sec-websocket-key')
+        if not key or headers.get('sec-websocket-version') != '13':
+            await self.respond(writer, 400, b'')
+            return
+        accept = base64.b64encode(hashlib.sha1(key.encode() + WEBSOCKET_GUID).digest())
+        writer.write(b'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n'
+                     b'Sec-WebSocket-Accept: ' + accept + b'\r\n\r\n')
+        names = query.get('channels', ','.join(CHANNELS)).split(',')
+        channels = tuple(CHANNELS[name] for name in names if name in CHANNELS)
+        rates = {CHANNELS[name]: float(query.get(f'{name}_fps', DEFAULT_RATES[CHANNELS[name]])) for name in CHANNELS}
+
+        async def send(channel, item):
+            seq, timestamp, payload = item
+            header, body = websocket_frame(HEADER.pack(channel, seq & 0xFFFFFFFF, timestamp) + payload)
+            writer.write(header)
+            writer.write(body)
+            await asyncio.wait_for(writer.drain(), self.WRITE_TIMEOUT)
+
+        sender = asyncio.ensure_future(stream_latest(self.hub, channels, rates, send))
+        try:
+            await self.websocket_reader(reader, writer, sender)
+        finally:
+            sender.cancel()
+
+    async def websocket_reader(self, reader, writer, sender):
+        # İstemciden sadece kontrol çerçeveleri beklenir: close ve ping
+        while not sender.done():
+            read = asyncio.ensure_future(reader.readexactly(2))
+            await asyncio.wait((read, sender), return_when=asyncio.FIRST_COMPLETED)
+            if not read.done():
+                # Gönderici bitti (yazma zaman aşımı / kopan bağlantı): hatası handle'a çıksın
+                read.cancel()
+                sender.result()
+                return
+            first, second = read.result()
+            opcode = first & 0x0F
+            # Uzunluk alanına güvenilmez: 125'ten büyük (126/127 uzatılmış uzunluk) okunmadan kapatılır
+            if second & 0x7F > MAX_CLIENT_FRAME:
+                await self.websocket_close(writer, CLOSE_TOO_BIG)
+                return
+            if opcode & 0x8 and not first & 0x80 or not second & 0x80:
+                # Parçalı kontrol çerçevesi ya da maskesiz istemci çerçevesi
+                await self.websocket_close(writer, CLOSE_PROTOCOL_ERROR)
+                return
+            mask = await reader.readexactly(4)
+            data = bytes(b ^ mask[i % 4] for i, b in enumerate(await reader.readexactly(second & 0x7F)))
+            if opcode == 0x8:
+                writer.write(b''.join(websocket_frame(data[:2], 0x8)))
+                return
+            if opcode == 0x9:
+                writer.write(b''.join(websocket_frame(data, 0xA)))
+
+    async def websocket_close(self, writer, code):
+        writer.write(b''.join(websocket_frame(struct.pack('!H', code), 0x8)))
+        await asyncio.wait_for(writer.drain(), self.WRITE_TIMEOUT)
+
+    def close(self):
+        self.io_core.loop.call_soon_threadsafe(self.server.close)
+        self.io_core.close()
@@ -0,0 +1,265 @@
+# Tek asyncio döngüsünde çalışan G/Ç çekirdeği: video, lidar ve ağ üzerinden MAVLink kaynakları
+# iptal edilebilir görevler olarak çalışır. Her kaynak bir denetçi altında yeniden bağlanır
+# (üstel geri çekilme) ve sağlık durumu tutar. Qt'ye bağımlı değil; sonuçlar kaynakların kendi
+# geri çağrılarıyla (arayüzde Qt sinyalleri) dağıtılır.
+import asyncio
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class Backoff:
+    def __init__(self, initial=0.5, maximum=30.0, factor=2.0, jitter=0.2):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+        self.attempt = 0
+
+    def next(self):
+        delay = min(self.maximum, self.initial * self.factor ** self.attempt)
+        self.attempt += 1
+        # Aynı anda kopan kaynaklar aynı anda yeniden denemesin
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def reset(self):
+        self.attempt = 0
+
+
+class SourceHealth:
+    # connecting -> up -> (hata) -> backoff -> connecting ...; görev iptal edilince stopped
+    def __init__(self, name):
+        self.name = name
+        self.state = 'idle'
+        self.since = time.monotonic()
+        self.reconnects = 0
+        self.last_error = None
+        self.last_data = None
+        self.retry_at = None
+
+    def set(self, state, error=None, retry_at=None):
+        if state != self.state:
+            self.since = time.monotonic()
+        self.state = state
+        self.retry_at = retry_at
+        if error is not None:
+            self.last_error = error
+
+    def data(self):
+        self.last_data = time.monotonic()
+        if self.state != 'up':
+            self.set('up')
+
+    def snapshot(self):
+        now = time.monotonic()
+        return {
+            'state': self.state,
+            'for': now - self.since,
+            'reconnects': self.reconnects,
+            'error': self.last_error,
+            'data_age': None if self.last_data is None else now - self.last_data,
+            'retry_in': None if self.retry_at is None else max(0.0, self.retry_at - now),
+        }
+
+
+class IoCore:
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.health = {}
+        self.thread = threading.Thread(target=self._run, name='io-core', daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def start_source(self, name, session, backoff=None):
+        # session(health): bağlanır, veri akarken döner; dönerse veya hata verirse yeniden bağlanılır.
+        # Dönen concurrent.futures.Future'ın cancel()'ı her thread'den görevi iptal eder.
+        health = SourceHealth(name)
+        self.health[name] = health
+        return asyncio.run_coroutine_threadsafe(self.supervise(session, health, backoff or Backoff()), self.loop)
+
+    async def supervise(self, session, health, backoff):
+        try:
+            while True:
+                health.set('connecting')
+                try:
+                    await session(health)
+                    error = 'closed'
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    error = f'{type(e).__name__}: {e}'
+                if health.state == 'up':
+                    # Veri gelmişti, bağlantı sağlamdı: geri çekilme baştan
+                    backoff.reset()
+                delay = backoff.next()
+                health.reconnects += 1
+                health.set('backoff', error, time.monotonic() + delay)
+                await asyncio.sleep(delay)
+        finally:
+            health.set('stopped')
+            if self.health.get(health.name) is health:
+                del self.health[health.name]
+
+    def health_snapshot(self):
+        return {name: health.snapshot() for name, health in list(self.health.items())}
+
+    def close(self):
+        def cancel_all():
+            for task in asyncio.all_tasks(self.loop):
+                task.cancel()
+            self.loop.call_soon(self.loop.stop)
+        self.loop.call_soon_threadsafe(cancel_all)
+        self.thread.join(1.0)
+
+
+class HttpError(IOError):
+    pass
+
+
+class HttpResponse:
+    def __init__(self, reader, writer, status, headers, read_timeout):
+        self.reader = reader
+        self.writer = writer
+        self.status = status
+        self.headers = headers
+        self.read_timeout = read_timeout
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise HttpError(f'HTTP {self.status}')
+
+    async def chunks(self, size=64 * 1024):
+        # Gövdeyi geldiği kadar verir; chunked kodlama çözülür (MJPEG sunucuları sıkça kullanır)
+        reader, timeout = self.reader, self.read_timeout
+        if self.headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                line = await asyncio.wait_for(reader.readline(), timeout)
+                if not line:
+                    return
+                length = int(line.split(b';', 1)[0].strip() or b'0', 16)
+                if length == 0:
+                    return
+                data = await asyncio.wait_for(reader.readexactly(length + 2), timeout)
+                yield memoryview(data)[:length]
+        else:
+            remaining = self.headers.get('content-length')
+            remaining = int(remaining) if remaining is not None else None
+            while remaining is None or remaining > 0:
+                data = await asyncio.wait_for(reader.read(size if remaining is None else min(size, remaining)), timeout)
+                if not data:
+                    return
+                if remaining is not None:
+                    remaining -= len(data)
+                yield data
+
+    async def read(self, limit=64 * 1024 * 1024):
+        body = bytearray()
+        async for chunk in self.chunks():
+            body += chunk
+            if len(body) > limit:
+                raise HttpError('response too large')
+        return bytes(body)
+
+    def close(self):
+        self.writer.close()
+
+
+async def http_get(url, headers=None, timeout=(3, 5)):
+    # Tek istekli, bağlantısı kapanan küçük HTTP/1.1 istemcisi (requests'in asyncio karşılığı yok)
+    parts = urlsplit(url)
+    connect_timeout, read_timeout = timeout
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(parts.hostname, parts.port or 80),
+                                            connect_timeout)
+    try:
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        lines = [f'GET {path} HTTP/1.1', f'Host: {parts.netloc}', 'Connection: close', 'Accept-Encoding: identity']
+        lines += [f'{name}: {value}' for name, value in (headers or {}).items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        status_line = await asyncio.wait_for(reader.readline(), read_timeout)
+        fields = status_line.split(None, 2)
+        if len(fields) < 2 or not fields[0].startswith(b'HTTP/'):
+            raise HttpError(f'bad status line {status_line[:40]!r}')
+        response_headers = {}
+        while True:
+            line = await asyncio.wait_for(reader.readline(), read_timeout)
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+        return HttpResponse(reader, writer, int(fields[1]), response_headers, read_timeout)
+    except BaseException:
+        writer.close()
+        raise
+
+
+class _DatagramQueue(asyncio.DatagramProtocol):
+    def __init__(self, queue):
+        self.queue = queue
+        self.peer = None
+
+    def datagram_received(self, data, addr):
+        self.peer = addr
+        self.queue.put_nowait(data)
+
+    def error_received(self, exc):
+        self.queue.put_nowait(exc)
+
+
+class PacketStream:
+    # UDP ya da TCP üzerinden bayt akışı; read zaman aşımında None döner
+    def __init__(self, transport=None, protocol=None, queue=None, reader=None, writer=None, connected=False):
+        self.transport = transport
+        self.protocol = protocol
+        self.queue = queue
+        self.reader = reader
+        self.writer = writer
+        self.connected = connected
+
+    async def read(self, timeout):
+        try:
+            if self.reader is not None:
+                data = await asyncio.wait_for(self.reader.read(64 * 1024), timeout)
+                if not data:
+                    raise ConnectionError('connection closed')
+                return data
+            data = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if isinstance(data, Exception):
+            raise data
+        return data
+
+    def write(self, data):
+        if self.writer is not None:
+            self.writer.write(data)
+        elif self.connected:
+            self.transport.sendto(bytes(data))
+        elif self.protocol.peer is not None:
+            # udpin: cevap son paketin geldiği adrese gider
+            self.transport.sendto(bytes(data), self.protocol.peer)
+
+    def close(self):
+        (self.writer or self.transport).close()
+
+
+async def open_packet_stream(address, connect_timeout=3.0):
+    # mavutil adres biçimi: udpin:host:port (udp: aynı), udpout:host:port, tcp:host:port
+    scheme, host, port = address.split(':')
+    port = int(port)
+    loop = asyncio.get_running_loop()
+    if scheme == 'tcp':
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), connect_timeout)
+        return PacketStream(reader=reader, writer=writer)
+    queue = asyncio.Queue()
+    if scheme == 'udpout':
+        transport, protocol = await loop.create_datagram_endpoint(lambda: _DatagramQueue(queue),
+                                                                  remote_addr=(host, port))
+        return PacketStream(transport, protocol, queue, connected=True)
+    transport, protocol = await loop.create_datagram_endpoint(lambda: _DatagramQueue(queue), local_addr=(host, port))
+    return PacketStream(transport, protocol, queue)
@@ -0,0 +1,246 @@
+# Araç bağlantısından okunan ham MAVLink çerçevelerini yerel istemcilere (ikinci yer istasyonu,
+# kayıt aracı) bayt bayt dağıtan yönlendirici. Çerçeveler çözülüp yeniden kodlanmaz: okuyucunun
+# zaten elindeki tampon her istemcinin kuyruğuna kopyalanmadan eklenir. Gönderme tek bir
+# yönlendirici thread'inde, engellemeyen soketlerle yapılır; kuyruklar sınırlı ve dolunca en eski
+# çerçeve atılır, yavaş istemci ne arayüzü ne diğer istemcileri bekletir.
+# İstemcilerden gelen baytlar (komutlar, parametre istekleri) uplink kuyruğuna alınır; araca
+# yazmayı okuyucu thread'i yapar (seri porta tek thread yazsın).
+import collections
+import selectors
+import socket
+import threading
+from functools import partial
+
+
+class RouterClient:
+    def __init__(self, name, sock, address=None, queue_size=256):
+        self.name = name
+        self.sock = sock
+        # UDP: hedef adres; TCP: None (bağlı soket)
+        self.address = address
+        self.queue = collections.deque()
+        self.queue_size = queue_size
+        self.in_flight = None
+        self.sent = 0
+        self.dropped = 0
+        self.waiting_write = False
+
+    def push(self, frame):
+        if len(self.queue) >= self.queue_size:
+            # En eski atılır: istemciye en taze durum gitsin
+            try:
+                self.queue.popleft()
+                self.dropped += 1
+            except IndexError:
+                # Yönlendirici thread'i arada boşalttı
+                pass
+        self.queue.append(frame)
+
+    def flush(self):
+        # Soket kabul ettiği kadar gönderir; kalan varsa True
+        sock = self.sock
+        while True:
+            if self.in_flight is None:
+                try:
+                    self.in_flight = memoryview(self.queue.popleft())
+                except IndexError:
+                    return False
+            try:
+                if self.address is None:
+                    sent = sock.send(self.in_flight)
+                else:
+                    sent = sock.sendto(self.in_flight, self.address)
+            except BlockingIOError:
+                return True
+            except OSError:
+                # UDP'de karşı taraf yoksa (ICMP) çerçeve kaybolur, TCP'de istemci düşer
+                if self.address is None:
+                    raise
+                sent = len(self.in_flight)
+            if sent < len(self.in_flight):
+                self.in_flight = self.in_flight[sent:]
+                return True
+            self.in_flight = None
+            self.sent += 1
+
+
+class MavlinkRouter:
+    # Uç noktalar: udpout:host:port (istemciye gönder), udpin:host:port (gelen her adrese gönder),
+    # tcpin:host:port (bağlanan her TCP istemcisine gönder)
+    QUEUE_SIZE = 256
+    UPLINK_SIZE = 1024
+
+    def __init__(self, endpoints, queue_size=None):
+        self.queue_size = queue_size or self.QUEUE_SIZE
+        self.selector = selectors.DefaultSelector()
+        self.clients = []
+        self._clients_lock = threading.Lock()
+        self.uplink = collections.deque(maxlen=self.UPLINK_SIZE)
+        self._pending = False
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._wake_reader.setblocking(False)
+        self._wake_writer.setblocking(False)
+        self.selector.register(self._wake_reader, selectors.EVENT_READ, self._drain_wake)
+        for endpoint in endpoints:
+            self.open(endpoint)
+        self._run_flag = True
+        self.thread = threading.Thread(target=self.run, name='mavlink-router', daemon=True)
+        self.thread.start()
+
+    def open(self, endpoint):
+        scheme, host, port = endpoint.split(':')
+        address = (host, int(port))
+        if scheme == 'udpout':
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setblocking(False)
+            client = RouterClient(endpoint, sock, address, self.queue_size)
+            self.add_client(client)
+            self.selector.register(sock, selectors.EVENT_READ, partial(self._read_udp, sock, None))
+        elif scheme == 'udpin':
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind(address)
+            sock.setblocking(False)
+            # İstemciler ilk paketlerini gönderince öğrenilir
+            self.selector.register(sock, selectors.EVENT_READ, partial(self._read_udp, sock, endpoint))
+        elif scheme == 'tcpin':
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind(address)
+            sock.listen()
+            sock.setblocking(False)
+            self.selector.register(sock, selectors.EVENT_READ, partial(self._accept, sock))
+        else:
+            raise ValueError(f'unsupported forward endpoint: {endpoint}')
+
+    def add_client(self, client):
+        with self._clients_lock:
+            self.clients = self.clients + [client]
+
+    def remove_client(self, client):
+        with self._clients_lock:
+            self.clients = [other for other in self.clients if other is not client]
+        try:
+            self.selector.unregister(client.sock)
+        except (KeyError, ValueError):
+            pass
+        client.sock.close()
+
+    def drop_socket(self, sock):
+        for client in self.clients:
+            if client.sock is sock:
+                self.remove_client(client)
+        try:
+            self.selector.unregister(sock)
+        except (KeyError, ValueError):
+            pass
+        sock.close()
+
+    def forward(self, frame):
+        # Okuyucu thread'inden: tampon tüm kuyruklara aynı nesne olarak girer
+        for client in self.clients:
+            client.push(frame)
+        self._pending = True
+
+    def kick(self):
+        # Okuyucu bir grup mesajı işledikten sonra bir kez: yönlendirici thread'ini uyandır
+        if self._pending:
+            self._pending = False
+            try:
+                self._wake_writer.send(b'\0')
+            except BlockingIOError:
+                pass
+
+    def take_uplink(self):
+        data = []
+        while True:
+            try:
+                data.append(self.uplink.popleft())
+            except IndexError:
+                return data
+
+    def run(self):
+        while self._run_flag:
+            for key, mask in self.selector.select(timeout=0.5):
+                if not self._run_flag:
+                    break
+                try:
+                    key.data(mask)
+                except OSError:
+                    # Bozulan soket sadece kendi istemcilerini düşürür, yönlendirici çalışmaya devam eder
+                    self.drop_socket(key.fileobj)
+            self.flush()
+
+    def flush(self):
+        for client in self.clients:
+            try:
+                waiting = client.flush()
+            except OSError:
+                self.remove_client(client)
+                continue
+            if waiting != client.waiting_write and client.address is None:
+                # TCP istemcisi tamponu dolu: yazılabilir olunca tekrar dene
+                client.waiting_write = waiting
+                events = selectors.EVENT_READ | (selectors.EVENT_WRITE if waiting else 0)
+                self.selector.modify(client.sock, events, self.selector.get_key(client.sock).data)
+
+    def _drain_wake(self, mask):
+        try:
+            while self._wake_reader.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _read_udp(self, sock, endpoint, mask):
+        while True:
+            try:
+                data, address = sock.recvfrom(65536)
+            except (BlockingIOError, ConnectionRefusedError, ConnectionResetError):
+                # Windows'ta dinlemeyen udpout hedefinin ICMP yanıtı recvfrom'da WSAECONNRESET olarak döner
+                return
+            if endpoint is not None and not any(client.sock is sock and client.address == address
+                                                for client in self.clients):
+                self.add_client(RouterClient(f'{endpoint} {address[0]}:{address[1]}', sock, address,
+                                             self.queue_size))
+            self.uplink.append(data)
+
+    def _accept(self, server, mask):
+        try:
+            sock, address = server.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        client = RouterClient(f'tcp {address[0]}:{address[1]}', sock, None, self.queue_size)
+        self.add_client(client)
+        self.selector.register(sock, selectors.EVENT_READ, partial(self._read_tcp, client))
+
+    def _read_tcp(self, client, mask):
+        if mask & selectors.EVENT_READ:
+            try:
+                data = client.sock.recv(65536)
+            except BlockingIOError:
+                data = None
+            except OSError:
+                data = b''
+            if data == b'':
+                self.remove_client(client)
+                return
+            if data:
+                self.uplink.append(data)
+
+    def stats(self):
+        return {client.name: {'sent': client.sent, 'dropped': client.dropped, 'queued': len(client.queue)}
+                for client in self.clients}
+
+    def close(self):
+        self._run_flag = False
+        try:
+            self._wake_writer.send(b'\0')
+        except OSError:
+            pass
+        self.thread.join(1.0)
+        for key in list(self.selector.get_map().values()):
+            key.fileobj.close()
+        self.selector.close()
+        self._wake_writer.close()
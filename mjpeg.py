@@ -0,0 +1,155 @@
+# MJPEG (multipart/x-mixed-replace) akışını karelere ayırma ve JPEG boyut yardımcıları.
+# Qt'ye bağımlı değil; hem arayüz hem ayrı video süreci kullanır.
+# cv2 ilk çözmede yüklenir, arayüz açılışını yavaşlatmaz.
+import socket
+
+
+def jpeg_size(jpg):
+    # SOF başlığından (genişlik, yükseklik) oku, görüntüyü çözmeden
+    i = 2
+    n = len(jpg)
+    while i + 9 < n:
+        if jpg[i] != 0xFF:
+            return None
+        marker = jpg[i + 1]
+        if marker == 0xFF:
+            i += 1
+            continue
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height = (jpg[i + 5] << 8) | jpg[i + 6]
+            width = (jpg[i + 7] << 8) | jpg[i + 8]
+            return width, height
+        i += 2 + ((jpg[i + 2] << 8) | jpg[i + 3])
+    return None
+
+
+def reduced_decode_flag(size, target_size):
+    # libjpeg 1/2, 1/4, 1/8 ölçekli çözme: hedeften küçük olmayan en düşük çözünürlük
+    import cv2
+    if size is None or target_size is None:
+        return cv2.IMREAD_COLOR
+    width, height = size
+    target_width, target_height = target_size
+    for factor, flag in ((8, cv2.IMREAD_REDUCED_COLOR_8),
+                         (4, cv2.IMREAD_REDUCED_COLOR_4),
+                         (2, cv2.IMREAD_REDUCED_COLOR_2)):
+        if width // factor >= target_width and height // factor >= target_height:
+            return flag
+    return cv2.IMREAD_COLOR
+
+
+class MjpegParser:
+    SOI = b'\xff\xd8'
+    EOI = b'\xff\xd9'
+    HEADER_WINDOW = 1024
+
+    def __init__(self, max_buffer=8 * 1024 * 1024):
+        self.buffer = bytearray()
+        self.max_buffer = max_buffer
+        self.overflows = 0
+        self._pos = 0            # tüketilmiş verinin sonu
+        self._scan = 0           # aramaya devam edilecek konum
+        self._frame_start = -1
+        self._frame_len = None
+
+    def feed(self, chunk):
+        # Dönen memoryview sadece bir sonraki iterasyona kadar geçerlidir
+        self._extend(chunk)
+        buf = self.buffer
+        while True:
+            if self._frame_start < 0:
+                soi = buf.find(self.SOI, self._scan)
+                if soi < 0:
+                    self._scan = max(self._pos, len(buf) - 1)
+                    break
+                self._frame_start = soi
+                self._frame_len = self._content_length(soi)
+                self._scan = soi + 2
+
+            if self._frame_len is not None:
+                end = self._frame_start + self._frame_len
+                if len(buf) < end:
+                    break
+                if buf[end - 2:end] != self.EOI:
+                    # Content-Length hatalı, işaretçi aramaya geç
+                    self._frame_len = None
+                    continue
+            else:
+                eoi = buf.find(self.EOI, self._scan)
+                if eoi < 0:
+                    self._scan = max(self._scan, len(buf) - 1)
+                    break
+                end = eoi + 2
+
+            view = memoryview(buf)[self._frame_start:end]
+            self._pos = self._scan = end
+            self._frame_start = -1
+            self._frame_len = None
+            yield view
+            try:
+                view.release()
+            except BufferError:
+                pass
+        self._compact()
+
+    def _content_length(self, soi):
+        header = bytes(self.buffer[max(self._pos, soi - self.HEADER_WINDOW):soi]).lower()
+        i = header.rfind(b'content-length:')
+        if i < 0:
+            return None
+        value = header[i + 15:].split(b'\r\n', 1)[0].strip()
+        try:
+            return int(value)
+        except ValueError:
+            return None
+
+    def _extend(self, chunk):
+        try:
+            self.buffer += chunk
+        except BufferError:
+            # Bir kare hâlâ dışarıda tutuluyor, yeni tampona geç
+            self.buffer = bytearray(self.buffer)
+            self.buffer += chunk
+
+    def _compact(self):
+        pos = self._pos
+        if len(self.buffer) - pos > self.max_buffer:
+            # EOI hiç gelmedi, yarım kareyi at
+            self.overflows += 1
+            pos = len(self.buffer)
+            self._frame_start = -1
+            self._frame_len = None
+        if pos == 0:
+            return
+        try:
+            del self.buffer[:pos]
+        except BufferError:
+            self.buffer = bytearray(self.buffer[pos:])
+        self._pos = 0
+        self._scan = max(0, self._scan - pos)
+        if self._frame_start >= 0:
+            self._frame_start -= pos
+
+
+def iter_raw_chunks(response, chunk_size):
+    # read1 eldeki veriyi beklemeden döndürür, büyük chunk gecikme eklemez
+    read1 = getattr(response.raw, 'read1', None)
+    if read1 is not None:
+        return iter(lambda: read1(chunk_size), b'')
+    return response.iter_content(chunk_size=chunk_size)
+
+
+def abort_response(response):
+    # Başka thread'de recv içinde bloklanmış okumayı hemen bitir. response.close() okuyan thread'in
+    # tampon kilidini bekler, onun yerine soket shutdown edilir; yanıtı okuyan thread kapatır.
+    raw = getattr(response, 'raw', None)
+    sock = getattr(getattr(raw, 'connection', None), 'sock', None)
+    if sock is None:
+        # http.client bağlantı kapanacaksa soketi yanıta devreder: fp (BufferedReader) -> SocketIO
+        socket_io = getattr(getattr(getattr(raw, '_fp', None), 'fp', None), 'raw', None)
+        sock = getattr(socket_io, '_sock', None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
@@ -0,0 +1,65 @@
+# Taramalar boyunca biriken 2B lidar doluluk ızgarası.
+# Bozunma ızgarayı her taramada çarparak değil, yeni vuruşların ağırlığını zamanla büyüterek yapılır
+# (ağırlık = 2 ^ (t / yarı ömür)); böylece tarama maliyeti ızgara boyutuna değil nokta sayısına bağlıdır.
+import time
+
+import numpy as np
+
+
+class OccupancyGrid:
+    # Ağırlık bu değeri geçince ızgara bir kez yeniden ölçeklenir (float32 taşmasın)
+    RENORMALIZE = 1e6
+    # Bu kadar güncel vuruş alan hücre tam parlaklıkta gösterilir
+    SATURATION = 4.0
+
+    def __init__(self, size=256, max_range=10.0, half_life=3.0):
+        self.size = size
+        self.max_range = float(max_range)
+        self.cell = 2 * self.max_range / size
+        self.half_life = half_life
+        self.grid = np.zeros((size, size), dtype=np.float32)
+        self.flat = self.grid.reshape(-1)
+        self.pixels = np.zeros((size, size), dtype=np.uint8)
+        self._scaled = np.empty_like(self.grid)
+        self._origin = time.monotonic()
+        self.version = 0
+
+    def weight(self, now):
+        weight = 2.0 ** ((now - self._origin) / self.half_life)
+        if weight > self.RENORMALIZE:
+            self.grid /= weight
+            self._origin = now
+            weight = 1.0
+        return weight
+
+    def add_scan(self, ranges, cos_a, sin_a, yaw=0.0, now=None):
+        # yaw (radyan, saat yönünde): verilirse tarama araç yönünden dünya eksenine döndürülür
+        if now is None:
+            now = time.monotonic()
+        valid = np.isfinite(ranges) & (ranges > 0) & (ranges < self.max_range)
+        r = ranges[valid]
+        c = cos_a[valid]
+        s = sin_a[valid]
+        if yaw:
+            cos_y, sin_y = np.cos(yaw), np.sin(yaw)
+            c, s = c * cos_y + s * sin_y, s * cos_y - c * sin_y
+        last = self.size - 1
+        cols = np.clip(((r * c + self.max_range) / self.cell).astype(np.intp), 0, last)
+        rows = np.clip(((self.max_range - r * s) / self.cell).astype(np.intp), 0, last)
+        np.add.at(self.flat, rows * self.size + cols, self.weight(now))
+        self.version += 1
+
+    def render(self, now=None):
+        # 0-255 yoğunluk, QImage için hazır tampon (self.pixels) döner
+        if now is None:
+            now = time.monotonic()
+        scale = 255.0 / (self.SATURATION * self.weight(now))
+        np.multiply(self.grid, scale, out=self._scaled)
+        np.minimum(self._scaled, 255, out=self._scaled)
+        np.copyto(self.pixels, self._scaled, casting='unsafe')
+        return self.pixels
+
+    def clear(self):
+        self.grid[:] = 0
+        self._origin = time.monotonic()
+        self.version += 1
@@ -0,0 +1,448 @@
+# Kayıt formatı: her akış (mavlink, video, lidar) için bir klasörde iki dosya
+#   <akış>.dat  ham veriler arka arkaya eklenir (MAVLink mesaj buffer'ı, JPEG, float32 tarama)
+#   <akış>.idx  her kayıt için sabit boyutlu satır: zaman (float64, unix s), offset (uint64), uzunluk (uint32)
+#   <akış>.sync mavlink dışındaki akışlarda .idx ile aynı satırlar: o ana kadar gelen son MAVLink
+#               kaydının zamanı (float64) ve .idx satır numarası (uint64); MAVLink yoksa NaN / NO_ROW
+# Dosyalar sadece sona eklenir; okuma tarafı mmap kullanır ve zamana göre ikili arama yapar.
+import os
+import collections
+import mmap
+import struct
+import threading
+import time
+
+INDEX_FORMAT = '<dQI'
+INDEX_SIZE = struct.calcsize(INDEX_FORMAT)
+SYNC_FORMAT = '<dQ'
+SYNC_SIZE = struct.calcsize(SYNC_FORMAT)
+NO_ROW = (1 << 64) - 1
+SYNC_REFERENCE = 'mavlink'
+
+
+def _map(path):
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _covered_rows(index, data_size):
+    # .dat'ın tamamen kapsadığı .idx satırı sayısı. Satırlar sırayla eklendiği için bitiş offset'leri
+    # artar; çökmede veri tamponu yazılmadan kalan satırlar ve yarım son satır sayılmaz
+    if index is None or not data_size:
+        return 0
+    lo, hi = 0, len(index) // INDEX_SIZE
+    while lo < hi:
+        mid = (lo + hi) // 2
+        _, offset, length = struct.unpack_from(INDEX_FORMAT, index, mid * INDEX_SIZE)
+        if offset + length <= data_size:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _recorded_rows(directory, name):
+    # Akışın geçerli satır sayısı (dosyalara dokunmaz)
+    data_path = os.path.join(directory, f'{name}.dat')
+    index_path = os.path.join(directory, f'{name}.idx')
+    if not os.path.exists(index_path):
+        return 0
+    data_size = os.path.getsize(data_path) if os.path.exists(data_path) else 0
+    index = _map(index_path)
+    try:
+        return _covered_rows(index, data_size)
+    finally:
+        if index is not None:
+            index.close()
+
+
+class StreamWriter:
+    # Büyük tamponlu, O_APPEND ('ab') dosyalar: JPEG başına sistem çağrısı yok
+    BUFFER_SIZE = 1 << 20
+
+    def __init__(self, directory, name, sync=False):
+        self.name = name
+        # Önceki oturum yarıda kaldıysa .idx (ve .sync) geçerli satırlara kırpılır: yeni satırlar hizalı eklensin
+        rows = _recorded_rows(directory, name)
+        for ext, size in (('idx', INDEX_SIZE), ('sync', SYNC_SIZE)):
+            path = os.path.join(directory, f'{name}.{ext}')
+            if os.path.exists(path) and os.path.getsize(path) > rows * size:
+                os.truncate(path, rows * size)
+        self.data = open(os.path.join(directory, f'{name}.dat'), 'ab', buffering=self.BUFFER_SIZE)
+        self.index = open(os.path.join(directory, f'{name}.idx'), 'ab', buffering=64 * 1024)
+        self.offset = self.data.tell()
+        self.count = self.index.tell() // INDEX_SIZE
+        self.sync = None
+        if sync:
+            self.sync = open(os.path.join(directory, f'{name}.sync'), 'ab', buffering=64 * 1024)
+            # Eşleme dosyası olmadan kaydedilmiş satırlar varsa hizala
+            missing = self.count - self.sync.tell() // SYNC_SIZE
+            if missing > 0:
+                self.sync.write(struct.pack(SYNC_FORMAT, float('nan'), NO_ROW) * missing)
+        self.lock = threading.Lock()
+
+    def write(self, payload, timestamp, sync=None):
+        with self.lock:
+            length = len(payload)
+            self.data.write(payload)
+            self.index.write(struct.pack(INDEX_FORMAT, timestamp, self.offset, length))
+            if self.sync is not None:
+                self.sync.write(struct.pack(SYNC_FORMAT, *sync))
+            self.offset += length
+            self.count += 1
+
+    def files(self):
+        return [f for f in (self.data, self.index, self.sync) if f is not None]
+
+    def flush(self):
+        with self.lock:
+            for f in self.files():
+                f.flush()
+
+    def close(self):
+        with self.lock:
+            for f in self.files():
+                f.close()
+
+
+class Recorder:
+    # Diske yazma arka plan thread'inde: çağıran (video/lidar/MAVLink okuyucu) sadece kuyruğa ekler.
+    # Kuyruk bayt olarak sınırlı; disk yetişemezse yeni kayıtlar atılır ve akış başına sayılır.
+    MAX_QUEUED_BYTES = 128 << 20
+    FLUSH_INTERVAL = 1.0
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.streams = {}
+        self.dropped = {}
+        self._lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._queue = collections.deque()
+        self._queued_bytes = 0
+        self._busy = False
+        self._closed = False
+        # Son kabul edilen MAVLink kaydı (zaman, satır): diğer akışların .sync satırı
+        self._reference = (float('nan'), NO_ROW)
+        self._rows = {}
+        self.thread = threading.Thread(target=self._run, name='recorder', daemon=True)
+        self.thread.start()
+
+    def stream(self, name):
+        writer = self.streams.get(name)
+        if writer is None:
+            with self._lock:
+                writer = self.streams.get(name)
+                if writer is None:
+                    writer = StreamWriter(self.directory, name, sync=name != SYNC_REFERENCE)
+                    self.streams[name] = writer
+        return writer
+
+    def _existing_rows(self, name):
+        writer = self.streams.get(name)
+        if writer is not None:
+            return writer.count
+        # Yazıcı açılınca dosyaları bu satır sayısına kırpar
+        return _recorded_rows(self.directory, name)
+
+    def write(self, name, payload, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+        # Çağıranın tamponu (MJPEG ayrıştırıcı) yeniden kullanılır, kuyruğa kopyası girer
+        payload = bytes(payload)
+        with self._cond:
+            if self._closed:
+                return
+            if self._queued_bytes + len(payload) > self.MAX_QUEUED_BYTES:
+                self.dropped[name] = self.dropped.get(name, 0) + 1
+                return
+            row = self._rows.get(name)
+            if row is None:
+                # Dosyalar yazıcı thread'inde açılır; burada sadece mevcut satır sayısına bakılır
+                row = self._existing_rows(name)
+            self._rows[name] = row + 1
+            if name == SYNC_REFERENCE:
+                self._reference = (timestamp, row)
+                sync = None
+            else:
+                sync = self._reference
+            self._queue.append((name, payload, timestamp, sync))
+            self._queued_bytes += len(payload)
+            self._cond.notify()
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait(self.FLUSH_INTERVAL)
+                    if time.monotonic() - last_flush >= self.FLUSH_INTERVAL:
+                        break
+                batch, self._queue = self._queue, collections.deque()
+                self._busy = True
+                closed = self._closed
+            for name, payload, timestamp, sync in batch:
+                self.stream(name).write(payload, timestamp, sync)
+                # Yazılana kadar sınırdan düşülmez: bellekte en fazla MAX_QUEUED_BYTES
+                with self._cond:
+                    self._queued_bytes -= len(payload)
+            now = time.monotonic()
+            if now - last_flush >= self.FLUSH_INTERVAL:
+                # Çökmede en fazla bir saniyelik kayıt kaybolsun
+                self._flush_streams()
+                last_flush = now
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+            if closed and not batch:
+                return
+
+    def _flush_streams(self):
+        for writer in list(self.streams.values()):
+            writer.flush()
+
+    def flush(self):
+        # Kuyruktakiler yazılana kadar bekler
+        with self._cond:
+            while self._queue or self._busy:
+                self._cond.wait()
+        self._flush_streams()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self.thread.join()
+        for writer in list(self.streams.values()):
+            writer.close()
+
+
+class StreamReader:
+    def __init__(self, directory, name):
+        self.name = name
+        self.data = _map(os.path.join(directory, f'{name}.dat'))
+        self.index = _map(os.path.join(directory, f'{name}.idx'))
+        # Yazma yarıda kaldıysa verisi olmayan satırlar ve yarım son satır yok sayılır; boş .dat boş akıştır
+        self.count = _covered_rows(self.index, len(self.data) if self.data is not None else 0)
+        sync_path = os.path.join(directory, f'{name}.sync')
+        self.sync = _map(sync_path) if os.path.exists(sync_path) else None
+        if self.sync is not None and len(self.sync) // SYNC_SIZE < self.count:
+            self.count = len(self.sync) // SYNC_SIZE
+
+    def __len__(self):
+        return self.count
+
+    def timestamp(self, i):
+        return struct.unpack_from('<d', self.index, i * INDEX_SIZE)[0]
+
+    def entry(self, i):
+        # Veri mmap üzerinde kopyasız memoryview olarak döner
+        timestamp, offset, length = struct.unpack_from(INDEX_FORMAT, self.index, i * INDEX_SIZE)
+        return timestamp, memoryview(self.data)[offset:offset + length]
+
+    def sync_entry(self, i):
+        # (son MAVLink kaydının zamanı, mavlink.idx satırı); eşleme yoksa None
+        if self.sync is None:
+            return None
+        timestamp, row = struct.unpack_from(SYNC_FORMAT, self.sync, i * SYNC_SIZE)
+        if row == NO_ROW:
+            return None
+        return timestamp, row
+
+    def find(self, timestamp):
+        return self._bisect(self.timestamp, timestamp)
+
+    def find_sync(self, reference_row):
+        # MAVLink satırına karşılık gelen ilk kayıt (satır numaraları kayıt boyunca artar)
+        def row(i):
+            entry = self.sync_entry(i)
+            return -1 if entry is None else entry[1]
+        return self._bisect(row, reference_row)
+
+    def _bisect(self, key, value):
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key(mid) < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def close(self):
+        for mapped in (self.data, self.index, self.sync):
+            if mapped is not None:
+                try:
+                    mapped.close()
+                except BufferError:
+                    pass
+
+
+class RecordingReader:
+    def __init__(self, directory):
+        self.directory = directory
+        self.streams = {}
+        for filename in sorted(os.listdir(directory)):
+            name, ext = os.path.splitext(filename)
+            if ext == '.idx' and os.path.exists(os.path.join(directory, f'{name}.dat')):
+                reader = StreamReader(directory, name)
+                if len(reader):
+                    self.streams[name] = reader
+        starts = [reader.timestamp(0) for reader in self.streams.values()]
+        ends = [reader.timestamp(len(reader) - 1) for reader in self.streams.values()]
+        self.start_time = min(starts) if starts else 0.0
+        self.end_time = max(ends) if ends else 0.0
+
+    def stream(self, name):
+        return self.streams.get(name)
+
+    def telemetry_entry(self, name, i):
+        # Akışın i. kaydıyla eşlenen MAVLink kaydı (zaman, payload); .sync üzerinden O(1)
+        stream = self.streams.get(name)
+        reference = self.streams.get(SYNC_REFERENCE)
+        entry = stream.sync_entry(i) if stream is not None else None
+        if entry is None or reference is None or entry[1] >= len(reference):
+            return None
+        return reference.entry(entry[1])
+
+    def close(self):
+        for reader in self.streams.values():
+            reader.close()
+
+
+class ReplayClock:
+    # speed=0 "olabildiğince hızlı": kaynaklar beklemeden okur
+    def __init__(self, start, speed=1.0):
+        self.speed = speed
+        self.generation = 0
+        self._lock = threading.Lock()
+        self.seek(start)
+
+    def seek(self, timestamp):
+        with self._lock:
+            self._origin = timestamp
+            self._wall = time.monotonic()
+            self.generation += 1
+
+    def position(self):
+        return self._origin
+
+    def now(self):
+        if not self.speed:
+            return float('inf')
+        return self._origin + (time.monotonic() - self._wall) * self.speed
+
+    def reached(self, timestamp):
+        return self.now() >= timestamp
+
+    def wait_until(self, timestamp, is_running, generation):
+        while is_running() and generation == self.generation:
+            remaining = timestamp - self.now()
+            if remaining <= 0:
+                return True
+            time.sleep(min(remaining / self.speed, 0.05))
+        return False
+
+
+class ReplaySession:
+    def __init__(self, directory, speed=1.0, start=0.0):
+        self.reader = RecordingReader(directory)
+        self.clock = ReplayClock(self.reader.start_time + start, speed)
+
+    def seek(self, seconds):
+        self.clock.seek(self.reader.start_time + seconds)
+
+    def close(self):
+        self.reader.close()
+
+
+def replay_entries(session, name, is_running):
+    # Kaydı saat ile senkron gezer; seek yapılırsa yeni konumdan devam eder
+    stream = session.reader.stream(name)
+    if stream is None:
+        return
+    clock = session.clock
+    while is_running():
+        generation = clock.generation
+        i = stream.find(clock.position())
+        while i < len(stream) and generation == clock.generation:
+            timestamp, payload = stream.entry(i)
+            if not clock.wait_until(timestamp, is_running, generation):
+                break
+            yield timestamp, payload
+            i += 1
+        if generation == clock.generation:
+            return
+
+
+class _NullMav:
+    # Oynatmada araca komut gönderilmez, *_send çağrıları yutulur
+    def __getattr__(self, name):
+        if name.endswith('_send'):
+            return lambda *args, **kwargs: None
+        raise AttributeError(name)
+
+
+class ReplayConnection:
+    # mavutil.mavlink_connection yerine geçen, kayıttan okuyan bağlantı
+    def __init__(self, session):
+        from pymavlink import mavutil
+        self.session = session
+        self.stream = session.reader.stream('mavlink')
+        self.parser = mavutil.mavlink.MAVLink(None)
+        self.parser.robust_parsing = True
+        self.mav = _NullMav()
+        self.target_system = 1
+        self.target_component = 1
+        self.messages = {}
+        self._generation = None
+        self._index = 0
+
+    def finished(self):
+        return self.stream is None or self._index >= len(self.stream)
+
+    def recv_msg(self):
+        clock = self.session.clock
+        if self._generation != clock.generation:
+            self._generation = clock.generation
+            self._index = self.stream.find(clock.position()) if self.stream is not None else 0
+        if self.finished():
+            return None
+        timestamp, payload = self.stream.entry(self._index)
+        if not clock.reached(timestamp):
+            return None
+        self._index += 1
+        try:
+            msg = self.parser.decode(bytearray(payload))
+        except Exception:
+            return None
+        msg._timestamp = timestamp
+        self.messages[msg.get_type()] = msg
+        if msg.get_type() == 'HEARTBEAT':
+            self.target_system = msg.get_srcSystem()
+            self.target_component = msg.get_srcComponent()
+        return msg
+
+    def recv_match(self, condition=None, type=None, blocking=False, timeout=None):
+        if isinstance(type, str):
+            type = [type]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            msg = self.recv_msg()
+            if msg is not None:
+                if type is None or msg.get_type() in type:
+                    return msg
+                continue
+            if not blocking or self.finished() or (deadline is not None and time.monotonic() >= deadline):
+                return None
+            time.sleep(0.005)
+
+    def time_since(self, mtype):
+        msg = self.messages.get(mtype)
+        if msg is None:
+            return time.time() + 1
+        return min(self.session.clock.now(), self.session.reader.end_time) - msg._timestamp
+
+    def close(self):
+        pass
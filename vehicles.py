@@ -0,0 +1,91 @@
+# Çok araçlı telemetri durumu: mesajlar MAVLink srcSystem ile araçlara ayrılır.
+# Sayısal değerler tek float64 tabloda, araç başına bir satır (eksik değer NaN). Araç başına
+# dict kopyası tutulmaz; eskime kontrolü tüm araçlar için tek numpy işlemidir.
+import numpy as np
+
+
+class Vehicle:
+    # Aracın bağlantı ve abonelik durumu; değerleri VehicleTable'daki satırında
+    __slots__ = ('system_id', 'component_id', 'row', 'link', 'subscription_mode', 'interval_queue', 'awaiting',
+                 'messages', 'first_heartbeat')
+
+    def __init__(self, system_id, row, link):
+        self.system_id = system_id
+        self.component_id = None
+        self.row = row
+        # Araçtan son mesajın geldiği bağlantı; istekler oradan gönderilir
+        self.link = link
+        self.subscription_mode = {}
+        self.interval_queue = []
+        self.awaiting = None
+        self.messages = 0
+        # İlk HEARTBEAT'in monotonic zamanı; uçuş süresi buradan (bağlantı birden fazla araçla paylaşılabilir)
+        self.first_heartbeat = None
+
+
+class VehicleTable:
+    def __init__(self, fields, messages, defaults=None, capacity=8):
+        self.fields = tuple(fields)
+        self.columns = {name: i for i, name in enumerate(self.fields)}
+        self.messages = tuple(messages)
+        self.message_columns = {name: i for i, name in enumerate(self.messages)}
+        self.defaults = np.full(len(self.fields), np.nan)
+        for name, value in (defaults or {}).items():
+            self.defaults[self.columns[name]] = value
+        self.values = np.full((capacity, len(self.fields)), np.nan)
+        # Mesaj türü başına son görülme (monotonic) ve alınma (perf_counter) zamanı
+        self.last_seen = np.full((capacity, len(self.messages)), np.nan)
+        self.received_at = np.full((capacity, len(self.messages)), np.nan)
+        self.vehicles = {}
+
+    def __len__(self):
+        return len(self.vehicles)
+
+    def get(self, system_id):
+        return self.vehicles.get(system_id)
+
+    def add(self, system_id, link):
+        row = len(self.vehicles)
+        if row == len(self.values):
+            self._grow()
+        self.values[row] = self.defaults
+        vehicle = Vehicle(system_id, row, link)
+        self.vehicles[system_id] = vehicle
+        return vehicle
+
+    def _grow(self):
+        for name in ('values', 'last_seen', 'received_at'):
+            old = getattr(self, name)
+            new = np.full((2 * len(old), old.shape[1]), np.nan)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def seen(self, row, message, now, received_at):
+        column = self.message_columns[message]
+        self.last_seen[row, column] = now
+        self.received_at[row, column] = received_at
+
+    def expire(self, now, timeout, stale_fields):
+        # stale_fields: mesaj -> varsayılana dönecek alanlar. Değeri sıfırlanan satırlar döner.
+        count = len(self.vehicles)
+        expired = set()
+        for message, names in stale_fields.items():
+            column = self.message_columns[message]
+            # NaN (hiç görülmedi / zaten sıfırlandı) karşılaştırmada False
+            rows = np.flatnonzero(self.last_seen[:count, column] < now - timeout)
+            if not len(rows):
+                continue
+            columns = [self.columns[name] for name in names]
+            self.values[np.ix_(rows, columns)] = self.defaults[columns]
+            self.last_seen[rows, column] = np.nan
+            expired.update(rows.tolist())
+        return expired
+
+    def snapshot(self, row):
+        # NaN -> None: arayüz "henüz değer yok" ile sıfırı ayırır. row None: araç yokken varsayılanlar
+        values = self.defaults if row is None else self.values[row]
+        return {name: (None if value != value else value) for name, value in zip(self.fields, values.tolist())}
+
+    def received(self, row):
+        return {name: value for name, value in zip(self.messages, self.received_at[row].tolist())
+                if value == value}